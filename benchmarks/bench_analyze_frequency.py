@@ -0,0 +1,102 @@
+"""
+Benchmark the relative word frequency analysis on a large synthetic
+counts file.
+
+Writes ``--words`` words with Zipf-distributed counts to a temporary
+``word-counts.json`` and times loading it and building the table of
+``--count`` rows in both modes, against normalizing and sorting dicts
+of all words, as it was done before, and the speedup.
+
+Usage::
+
+    python benchmarks/bench_analyze_frequency.py [--words N] [--count N]
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from mc_wiki_scraper.modes import AnalyzeFrequencyMode
+
+
+def write_counts(path: Path, n_words: int) -> None:
+    rng = np.random.default_rng(0)
+    counts = rng.zipf(1.3, n_words).clip(max=10**9)
+    words = (f"w{i}" for i in rng.permutation(n_words))
+    path.write_text(
+        json.dumps(dict(zip(words, counts.tolist(), strict=True))),
+        encoding="utf-8",
+    )
+
+
+def sorted_table(mode: AnalyzeFrequencyMode, count: int) -> pd.DataFrame:
+    word_counts = dict(
+        zip(mode.words.tolist(), mode.counts.tolist(), strict=True)
+    )
+    lang_norms = dict(
+        zip(mode.lang_words.tolist(), mode.lang_freqs.tolist(), strict=True)
+    )
+
+    max_freq = max(word_counts.values())
+    article_norms = {w: c / max_freq for w, c in word_counts.items()}
+    ranked = article_norms if mode.mode == "article" else lang_norms
+    other = lang_norms if mode.mode == "article" else article_norms
+
+    rows = []
+    for word, freq in sorted(ranked.items(), key=lambda x: x[1], reverse=True)[
+        :count
+    ]:
+        rows.append({"word": word, "ranked": freq, "other": other.get(word)})
+
+    return pd.DataFrame(rows)
+
+
+def vectorized_table(mode: AnalyzeFrequencyMode) -> pd.DataFrame:
+    mode.normalize_article_counts()
+    if mode.mode == "article":
+        return mode._get_table_article_mode()
+
+    return mode._get_table_lang_mode()
+
+
+def timed(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    args_parser = argparse.ArgumentParser()
+    args_parser.add_argument("--words", type=int, default=2_000_000)
+    args_parser.add_argument("--count", type=int, default=100)
+    args = args_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "word-counts.json"
+        write_counts(path, args.words)
+        AnalyzeFrequencyMode.WORD_COUNTS_FILE = str(path)
+
+        print(
+            f"{'mode':<10}{'load (s)':>9}{'before (s)':>11}{'after (s)':>10}"
+            f"{'speedup':>9}"
+        )
+        for name in ("article", "language"):
+            mode = AnalyzeFrequencyMode(name, args.count)
+            load = timed(mode.load_word_counts)
+            mode.normalize_lang_counts()
+
+            before = timed(sorted_table, mode, args.count)
+            after = timed(vectorized_table, mode)
+            print(
+                f"{name:<10}{load:>9.2f}{before:>11.2f}{after:>10.3f}"
+                f"{before / after:>8.0f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark reading a large word counts file as JSON and as a binary
+counts file.
+
+Writes ``--words`` words with Zipf-distributed counts to a temporary
+``word-counts.json``, converts it to a binary counts file and, for
+both, times loading it, ``--count`` point lookups and a top-``--count``
+selection, and measures the peak memory allocated while doing so.
+
+Usage::
+
+    python benchmarks/bench_counts_file.py [--words N] [--count N]
+"""
+
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from mc_wiki_scraper.storage import BinaryCounts, convert_json_counts, top_k
+
+
+def write_counts(path: Path, n_words: int) -> list[str]:
+    rng = np.random.default_rng(0)
+    counts = rng.zipf(1.3, n_words).clip(max=10**9)
+    words = [f"w{i}" for i in rng.permutation(n_words)]
+    path.write_text(
+        json.dumps(dict(zip(words, counts.tolist(), strict=True))),
+        encoding="utf-8",
+    )
+    return words
+
+
+def json_queries(path: Path, words: list[str], count: int) -> None:
+    with open(path, encoding="utf-8") as f:
+        word_counts = json.load(f)
+
+    counts = np.fromiter(
+        word_counts.values(), dtype=np.int64, count=len(word_counts)
+    )
+    top = top_k(counts, count)
+    keys = list(word_counts)
+    [keys[i] for i in top]
+    [word_counts.get(w) for w in words]
+
+
+def binary_queries(path: Path, words: list[str], count: int) -> None:
+    counts = BinaryCounts(path)
+    counts.most_common(count)
+    [counts.get(w) for w in words]
+
+
+def measure(func, *args) -> tuple[float, float]:
+    # Seconds and peak megabytes allocated.
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(*args)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / 2**20
+
+
+def main():
+    args_parser = argparse.ArgumentParser()
+    args_parser.add_argument("--words", type=int, default=2_000_000)
+    args_parser.add_argument("--count", type=int, default=100)
+    args = args_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = Path(tmp) / "word-counts.json"
+        binary_path = Path(tmp) / "word-counts.bin"
+        words = write_counts(json_path, args.words)[: args.count]
+
+        convert, convert_mb = measure(
+            convert_json_counts, json_path, binary_path
+        )
+        print(f"convert: {convert:.2f} s, peak {convert_mb:.0f} MB")
+
+        print(f"{'file':<8}{'size (MB)':>10}{'time (s)':>9}{'peak (MB)':>10}")
+        for name, path, func in (
+            ("json", json_path, json_queries),
+            ("binary", binary_path, binary_queries),
+        ):
+            seconds, peak = measure(func, path, words, args.count)
+            size = path.stat().st_size / 2**20
+            print(f"{name:<8}{size:>10.0f}{seconds:>9.3f}{peak:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark HTML parsers on the test articles.
+
+Times parsing and extracting paragraphs, link phrases and word counts
+in one pass (``WikiPage.extract``, as crawls do) from the articles in
+``tests/test_files`` with every installed parser, and the speedup over
+``html.parser``.
+With lxml, both the BeautifulSoup tree builder and the native lxml tree
+are timed.
+
+Usage::
+
+    python benchmarks/bench_parsers.py [--repeat N]
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from mc_wiki_scraper.wiki_page import WikiPage
+from mc_wiki_scraper.wiki_page.utils import available_parsers
+
+TEST_FILES = Path(__file__).parent.parent / "tests" / "test_files"
+ARTICLES = ("Bee.html", "Creeper.html")
+
+
+def run_once(html: str, parser: str, native: bool) -> float:
+    page = WikiPage.from_html("benchmark", html)
+    page.parser = parser
+
+    start = time.perf_counter()
+    if not native:
+        # A parsed content Tag is extracted from instead of lxml.
+        page.get_content()
+    page.extract()
+    return time.perf_counter() - start
+
+
+def main():
+    args_parser = argparse.ArgumentParser()
+    args_parser.add_argument("--repeat", type=int, default=5)
+    args = args_parser.parse_args()
+
+    backends = [("html.parser", "html.parser", False)]
+    if "lxml" in available_parsers():
+        backends += [("lxml (bs4)", "lxml", False), ("lxml", "lxml", True)]
+
+    print(f"{'article':<14}{'parser':<13}{'total (ms)':>11}{'speedup':>9}")
+    for name in ARTICLES:
+        html = (TEST_FILES / name).read_text(encoding="utf-8")
+        baseline = None
+
+        for label, parser, native in backends:
+            total = min(
+                run_once(html, parser, native) for _ in range(args.repeat)
+            )
+            baseline = baseline or total
+            print(
+                f"{name:<14}{label:<13}{total * 1000:>11.1f}"
+                f"{baseline / total:>8.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
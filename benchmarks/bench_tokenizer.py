@@ -0,0 +1,72 @@
+"""
+Benchmark word counting on the test articles.
+
+Times ``extract_word_counts`` against tokenizing the whole text of an
+article with ``WORD_RE``, as it was done before, on every test article
+and on all of them repeated as one large article, and the speedup.
+
+Usage::
+
+    python benchmarks/bench_tokenizer.py [--repeat N] [--copies N]
+"""
+
+import argparse
+import time
+from collections import Counter
+from pathlib import Path
+
+from bs4 import Tag
+
+from mc_wiki_scraper.wiki_page import WikiPage
+from mc_wiki_scraper.wiki_page.utils import extract_word_counts, make_soup
+from mc_wiki_scraper.wiki_page.utils.word_counts import WORD_RE
+
+TEST_FILES = Path(__file__).parent.parent / "tests" / "test_files"
+ARTICLES = ("Bee.html", "Creeper.html")
+
+
+def whole_text_counts(content: Tag) -> Counter:
+    text = content.get_text(separator=" ", strip=True).lower()
+    return Counter(WORD_RE.findall(text))
+
+
+def best_time(func, content: Tag, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(content)
+        times.append(time.perf_counter() - start)
+
+    return min(times)
+
+
+def main():
+    args_parser = argparse.ArgumentParser()
+    args_parser.add_argument("--repeat", type=int, default=10)
+    args_parser.add_argument("--copies", type=int, default=20)
+    args = args_parser.parse_args()
+
+    contents = {}
+    for name in ARTICLES:
+        html = (TEST_FILES / name).read_text(encoding="utf-8")
+        contents[name] = WikiPage.from_html(name, html).get_content()
+
+    large = "".join(str(c) for c in contents.values()) * args.copies
+    contents[f"{args.copies}x all"] = make_soup(f"<div>{large}</div>").div
+
+    print(
+        f"{'article':<14}{'before (ms)':>12}{'after (ms)':>12}{'speedup':>9}"
+    )
+    for name, content in contents.items():
+        assert extract_word_counts(content) == whole_text_counts(content)
+
+        before = best_time(whole_text_counts, content, args.repeat)
+        after = best_time(extract_word_counts, content, args.repeat)
+        print(
+            f"{name:<14}{before * 1000:>12.1f}{after * 1000:>12.1f}"
+            f"{before / after:>8.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
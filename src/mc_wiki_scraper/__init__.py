@@ -2,10 +2,28 @@
 Main package for wiki scraping and analysis.
 ---
 Provides the top-level Scraper class and exposes submodules for
-CLI, article handling, and different modes of operation.
+CLI, article handling, storage of results, local corpora, and
+different modes of operation.
+
+Submodules are imported on first access, so that the CLI only loads
+what the selected mode needs.
 """
 
-from . import cli, modes, wiki_page
-from .cli import Scraper
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from . import cli, corpus, modes, storage, wiki_page
+    from .cli import Scraper
+
+__all__ = ["Scraper", "cli", "wiki_page", "modes", "storage", "corpus"]
+
+
+def __getattr__(name: str):
+    if name == "Scraper":
+        return importlib.import_module(".cli", __name__).Scraper
+
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
 
-__all__ = ["Scraper", "cli", "wiki_page", "modes"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -7,15 +7,32 @@ build a mode object from them and run the program.
 Functionality:
 - parse arguments
 - create mode objects from arguments
+- configure page fetching and parsing from arguments
 - create a Scraper class and use it to run the program
 """
 
+import importlib
+from typing import TYPE_CHECKING
+
 from .args import parse_args
-from .mode_builder import build_mode
 from .scraper import Scraper
 
+if TYPE_CHECKING:
+    from .mode_builder import build_mode, configure_pages
+
 __all__ = [
     "parse_args",
     "build_mode",
+    "configure_pages",
     "Scraper",
 ]
+
+
+def __getattr__(name: str):
+    # The mode builder imports the article machinery, which is not
+    # needed to parse args or print help.
+    if name in ("build_mode", "configure_pages"):
+        module = importlib.import_module(".mode_builder", __name__)
+        return getattr(module, name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -7,10 +7,26 @@ and returns the args namespace.
 
 import argparse
 import math
+import os
 from importlib.metadata import version
 
 PROGRAM = "mc-wiki-scraper"
-VERSION = version(PROGRAM)
+
+
+class _VersionAction(argparse.Action):
+    """Print the installed version, looked up only when requested."""
+
+    def __init__(self, option_strings, dest, **kwargs):
+        super().__init__(
+            option_strings,
+            dest=argparse.SUPPRESS,
+            default=argparse.SUPPRESS,
+            nargs=0,
+            help=kwargs.get("help"),
+        )
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        parser.exit(message=f"{parser.prog} {version(PROGRAM)}\n")
 
 
 def wait_seconds(value: str) -> float:
@@ -31,6 +47,18 @@ def wait_seconds(value: str) -> float:
     return v
 
 
+def probability(value: str) -> float:
+    try:
+        v = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError("must be a number") from None
+
+    if not 0 < v < 1:
+        raise argparse.ArgumentTypeError("must be between 0 and 1")
+
+    return v
+
+
 def positive_int(value: str) -> int:
     try:
         v = int(value)
@@ -55,6 +83,30 @@ def non_negative_int(value: str) -> int:
     return v
 
 
+def _add_store(parser):
+    parser.add_argument(
+        "--store",
+        choices=["json", "sqlite"],
+        default="json",
+        help="where to accumulate word counts; sqlite keeps them in "
+        "word-counts.sqlite and exports word-counts.json when done "
+        "(default: json)",
+    )
+
+
+def _add_ngrams(parser):
+    parser.add_argument(
+        "--ngrams",
+        type=positive_int,
+        nargs="+",
+        default=[],
+        metavar="N",
+        help="also count n-grams of these sizes, e.g. 2 3 for bigrams and "
+        "trigrams, in ngram-counts.sqlite, exported to ngram-counts.json "
+        "when done",
+    )
+
+
 def _add_summary(subparsers):
     parser = subparsers.add_parser(
         "summary",
@@ -96,6 +148,8 @@ def _add_count_words(subparsers):
         metavar="PHRASE",
         help="article title to counts words in",
     )
+    _add_ngrams(parser)
+    _add_store(parser)
 
 
 def _add_analyze_freq(subparsers):
@@ -121,6 +175,30 @@ def _add_analyze_freq(subparsers):
         metavar="PATH",
         help="optional output image path for a chart",
     )
+    parser.add_argument(
+        "--counts",
+        metavar="PATH",
+        help="JSON or binary word counts file to analyze "
+        "(default: word-counts.json)",
+    )
+
+
+def _add_convert_word_counts(subparsers):
+    parser = subparsers.add_parser(
+        "convert-word-counts",
+        help="convert a JSON word counts file to a binary file that is "
+        "analyzed without loading it whole",
+    )
+    parser.add_argument(
+        "source",
+        metavar="JSON",
+        help="word counts file to convert, such as word-counts.json",
+    )
+    parser.add_argument(
+        "target",
+        metavar="OUTPUT",
+        help="binary counts file to write",
+    )
 
 
 def _add_auto_count_words(subparsers):
@@ -145,8 +223,194 @@ def _add_auto_count_words(subparsers):
         type=wait_seconds,
         required=True,
         metavar="T",
-        help="number of seconds to wait between phrases",
+        help="minimum average number of seconds between requests "
+        "(all workers); slowed down automatically on 429 and 5xx",
+    )
+    parser.add_argument(
+        "--burst",
+        type=positive_int,
+        default=1,
+        metavar="N",
+        help="number of requests allowed at once after an idle period "
+        "(default: 1)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=4,
+        metavar="N",
+        help="number of articles to download concurrently (default: 4)",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["html", "api"],
+        default="html",
+        help="download rendered pages one by one, or parsed content of "
+        "many articles per request through the MediaWiki API "
+        "(default: html)",
+    )
+    parser.add_argument(
+        "--parse-processes",
+        type=non_negative_int,
+        default=0,
+        metavar="N",
+        help="parse pages in N processes instead of the main one (default: 0)",
+    )
+    parser.add_argument(
+        "--queue-depth",
+        type=positive_int,
+        metavar="N",
+        help="maximum number of downloads in flight "
+        "(default: twice the workers)",
+    )
+    parser.add_argument(
+        "--resolve",
+        action="store_true",
+        help="resolve links to article IDs through the MediaWiki API "
+        "and skip known articles before downloading them",
+    )
+    parser.add_argument(
+        "--seen-error-rate",
+        type=probability,
+        metavar="P",
+        help="track seen links in a Bloom filter with this false-positive "
+        "rate instead of an exact set, to save memory on deep crawls",
+    )
+    parser.add_argument(
+        "--seen-capacity",
+        type=positive_int,
+        default=1_000_000,
+        metavar="N",
+        help="number of links the Bloom filter is sized for "
+        "(default: 1000000)",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        metavar="PATH",
+        help="save the crawl state to PATH before every write of counts",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue the crawl saved in the checkpoint, if there is one",
+    )
+    parser.add_argument(
+        "--commit-every",
+        type=positive_int,
+        default=50,
+        metavar="N",
+        help="write counts, and save the checkpoint, every N articles; "
+        "more makes large crawls cheaper to checkpoint, at the cost of "
+        "more articles counted again after a crash (default: 50)",
+    )
+    parser.add_argument(
+        "--archive",
+        metavar="PATH",
+        help="append every counted page to a WARC archive at PATH "
+        "(indexed in PATH.idx), for replay-count-words or --corpus",
+    )
+    parser.add_argument(
+        "--ledger",
+        metavar="PATH",
+        help="record page revisions and counts in PATH, and on later runs "
+        "into the same store count only articles changed since",
+    )
+    parser.add_argument(
+        "--articles",
+        metavar="PATH",
+        help="also keep the word counts of every article in an SQLite "
+        "database at PATH, exported as a sparse matrix to PATH.npz",
+    )
+    _add_ngrams(parser)
+    parser.add_argument(
+        "--ngram-error",
+        type=probability,
+        default=1e-5,
+        metavar="P",
+        help="drop rare n-grams to bound memory, undercounting none by "
+        "more than this share of all n-grams (default: 0.00001)",
+    )
+    _add_store(parser)
+
+
+def _add_replay_count_words(subparsers):
+    parser = subparsers.add_parser(
+        "replay-count-words",
+        help="count words in every article of a local corpus, such as "
+        "a crawl archive",
+    )
+    parser.add_argument(
+        "path",
+        metavar="CORPUS",
+        help="crawl archive, WARC file, XML dump or directory of HTML files",
+    )
+    parser.add_argument(
+        "--processes",
+        type=non_negative_int,
+        default=0,
+        metavar="N",
+        help="parse articles in N processes instead of the main one "
+        "(default: 0)",
+    )
+    _add_store(parser)
+
+
+def _add_distributed_count_words(subparsers):
+    parser = subparsers.add_parser(
+        "distributed-count-words",
+        help="follow links and count words with several worker processes "
+        "sharing one frontier",
+    )
+    parser.add_argument(
+        "phrase",
+        nargs="?",
+        metavar="STARTER_PHRASE",
+        help="article title to start following links in (run and seed)",
+    )
+    parser.add_argument(
+        "--frontier",
+        required=True,
+        metavar="PATH",
+        help="SQLite database shared by all workers",
+    )
+    parser.add_argument(
+        "--role",
+        choices=["run", "seed", "work", "reduce"],
+        default="run",
+        help="run everything on this host, or only seed the frontier, "
+        "work on it or merge its counts into word-counts.json "
+        "(default: run)",
+    )
+    parser.add_argument(
+        "--depth",
+        type=non_negative_int,
+        default=1,
+        metavar="N",
+        help="maximum depth for links (default: 1)",
+    )
+    parser.add_argument(
+        "--wait",
+        type=wait_seconds,
+        required=True,
+        metavar="T",
+        help="minimum average number of seconds between requests, shared "
+        "by the local workers of run, or of a single work process",
+    )
+    parser.add_argument(
+        "--processes",
+        type=positive_int,
+        metavar="N",
+        help="number of local worker processes for run "
+        "(default: number of CPUs)",
     )
+    parser.add_argument(
+        "--no-wal",
+        dest="wal",
+        action="store_false",
+        help="do not use WAL mode, e.g. for a frontier on a network "
+        "filesystem",
+    )
+    _add_store(parser)
 
 
 def _build_parser() -> argparse.ArgumentParser:
@@ -159,8 +423,41 @@ def _build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "-v",
         "--version",
-        action="version",
-        version=f"%(prog)s {VERSION}",
+        action=_VersionAction,
+        help="show program's version number and exit",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        metavar="PATH",
+        help="keep fetched pages in an on-disk cache in this directory",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=positive_int,
+        default=512,
+        metavar="MB",
+        help="maximum size of the page cache in megabytes (default: 512)",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="serve pages only from the cache, never from the network",
+    )
+    parser.add_argument(
+        "--corpus",
+        metavar="PATH",
+        help="read pages from a local corpus instead of the wiki: a "
+        "directory of HTML files, a WARC file or an XML dump",
+    )
+    parser.add_argument(
+        "--parser",
+        choices=["lxml", "html.parser"],
+        help="HTML parser to use (default: fastest installed)",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="print request counts, connection reuse and timings at the end",
     )
 
     subparsers = parser.add_subparsers(
@@ -173,7 +470,10 @@ def _build_parser() -> argparse.ArgumentParser:
     _add_table(subparsers)
     _add_count_words(subparsers)
     _add_analyze_freq(subparsers)
+    _add_convert_word_counts(subparsers)
     _add_auto_count_words(subparsers)
+    _add_distributed_count_words(subparsers)
+    _add_replay_count_words(subparsers)
 
     return parser
 
@@ -183,6 +483,41 @@ def parse_args() -> argparse.Namespace:
     parser = _build_parser()
     args = parser.parse_args()
 
+    if args.offline and args.cache_dir is None:
+        parser.error("--offline requires --cache-dir")
+
+    if args.corpus is not None and not os.path.exists(args.corpus):
+        parser.error(f"corpus '{args.corpus}' does not exist")
+
+    if args.command == "replay-count-words" and not os.path.exists(args.path):
+        parser.error(f"corpus '{args.path}' does not exist")
+
+    if args.command == "convert-word-counts" and not os.path.exists(
+        args.source
+    ):
+        parser.error(f"counts file '{args.source}' does not exist")
+
+    # The API cannot be served from a corpus.
+    if args.corpus is not None and getattr(args, "backend", None) == "api":
+        parser.error("--corpus cannot be used with --backend api")
+    if args.corpus is not None and getattr(args, "resolve", False):
+        parser.error("--corpus cannot be used with --resolve")
+
+    if getattr(args, "resume", False) and args.checkpoint is None:
+        parser.error("--resume requires --checkpoint")
+
+    if getattr(args, "ngrams", None) and getattr(args, "ledger", None):
+        parser.error("--ngrams cannot be used with --ledger")
+
+    if getattr(args, "role", None) in ("run", "seed") and args.phrase is None:
+        parser.error(f"--role {args.role} requires STARTER_PHRASE")
+
+    if args.parser is not None:
+        from ..wiki_page.utils import available_parsers
+
+        if args.parser not in available_parsers():
+            parser.error(f"parser '{args.parser}' is not installed")
+
     return args
 
 
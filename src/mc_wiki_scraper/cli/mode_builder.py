@@ -2,19 +2,45 @@
 mode builder module for buiding a mode object from args.
 
 Provides the ``build_mode`` function, which returns a mode object
-initialized with the right args.
+initialized with the right args, and the ``configure_pages`` function,
+which sets up how pages are fetched and parsed for every mode.
 """
 
 from argparse import Namespace
 
-from ..modes import (
-    AnalyzeFrequencyMode,
-    AutoCountWordsMode,
-    CountWordsMode,
-    SummaryMode,
-    TableMode,
+from .. import modes
+from ..storage import (
+    ArticleCountsStore,
+    CountsStore,
+    CrawlCheckpoint,
+    JsonCountsStore,
+    PageLedger,
+    SqliteCountsStore,
 )
 from ..wiki_page import WikiPage
+from ..wiki_page.utils import (
+    configure_cache,
+    configure_corpus,
+    set_default_parser,
+)
+
+
+def configure_pages(args: Namespace) -> None:
+    """
+    Set up the page cache, local corpus and HTML parser from the
+    global args.
+    """
+    if args.cache_dir is not None:
+        configure_cache(
+            args.cache_dir, args.cache_size * 1024 * 1024, args.offline
+        )
+
+    if args.corpus is not None:
+        from ..corpus import open_corpus
+
+        configure_corpus(open_corpus(args.corpus))
+
+    set_default_parser(args.parser)
 
 
 def build_mode(args: Namespace):
@@ -22,21 +48,120 @@ def build_mode(args: Namespace):
     Returns a mode object initialized with passed args.
 
     Chooses which mode to return based
-    on the subparsers arg (args.command).
+    on the subparsers arg (args.command). Only the chosen mode (and
+    its dependencies) is imported.
     """
 
     match args.command:
         case "summary":
-            return SummaryMode(WikiPage(args.phrase))
+            return modes.SummaryMode(WikiPage(args.phrase))
         case "table":
-            return TableMode(WikiPage(args.phrase), args.number)
+            return modes.TableMode(WikiPage(args.phrase), args.number)
         case "count-words":
-            return CountWordsMode(WikiPage(args.phrase))
+            return modes.CountWordsMode(
+                WikiPage(args.phrase),
+                _build_store(args),
+                args.ngrams,
+                _build_ngram_store(args),
+            )
         case "auto-count-words":
-            return AutoCountWordsMode(
-                WikiPage(args.phrase), args.depth, args.wait
+            return modes.AutoCountWordsMode(
+                WikiPage(args.phrase),
+                args.depth,
+                wait=args.wait,
+                workers=args.workers,
+                store=_build_store(args, None),
+                backend=args.backend,
+                checkpoint=_build_checkpoint(args),
+                resume=args.resume,
+                resolve=args.resolve,
+                burst=args.burst,
+                seen_error_rate=args.seen_error_rate,
+                seen_capacity=args.seen_capacity,
+                parse_processes=args.parse_processes,
+                queue_depth=args.queue_depth,
+                archive=_build_archive(args),
+                ledger=PageLedger(args.ledger) if args.ledger else None,
+                ngrams=args.ngrams,
+                ngram_store=_build_ngram_store(args, None),
+                ngram_error=args.ngram_error,
+                articles=_build_articles(args),
+                commit_every=args.commit_every,
+            )
+        case "distributed-count-words":
+            return modes.DistributedCountWordsMode(
+                args.frontier,
+                args.role,
+                WikiPage(args.phrase) if args.phrase else None,
+                args.depth,
+                wait=args.wait,
+                processes=args.processes,
+                store=_build_store(args),
+                wal=args.wal,
+            )
+        case "replay-count-words":
+            from ..corpus import open_corpus
+
+            return modes.ReplayCountWordsMode(
+                open_corpus(args.path),
+                _build_store(args, None),
+                args.processes,
             )
         case "analyze-relative-word-frequency":
-            return AnalyzeFrequencyMode(args.mode, args.count, args.chart)
+            return modes.AnalyzeFrequencyMode(
+                args.mode, args.count, args.chart, args.counts
+            )
+        case "convert-word-counts":
+            return modes.ConvertCountsMode(args.source, args.target)
         case _:
             raise ValueError("Unknown mode")
+
+
+def _build_store(args: Namespace, flush_every: int | None = 1) -> CountsStore:
+    if args.store == "sqlite":
+        return SqliteCountsStore(
+            modes.CountWordsMode.SQLITEPATH,
+            flush_every,
+            export_path=modes.CountWordsMode.JSONPATH,
+        )
+
+    return JsonCountsStore(modes.CountWordsMode.JSONPATH, flush_every)
+
+
+def _build_ngram_store(
+    args: Namespace, flush_every: int | None = 1
+) -> CountsStore | None:
+    if not args.ngrams:
+        return None
+
+    # There are far more n-grams than words, so they are always kept in
+    # SQLite, where a commit writes only the n-grams it changes, and
+    # exported to JSON once at the end.
+    return SqliteCountsStore(
+        modes.CountWordsMode.NGRAM_SQLITEPATH,
+        flush_every,
+        export_path=modes.CountWordsMode.NGRAM_JSONPATH,
+    )
+
+
+def _build_articles(args: Namespace) -> ArticleCountsStore | None:
+    if args.articles is None:
+        return None
+
+    return ArticleCountsStore(args.articles, f"{args.articles}.npz")
+
+
+def _build_checkpoint(args: Namespace) -> CrawlCheckpoint | None:
+    if args.checkpoint is None:
+        return None
+
+    return CrawlCheckpoint(args.checkpoint)
+
+
+def _build_archive(args: Namespace):
+    if args.archive is None:
+        return None
+
+    from ..corpus import ArchiveWriter
+
+    return ArchiveWriter(args.archive)
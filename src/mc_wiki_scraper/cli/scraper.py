@@ -6,20 +6,30 @@ the mode object on initialization, and provides a ``run`` method.
 """
 
 from .args import parse_args
-from .mode_builder import build_mode
 
 
 class Scraper:
     def __init__(self):
         self.args = parse_args()
+
+        # Imported after parsing, so that -h and -v return right away.
+        from .mode_builder import build_mode, configure_pages
+
+        configure_pages(self.args)
         self.mode = build_mode(self.args)
 
     def run(self) -> None:
         self.mode.run()
 
+        if self.args.stats:
+            from ..wiki_page.utils import get_fetch_stats
+
+            print(f"Fetch stats: {get_fetch_stats()}")
+
 
 def main():
     Scraper().run()
 
+
 if __name__ == "__main__":
     main()
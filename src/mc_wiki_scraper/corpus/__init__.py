@@ -0,0 +1,77 @@
+"""
+corpus
+------
+The ``corpus`` package provides readers of local article collections,
+so that modes can run offline, without fetching from the wiki.
+
+Functionality:
+- read rendered articles saved as HTML files in a directory
+- read rendered articles archived in a WARC file, plain or gzipped
+- read and render articles from a MediaWiki XML dump
+- look articles up by phrase or URL, following redirects
+- iterate over all articles of a corpus
+- archive fetched pages in an indexed, append-only WARC file
+"""
+
+from pathlib import Path
+
+from .archive import ArchiveEntry, ArchiveWriter, index_path, read_index
+from .base import Corpus, phrase_from_url
+from .html_dir import HtmlDirCorpus
+from .warc import WarcCorpus, WarcRecord, iter_records, parse_http_response
+from .wikitext import render_page, wikitext_to_html
+from .xml_dump import XmlDumpCorpus
+
+__all__ = [
+    "Corpus",
+    "HtmlDirCorpus",
+    "WarcCorpus",
+    "WarcRecord",
+    "XmlDumpCorpus",
+    "open_corpus",
+    "ArchiveWriter",
+    "ArchiveEntry",
+    "read_index",
+    "index_path",
+    "phrase_from_url",
+    "iter_records",
+    "parse_http_response",
+    "render_page",
+    "wikitext_to_html",
+]
+
+
+def open_corpus(path: str | Path) -> Corpus:
+    """
+    Open a corpus with the reader matching its path.
+
+    Parameters
+    ----------
+    path : str or Path
+        A directory of HTML files, a ``.warc`` or ``.warc.gz`` file,
+        or an ``.xml`` dump.
+
+    Returns
+    -------
+    Corpus
+        The opened corpus.
+
+    Raises
+    ------
+    ValueError
+        If the path is of no known corpus type.
+    """
+    path = Path(path)
+    name = path.name.lower()
+
+    if path.is_dir():
+        return HtmlDirCorpus(path)
+    if name.endswith((".warc", ".warc.gz")):
+        return WarcCorpus(path)
+    if name.endswith(".xml"):
+        return XmlDumpCorpus(path)
+
+    raise ValueError(
+        f"Unknown corpus type of '{path}': expected a directory, "
+        "a .warc or .warc.gz file or an .xml dump"
+    )
@@ -0,0 +1,222 @@
+"""
+Page archive writer.
+
+Provides the ``ArchiveWriter`` class, which appends fetched pages to a
+compressed WARC archive with a JSON lines index next to it, and the
+``read_index`` function, which reads that index back. Archives can be
+replayed with ``WarcCorpus``.
+"""
+
+import gzip
+import json
+import uuid
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import NamedTuple
+from urllib.parse import quote
+
+from ..wiki_page.utils import extract_id_and_title
+
+INDEX_SUFFIX = ".idx"
+BASE_URL = "https://minecraft.wiki/w/"
+COMPRESS_LEVEL = 6
+
+
+class ArchiveEntry(NamedTuple):
+    """
+    An archived page: where its record is in the archive and what it
+    holds.
+    """
+
+    offset: int
+    length: int
+    phrase: str
+    title: str
+    page_id: int
+    rev_id: int | None
+    fetched: str
+
+
+class ArchiveWriter:
+    """
+    Append-only archive of fetched pages.
+
+    Every page is written as a WARC response record compressed into
+    its own gzip member, so that it can be read by seeking to it, and
+    is then listed in the index, one JSON object per line, with its
+    offset and length, the phrase it was fetched for, its title, page
+    ID, revision ID and fetch time. Since a page is indexed only once
+    its record is written, a record cut short by a crash is never
+    indexed, and is cut off when the archive is opened again.
+
+    Parameters
+    ----------
+    path : str or Path
+        The ``.warc.gz`` archive. Created if missing, appended to
+        otherwise. The index is kept at the same path with an
+        ``.idx`` suffix added.
+    base_url : str, optional
+        Base URL of the wiki, used for the target URIs of records.
+    """
+
+    def __init__(self, path: str | Path, base_url: str = BASE_URL):
+        self.path = Path(path)
+        self.index_path = index_path(self.path)
+        self.base_url = base_url.rstrip("/") + "/"
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.index_path.exists() and _size(self.path):
+            raise ValueError(f"{self.path} has no index to append to")
+
+        end = 0
+        for entry in read_index(self.index_path):
+            end = max(end, entry.offset + entry.length)
+
+        self._archive = open(self.path, "ab")
+        self._index = open(self.index_path, "a", encoding="utf-8")
+        if self._archive.tell() > end:
+            self._archive.truncate(end)
+            self._archive.seek(end)
+
+    def write(
+        self,
+        phrase: str,
+        html: str,
+        page_id: int,
+        title: str,
+        rev_id: int | None = None,
+    ) -> ArchiveEntry:
+        """
+        Append a fetched page to the archive and the index.
+
+        Parameters
+        ----------
+        phrase : str
+            The phrase the page was fetched for.
+        html : str
+            The fetched HTML.
+        page_id : int
+            The article ID.
+        title : str
+            The canonical title of the article.
+        rev_id : int, optional
+            The revision ID of the fetched HTML.
+
+        Returns
+        -------
+        ArchiveEntry
+            The index entry of the page.
+        """
+        # Pages fetched through the API lack the script with the IDs,
+        # which replayed pages are identified by.
+        if extract_id_and_title(html) is None:
+            html = _page_script(page_id, title, rev_id) + html
+
+        fetched = datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+        uri = self.base_url + quote(title.replace(" ", "_"), safe="/:()_,'")
+        record = _response_record(uri, html, fetched, page_id, rev_id)
+        data = gzip.compress(record, COMPRESS_LEVEL)
+
+        offset = self._archive.tell()
+        self._archive.write(data)
+        self._archive.flush()
+
+        entry = ArchiveEntry(
+            offset, len(data), phrase, title, page_id, rev_id, fetched
+        )
+        self._index.write(json.dumps(entry._asdict()) + "\n")
+        self._index.flush()
+        return entry
+
+    def close(self) -> None:
+        """Close the archive and the index."""
+        self._archive.close()
+        self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def index_path(path: str | Path) -> Path:
+    """Return the path of the index of an archive."""
+    path = Path(path)
+    return path.with_name(path.name + INDEX_SUFFIX)
+
+
+def read_index(path: str | Path) -> list[ArchiveEntry]:
+    """
+    Read the entries of an archive index, skipping a last line cut
+    short by a crash.
+
+    Parameters
+    ----------
+    path : str or Path
+        The index file.
+
+    Returns
+    -------
+    list[ArchiveEntry]
+        The entries in the order pages were archived, or an empty list
+        if there is no index.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return []
+
+    entries = []
+    for line in lines:
+        try:
+            entries.append(ArchiveEntry(**json.loads(line)))
+        except (json.JSONDecodeError, TypeError):
+            continue
+
+    return entries
+
+
+def _size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def _page_script(page_id: int, title: str, rev_id: int | None) -> str:
+    config = {"wgArticleId": page_id, "wgPageName": title.replace(" ", "_")}
+    if rev_id is not None:
+        config["wgRevisionId"] = rev_id
+
+    return f"<script>{json.dumps(config, ensure_ascii=False)}</script>"
+
+
+def _response_record(
+    uri: str, html: str, fetched: str, page_id: int, rev_id: int | None
+) -> bytes:
+    body = html.encode("utf-8")
+    http = (
+        "HTTP/1.1 200 OK\r\n"
+        "Content-Type: text/html; charset=UTF-8\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n"
+    ).encode("ascii") + body
+
+    headers = [
+        "WARC/1.1",
+        "WARC-Type: response",
+        f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>",
+        f"WARC-Date: {fetched}",
+        f"WARC-Target-URI: {uri}",
+        f"WARC-Page-ID: {page_id}",
+    ]
+    if rev_id is not None:
+        headers.append(f"WARC-Revision-ID: {rev_id}")
+    headers += [
+        "Content-Type: application/http; msgtype=response",
+        f"Content-Length: {len(http)}",
+    ]
+
+    head = ("\r\n".join(headers) + "\r\n\r\n").encode("utf-8")
+    return head + http + b"\r\n\r\n"
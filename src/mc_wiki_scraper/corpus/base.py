@@ -0,0 +1,107 @@
+"""
+Base class of corpus readers.
+
+Provides the ``Corpus`` class, which looks up articles of a local
+corpus by phrase or URL, following the redirects it knows about, and
+iterates over all of them.
+"""
+
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from ..wiki_page.utils import canonicalize_phrase
+
+WIKI_PATH = "/w/"
+
+
+class Corpus(ABC):
+    """
+    Articles read from a local source instead of the wiki.
+
+    Articles are looked up by their canonical title (see
+    ``canonicalize_phrase``), so every spelling of a title finds the
+    same article. Readers index their source when opened and read an
+    article only when it is requested.
+
+    Attributes
+    ----------
+    path : Path
+        The file or directory the corpus is read from.
+    """
+
+    MAX_REDIRECTS = 5
+    path: Path
+
+    def get(self, phrase: str) -> str | None:
+        """
+        Return the HTML of an article, as if it was fetched from
+        the wiki.
+
+        Parameters
+        ----------
+        phrase : str
+            Article phrase, e.g. from a link.
+
+        Returns
+        -------
+        str | None
+            The HTML, or None if the corpus does not hold the article.
+        """
+        title = canonicalize_phrase(phrase)
+        for _ in range(self.MAX_REDIRECTS):
+            target = self._redirect(title)
+            if target is None:
+                break
+            title = canonicalize_phrase(target)
+
+        return self._read(title)
+
+    def fetch(self, url: str) -> str | None:
+        """
+        Return the HTML of the article at a wiki URL, like
+        ``fetch_html`` does online.
+        """
+        return self.get(phrase_from_url(url))
+
+    def __iter__(self) -> Iterator[tuple[str, str]]:
+        """
+        Iterate over ``(title, html)`` of every article, redirects
+        excluded, reading one article at a time.
+        """
+        for title in self.titles():
+            html = self._read(title)
+            if html is not None:
+                yield title, html
+
+    @abstractmethod
+    def titles(self) -> list[str]:
+        """Return the canonical titles of all articles."""
+
+    def close(self) -> None:  # noqa: B027
+        """Release the files held by the reader."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @abstractmethod
+    def _read(self, title: str) -> str | None: ...
+
+    def _redirect(self, title: str) -> str | None:
+        return None
+
+
+def phrase_from_url(url: str) -> str:
+    """
+    Return the article phrase of a wiki URL: the part of its path
+    after ``/w/``, or its last segment.
+    """
+    path = urlsplit(url).path
+    if WIKI_PATH in path:
+        return path.split(WIKI_PATH, 1)[1]
+
+    return path.rsplit("/", 1)[-1]
@@ -0,0 +1,43 @@
+"""
+Directory corpus reader.
+
+Provides the ``HtmlDirCorpus`` class, which reads articles saved as
+``<phrase>.html`` files in a directory.
+"""
+
+from pathlib import Path
+
+from ..wiki_page.utils import canonicalize_phrase
+from .base import Corpus
+
+
+class HtmlDirCorpus(Corpus):
+    """
+    Articles saved as rendered pages in a directory, one
+    ``<phrase>.html`` file each (the phrase may be percent-encoded).
+
+    Parameters
+    ----------
+    directory : str or Path
+        Directory holding the pages.
+    """
+
+    def __init__(self, directory: str | Path):
+        self.path = Path(directory)
+        if not self.path.is_dir():
+            raise NotADirectoryError(self.path)
+
+        self._paths = {
+            canonicalize_phrase(path.stem): path
+            for path in sorted(self.path.glob("*.html"))
+        }
+
+    def titles(self) -> list[str]:
+        return list(self._paths)
+
+    def _read(self, title: str) -> str | None:
+        path = self._paths.get(title)
+        if path is None:
+            return None
+
+        return path.read_text(encoding="utf-8")
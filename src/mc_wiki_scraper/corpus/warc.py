@@ -0,0 +1,277 @@
+"""
+WARC corpus reader.
+
+Provides the ``WarcCorpus`` class, which reads rendered articles from
+the HTTP responses archived in a WARC file, plain or gzip-compressed
+record by record (``.warc.gz``), and the ``iter_records`` function
+that streams the records of such a file.
+"""
+
+import gzip
+import mmap
+import zlib
+from collections.abc import Iterator
+from pathlib import Path
+from typing import NamedTuple
+
+from ..wiki_page.utils import canonicalize_phrase
+from .archive import ArchiveEntry, index_path, read_index
+from .base import Corpus, phrase_from_url
+
+CHUNK_SIZE = 64 * 1024
+REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+
+
+class WarcRecord(NamedTuple):
+    """
+    A WARC record, with the offset of the gzip member or plain record
+    it was read from.
+    """
+
+    offset: int
+    headers: dict[str, str]
+    block: bytes
+
+
+class WarcCorpus(Corpus):
+    """
+    Articles archived as HTTP responses in a WARC file.
+
+    The file is scanned once when opened, keeping only the offset of
+    every response by article title and the targets of redirects, or,
+    for archives written by ``ArchiveWriter``, its index is read
+    instead. Of several records for one title, e.g. of a page crawled
+    again, the last one wins.
+    Articles are then read by seeking to their offset, so only one
+    record is decompressed at a time. Compressed files must have one
+    gzip member per record, as the WARC standard recommends.
+
+    Parameters
+    ----------
+    path : str or Path
+        The ``.warc`` or ``.warc.gz`` file.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.compressed = self.path.suffix == ".gz"
+
+        self._offsets: dict[str, int] = {}
+        self._redirects: dict[str, str] = {}
+
+        # Archives written by ``ArchiveWriter`` come with an index,
+        # which saves scanning them.
+        entries = read_index(index_path(self.path))
+        for entry in entries:
+            self._add_entry(entry)
+        if not entries:
+            for record in iter_records(self.path):
+                self._index(record)
+
+    def titles(self) -> list[str]:
+        return list(self._offsets)
+
+    def _add_entry(self, entry: ArchiveEntry) -> None:
+        title = canonicalize_phrase(entry.title)
+        self._add_page(title, entry.offset)
+
+        phrase = canonicalize_phrase(entry.phrase)
+        if phrase != title:
+            self._add_redirect(phrase, title)
+
+    def _index(self, record: WarcRecord) -> None:
+        if record.headers.get("warc-type") != "response":
+            return
+
+        uri = record.headers.get("warc-target-uri", "")
+        status, headers, _ = parse_http_response(record.block)
+        title = canonicalize_phrase(phrase_from_url(uri))
+
+        if status in REDIRECT_STATUSES and "location" in headers:
+            self._add_redirect(title, phrase_from_url(headers["location"]))
+        elif status == 200:
+            self._add_page(title, record.offset)
+
+    def _add_page(self, title: str, offset: int) -> None:
+        self._offsets[title] = offset
+        self._redirects.pop(title, None)
+
+    def _add_redirect(self, title: str, target: str) -> None:
+        self._redirects[title] = target
+        self._offsets.pop(title, None)
+
+    def _read(self, title: str) -> str | None:
+        offset = self._offsets.get(title)
+        if offset is None:
+            return None
+
+        with open(self.path, "rb") as f:
+            if self.compressed:
+                f.seek(offset)
+                block = self._find_response(_read_member(f), 0, title)
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    block = self._find_response(data, offset, title)
+
+        _, _, body = parse_http_response(block)
+        return body.decode("utf-8", errors="replace")
+
+    def _find_response(self, data, pos: int, title: str) -> bytes:
+        # A gzip member may also hold e.g. the request record.
+        while (pos := _skip_blank_lines(data, pos)) < len(data):
+            headers, block, pos = _parse_record(data, pos)
+            uri = headers.get("warc-target-uri", "")
+            if (
+                headers.get("warc-type") == "response"
+                and canonicalize_phrase(phrase_from_url(uri)) == title
+            ):
+                return block
+
+        raise ValueError(f"No response for '{title}' in {self.path}")
+
+    def _redirect(self, title: str) -> str | None:
+        return self._redirects.get(title)
+
+
+def iter_records(path: str | Path) -> Iterator[WarcRecord]:
+    """
+    Stream the records of a plain or gzip-compressed WARC file.
+
+    Plain files are memory-mapped; compressed ones are decompressed
+    one gzip member at a time.
+    """
+    path = Path(path)
+    if path.suffix == ".gz":
+        with open(path, "rb") as f:
+            for offset, data in _iter_members(f):
+                pos = 0
+                while (pos := _skip_blank_lines(data, pos)) < len(data):
+                    headers, block, pos = _parse_record(data, pos)
+                    yield WarcRecord(offset, headers, block)
+        return
+
+    with open(path, "rb") as f:
+        if path.stat().st_size == 0:
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            pos = 0
+            while (pos := _skip_blank_lines(data, pos)) < len(data):
+                start = pos
+                headers, block, pos = _parse_record(data, pos)
+                yield WarcRecord(start, headers, block)
+
+
+def parse_http_response(block: bytes) -> tuple[int, dict[str, str], bytes]:
+    """
+    Split an archived HTTP response into its status, headers (with
+    lower-case names) and decoded body.
+    """
+    head, _, body = block.partition(b"\r\n\r\n")
+    lines = head.decode("iso-8859-1").split("\r\n")
+
+    parts = lines[0].split(" ", 2)
+    status = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 0
+    headers = _parse_headers(lines[1:])
+
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        body = _dechunk(body)
+    if headers.get("content-encoding", "").lower() in ("gzip", "x-gzip"):
+        body = gzip.decompress(body)
+
+    return status, headers, body
+
+
+def _parse_record(data, pos: int) -> tuple[dict[str, str], bytes, int]:
+    end = data.find(b"\r\n\r\n", pos)
+    if end < 0:
+        raise ValueError("Truncated WARC record header")
+
+    lines = bytes(data[pos:end]).decode("utf-8").split("\r\n")
+    if not lines[0].startswith("WARC/"):
+        raise ValueError(f"Not a WARC record at offset {pos}")
+
+    headers = _parse_headers(lines[1:])
+    start = end + 4
+    length = int(headers.get("content-length", 0))
+    block = bytes(data[start : start + length])
+
+    # The block is followed by two CRLFs.
+    return headers, block, start + length + 4
+
+
+def _skip_blank_lines(data, pos: int) -> int:
+    while data[pos : pos + 2] == b"\r\n":
+        pos += 2
+
+    return pos
+
+
+def _parse_headers(lines: list[str]) -> dict[str, str]:
+    headers = {}
+    for line in lines:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+
+    return headers
+
+
+def _dechunk(body: bytes) -> bytes:
+    chunks = []
+    pos = 0
+    while True:
+        end = body.find(b"\r\n", pos)
+        if end < 0:
+            break
+
+        size = int(body[pos:end].split(b";", 1)[0], 16)
+        if size == 0:
+            break
+
+        chunks.append(body[end + 2 : end + 2 + size])
+        pos = end + 2 + size + 2
+
+    return b"".join(chunks)
+
+
+def _iter_members(f) -> Iterator[tuple[int, bytes]]:
+    start = pos = 0
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    out = []
+    buf = b""
+
+    while True:
+        if not buf:
+            buf = f.read(CHUNK_SIZE)
+            if not buf:
+                break
+
+        out.append(decompressor.decompress(buf))
+        if decompressor.eof:
+            used = len(buf) - len(decompressor.unused_data)
+            yield start, b"".join(out)
+
+            pos += used
+            start = pos
+            buf = decompressor.unused_data
+            decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+            out = []
+        else:
+            pos += len(buf)
+            buf = b""
+
+    if any(out):
+        raise ValueError("Truncated gzip member at the end of the file")
+
+
+def _read_member(f) -> bytes:
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    out = []
+    while not decompressor.eof:
+        chunk = f.read(CHUNK_SIZE)
+        if not chunk:
+            raise ValueError("Truncated gzip member")
+        out.append(decompressor.decompress(chunk))
+
+    return b"".join(out)
@@ -0,0 +1,209 @@
+"""
+Minimal wikitext renderer.
+
+Provides the ``render_page`` function, which turns the wikitext of an
+article from a MediaWiki XML dump into HTML shaped like a rendered
+Wiki page, so that it can be read like a fetched one.
+
+Only the markup that matters for text, links and tables is handled:
+paragraphs, headings, lists, bold and italics, internal and external
+links and tables. Templates, references and comments are dropped,
+since expanding them needs the wiki itself.
+"""
+
+import json
+import re
+from html import escape
+from urllib.parse import quote
+
+COMMENT_RE = re.compile(r"<!--.*?-->", re.S)
+REF_RE = re.compile(r"<ref[^>]*/>|<ref[^>]*>.*?</ref>", re.S | re.I)
+TEMPLATE_RE = re.compile(r"\{\{[^{}]*\}\}")
+LINK_RE = re.compile(r"\[\[([^\[\]|]+)(?:\|([^\[\]]*))?\]\]")
+EXTERNAL_LINK_RE = re.compile(r"\[(?:https?:)?//[^\s\]]+(?:\s+([^\]]*))?\]")
+BOLD_RE = re.compile(r"'''(.+?)'''")
+ITALIC_RE = re.compile(r"''(.+?)''")
+HEADING_RE = re.compile(r"^(={2,6})\s*(.+?)\s*\1\s*$")
+DROPPED_LINK_PREFIXES = ("file:", "image:", "category:", "media:")
+
+PAGE_TEMPLATE = (
+    "<html><head><script>"
+    '"wgArticleId":{page_id},"wgPageName":{title}'
+    "</script></head><body>"
+    '<div id="mw-content-text" class="mw-body-content">'
+    '<div class="mw-parser-output">{content}</div>'
+    "</div></body></html>"
+)
+
+
+def render_page(page_id: int, title: str, wikitext: str) -> str:
+    """
+    Render an article from a dump as a Wiki page.
+
+    Parameters
+    ----------
+    page_id : int
+        The article ID.
+    title : str
+        The article title.
+    wikitext : str
+        The article source.
+
+    Returns
+    -------
+    str
+        HTML with the article ID and page name in a script, like the
+        wiki's, and the rendered content in ``#mw-content-text``.
+    """
+    page_name = json.dumps(title.replace(" ", "_"), ensure_ascii=False)
+    return PAGE_TEMPLATE.format(
+        page_id=page_id, title=page_name, content=wikitext_to_html(wikitext)
+    )
+
+
+def wikitext_to_html(wikitext: str) -> str:
+    """
+    Render the supported subset of wikitext as HTML.
+
+    Parameters
+    ----------
+    wikitext : str
+        The article source.
+
+    Returns
+    -------
+    str
+        The rendered HTML fragment.
+    """
+    text = COMMENT_RE.sub("", wikitext)
+    text = REF_RE.sub("", text)
+    text = _strip_templates(text)
+    text = _render_inline(text)
+    return _render_blocks(text.splitlines())
+
+
+def _strip_templates(text: str) -> str:
+    # Innermost templates first, until no nested ones are left.
+    while True:
+        text, count = TEMPLATE_RE.subn("", text)
+        if not count:
+            return text
+
+
+def _render_inline(text: str) -> str:
+    # Innermost links first, so that links in file captions are
+    # rendered before the file link around them is dropped.
+    while True:
+        text, count = LINK_RE.subn(_render_link, text)
+        if not count:
+            break
+
+    text = EXTERNAL_LINK_RE.sub(lambda m: m.group(1) or "", text)
+    text = BOLD_RE.sub(r"<b>\1</b>", text)
+    return ITALIC_RE.sub(r"<i>\1</i>", text)
+
+
+def _render_link(match: re.Match) -> str:
+    target = match.group(1).strip()
+    if target.lower().startswith(DROPPED_LINK_PREFIXES):
+        return ""
+
+    target = target.lstrip(":")
+    label = match.group(2) if match.group(2) is not None else target
+    href = quote(target.replace(" ", "_"), safe="/:#()_,'!*-.~")
+    return f'<a href="/w/{href}">{label}</a>'
+
+
+def _render_blocks(lines: list[str]) -> str:
+    html: list[str] = []
+    paragraph: list[str] = []
+    items: list[str] = []
+    table: list[str] | None = None
+
+    def flush() -> None:
+        if paragraph:
+            html.append(f"<p>{' '.join(paragraph)}</p>")
+            paragraph.clear()
+        if items:
+            html.append(f"<ul>{''.join(items)}</ul>")
+            items.clear()
+
+    for raw in lines:
+        line = raw.strip()
+
+        if table is not None:
+            table.append(line)
+            if line.startswith("|}"):
+                html.append(_render_table(table))
+                table = None
+            continue
+
+        if line.startswith("{|"):
+            flush()
+            table = [line]
+        elif heading := HEADING_RE.match(line):
+            flush()
+            level = len(heading.group(1))
+            html.append(f"<h{level}>{heading.group(2)}</h{level}>")
+        elif line.startswith(("*", "#")):
+            if paragraph:
+                flush()
+            items.append(f"<li>{line.lstrip('*#').strip()}</li>")
+        elif not line:
+            flush()
+        else:
+            if items:
+                flush()
+            paragraph.append(line.lstrip(":;").strip())
+
+    if table is not None:
+        html.append(_render_table(table))
+    flush()
+
+    return "".join(html)
+
+
+def _render_table(lines: list[str]) -> str:
+    attrs = lines[0][2:].strip()
+    caption = ""
+    rows: list[list[str]] = []
+    cells: list[str] | None = None
+
+    def new_row() -> list[str]:
+        row: list[str] = []
+        rows.append(row)
+        return row
+
+    for line in lines[1:]:
+        if line.startswith("|}"):
+            break
+        if line.startswith("|+"):
+            caption = f"<caption>{line[2:].strip()}</caption>"
+        elif line.startswith("|-"):
+            cells = new_row()
+        elif line.startswith(("!", "|")):
+            if cells is None:
+                cells = new_row()
+            tag = "th" if line[0] == "!" else "td"
+            separator = "!!" if tag == "th" else "||"
+            for cell in line[1:].split(separator):
+                cells.append(_render_cell(tag, cell))
+        elif cells:
+            # A cell continued on the next line.
+            cells[-1] = cells[-1].replace(
+                f"</{cells[-1][1:3]}>", f" {line}</{cells[-1][1:3]}>"
+            )
+
+    body = "".join(f"<tr>{''.join(row)}</tr>" for row in rows if row)
+    attrs = f" {escape(attrs, quote=False)}" if attrs else ""
+    return f"<table{attrs}>{caption}{body}</table>"
+
+
+def _render_cell(tag: str, cell: str) -> str:
+    # "attr=value | content": the attributes come before a single bar.
+    attrs, sep, content = cell.partition("|")
+    if not sep or "=" not in attrs or "<" in attrs:
+        attrs, content = "", cell
+
+    attrs = f" {attrs.strip()}" if attrs.strip() else ""
+    return f"<{tag}{attrs}>{content.strip()}</{tag}>"
@@ -0,0 +1,95 @@
+"""
+MediaWiki XML dump reader.
+
+Provides the ``XmlDumpCorpus`` class, which reads articles from an
+uncompressed MediaWiki XML export and renders their wikitext.
+"""
+
+import mmap
+import re
+import xml.etree.ElementTree as ET
+from html import unescape
+from pathlib import Path
+
+from ..wiki_page.utils import canonicalize_phrase
+from .base import Corpus
+from .wikitext import render_page
+
+PAGE_START = b"<page>"
+PAGE_END = b"</page>"
+TITLE_RE = re.compile(rb"<title>(.*?)</title>", re.S)
+REDIRECT_RE = re.compile(rb'<redirect\s+title="([^"]*)"')
+
+
+class XmlDumpCorpus(Corpus):
+    """
+    Articles of a MediaWiki XML dump (``Special:Export`` or a database
+    dump), rendered from their latest revision's wikitext.
+
+    The dump is memory-mapped and scanned once when opened, keeping
+    only the byte range of every page by title and the targets of
+    redirects, so that pages are parsed only when they are read.
+    Rendering covers text, links and tables; templates are dropped.
+
+    Parameters
+    ----------
+    path : str or Path
+        The ``.xml`` dump file.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._ranges: dict[str, tuple[int, int]] = {}
+        self._redirects: dict[str, str] = {}
+        self._scan()
+
+    def titles(self) -> list[str]:
+        return list(self._ranges)
+
+    def close(self) -> None:
+        self._data.close()
+        self._file.close()
+
+    def _scan(self) -> None:
+        data = self._data
+        pos = 0
+        while (start := data.find(PAGE_START, pos)) >= 0:
+            end = data.find(PAGE_END, start)
+            if end < 0:
+                raise ValueError(f"Truncated page at offset {start}")
+            pos = end + len(PAGE_END)
+
+            # The title and redirect come before the revision text.
+            head_end = data.find(b"<revision", start, pos)
+            head = data[start : head_end if head_end >= 0 else pos]
+            title_match = TITLE_RE.search(head)
+            if title_match is None:
+                continue
+
+            title = canonicalize_phrase(_text(title_match.group(1)))
+            if redirect := REDIRECT_RE.search(head):
+                self._redirects.setdefault(title, _text(redirect.group(1)))
+            else:
+                self._ranges.setdefault(title, (start, pos))
+
+    def _read(self, title: str) -> str | None:
+        span = self._ranges.get(title)
+        if span is None:
+            return None
+
+        page = ET.fromstring(self._data[span[0] : span[1]])
+        # Full-history dumps list the revisions of a page oldest first.
+        revisions = page.findall("revision")
+        text = (revisions[-1].findtext("text") if revisions else None) or ""
+        page_id = int(page.findtext("id") or 0)
+        return render_page(page_id, page.findtext("title") or title, text)
+
+    def _redirect(self, title: str) -> str | None:
+        return self._redirects.get(title)
+
+
+def _text(raw: bytes) -> str:
+    return unescape(raw.decode("utf-8"))
@@ -15,21 +15,61 @@ Modes:
 - ``AutoCountWordsMode``:
     explore a Wiki article graph by following links in them, count
     words in every single one and update a JSON file
+- ``DistributedCountWordsMode``:
+    crawl like ``AutoCountWordsMode`` with several worker processes
+    sharing one frontier, then merge their counts into a JSON file
+- ``ReplayCountWordsMode``:
+    count words in every article of a local corpus, such as a crawl
+    archive, and update a JSON file
 - ``AnalyzeFrequencyMode``:
     perform relative word frequency analysis, comparing word
-    counts from a JSON file and the most common words in a language
+    counts from a JSON or binary file and the most common words in a
+    language
+- ``ConvertCountsMode``:
+    convert a JSON word counts file to a binary counts file
 """
 
-from .analyze_frequency import AnalyzeFrequencyMode
-from .auto_count_words import AutoCountWordsMode
-from .count_words import CountWordsMode
-from .summary import SummaryMode
-from .table import TableMode
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .analyze_frequency import AnalyzeFrequencyMode
+    from .auto_count_words import AutoCountWordsMode
+    from .convert_counts import ConvertCountsMode
+    from .count_words import CountWordsMode
+    from .distributed_count_words import DistributedCountWordsMode
+    from .replay_count_words import ReplayCountWordsMode
+    from .summary import SummaryMode
+    from .table import TableMode
+
+_MODULES = {
+    "SummaryMode": ".summary",
+    "TableMode": ".table",
+    "CountWordsMode": ".count_words",
+    "AutoCountWordsMode": ".auto_count_words",
+    "DistributedCountWordsMode": ".distributed_count_words",
+    "ReplayCountWordsMode": ".replay_count_words",
+    "AnalyzeFrequencyMode": ".analyze_frequency",
+    "ConvertCountsMode": ".convert_counts",
+}
 
 __all__ = [
     "SummaryMode",
     "TableMode",
     "CountWordsMode",
     "AutoCountWordsMode",
+    "DistributedCountWordsMode",
+    "ReplayCountWordsMode",
     "AnalyzeFrequencyMode",
+    "ConvertCountsMode",
 ]
+
+
+def __getattr__(name: str):
+    # Modes are imported on first access, so that the heavy
+    # dependencies of one mode are not loaded to run another.
+    if name in _MODULES:
+        module = importlib.import_module(_MODULES[name], __name__)
+        return getattr(module, name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
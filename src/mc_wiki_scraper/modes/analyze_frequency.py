@@ -5,14 +5,21 @@ Provides the ``AnalyzeFrequencyMode`` class, which loads word
 frequency data collected from Wiki articles, normalizes it, and
 compares it against frequency data from a reference language.
 Results can be displayed as tables and optionally visualized as charts.
+Word counts are read from a JSON file or, for large crawls, from a
+binary counts file (see ``BinaryCounts``) without loading all words.
 """
 
 import json
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-from wordfreq import top_n_list, word_frequency
+
+from ..storage import (
+    BinaryCounts,
+    LangFrequencyIndex,
+    is_binary_counts,
+    top_k,
+)
 
 
 class AnalyzeFrequencyMode:
@@ -37,29 +44,43 @@ class AnalyzeFrequencyMode:
     chart_path : str or None, optional
         Path to save the comparison chart.
         If ``None``, no chart is generated
+    counts_path : str or None, optional
+        JSON or binary word counts file to analyze.
+        Defaults to ``WORD_COUNTS_FILE``
     """
 
     WORD_COUNTS_FILE = "word-counts.json"
     LANG = "en"
     LANGUAGE_NAME = "English"
     MAX_LANG_WORDS = 10_000
-
-    def __init__(self, mode: str, count: int, chart_path: str | None = None):
+    LANG_INDEX_DIR: str | None = None
+
+    def __init__(
+        self,
+        mode: str,
+        count: int,
+        chart_path: str | None = None,
+        counts_path: str | None = None,
+    ):
         self.mode = mode
         self.count = count
         self.chart_path = chart_path
+        self.counts_path = counts_path
 
-        self.word_counts: dict[str, int] = {}
-        self.article_norms: dict[str, float] = {}
-        self.lang_norms: dict[str, float] = {}
+        self.words: np.ndarray | None = np.array([], dtype=object)
+        self.counts = np.array([], dtype=np.int64)
+        self.article_freqs = np.array([], dtype=float)
+        self.lang_words = np.array([], dtype=object)
+        self.lang_freqs = np.array([], dtype=float)
+        self._binary: BinaryCounts | None = None
 
     def run(self):
         """
         Perform the frequency analysis and display the results.
 
-        Loads word counts from a JSON file, normalizes article and
-        language frequencies,and produces a comparison table according
-        to the selected mode.
+        Loads word counts from a JSON or binary file, normalizes article
+        and language frequencies,and produces a comparison table
+        according to the selected mode.
         The table is printed to standard output.
 
         If a chart path was provided, a bar chart visualizing
@@ -82,13 +103,30 @@ class AnalyzeFrequencyMode:
 
     def load_word_counts(self):
         """
-        Load word count data from a JSON file.
+        Load word count data from a JSON or binary counts file.
 
         The file is expected to contain a mapping from words to their
-        occurrence counts in Wiki articles.
+        occurrence counts in Wiki articles. They are kept as two
+        aligned arrays, ``words`` and ``counts``, in file order. For a
+        binary counts file, ``counts`` is memory-mapped and ``words``
+        is None: words are only decoded when looked up. Either way,
+        words with equal counts are ranked in sorted order.
         """
-        with open(self.WORD_COUNTS_FILE, encoding="utf-8") as f:
-            self.word_counts = json.load(f)
+        path = self.counts_path or self.WORD_COUNTS_FILE
+        if is_binary_counts(path):
+            self._binary = BinaryCounts(path)
+            self.words = None
+            self.counts = self._binary.counts
+            return
+
+        with open(path, encoding="utf-8") as f:
+            word_counts = json.load(f)
+
+        self._binary = None
+        self.words = np.fromiter(word_counts, dtype=object)
+        self.counts = np.fromiter(
+            word_counts.values(), dtype=np.int64, count=len(word_counts)
+        )
 
     def normalize_article_counts(self):
         """
@@ -97,12 +135,10 @@ class AnalyzeFrequencyMode:
         Frequencies are normalized by dividing each count by the maximum
         word frequency found in the article.
         """
-        if self.word_counts is None:
+        if not len(self.counts):
             raise ValueError("Empty word counts")
-        max_freq = max(self.word_counts.values())
-        self.article_norms = {
-            w: c / max_freq for w, c in self.word_counts.items()
-        }
+
+        self.article_freqs = self.counts / self.counts.max()
 
     def normalize_lang_counts(self):
         """
@@ -110,12 +146,15 @@ class AnalyzeFrequencyMode:
 
         Word frequencies are obtained using ``word_freq`` frequency
         values for the most common words in the selected language and
-        normalized by the maximum word frequency.
+        normalized by the maximum word frequency. They are computed
+        once and then loaded from a ``LangFrequencyIndex`` cached in
+        ``LANG_INDEX_DIR``.
         """
-        lang_words = top_n_list(self.LANG, self.MAX_LANG_WORDS)
-        lang_f = {w: word_frequency(w, self.LANG) for w in lang_words}
-        lang_max = max(lang_f.values())
-        self.lang_norms = {w: f / lang_max for w, f in lang_f.items()}
+        index = LangFrequencyIndex.get(
+            self.LANG, self.MAX_LANG_WORDS, self.LANG_INDEX_DIR
+        )
+        self.lang_words = index.words.astype(object)
+        self.lang_freqs = index.freqs
 
     def plot_comparison(self, table: pd.DataFrame):
         """
@@ -130,6 +169,8 @@ class AnalyzeFrequencyMode:
         table : pandas.DataFrame
             DataFrame containing words and their normalized frequencies.
         """
+        import matplotlib.pyplot as plt
+
         words = table["word"].astype(str).tolist()
         article_freqs = table["frequency in the article"].fillna(0).to_numpy()
         lang_freqs = table["frequency in wiki language"].fillna(0).to_numpy()
@@ -149,35 +190,44 @@ class AnalyzeFrequencyMode:
         plt.close()
 
     def _get_table_article_mode(self) -> pd.DataFrame:
-        rows = []
-        for word, freq in sorted(
-            self.article_norms.items(), key=lambda x: x[1], reverse=True
-        )[: self.count]:
-            rows.append(
-                {
-                    "word": word,
-                    "frequency in the article": freq,
-                    "frequency in wiki language": self.lang_norms.get(
-                        word, np.nan
-                    ),
-                }
-            )
-
-        return pd.DataFrame(rows)
+        # Words in a binary counts file are sorted, so their positions
+        # order them the same as the words of a JSON file.
+        top = top_k(self.article_freqs, self.count, self.words)
+        if self._binary is not None:
+            words = self._binary.words(top)
+        else:
+            words = self.words[top]
+        positions = pd.Index(self.lang_words).get_indexer(words)
+        lang_freqs = _take(self.lang_freqs, positions)
+
+        return _table(words, self.article_freqs[top], lang_freqs)
 
     def _get_table_lang_mode(self) -> pd.DataFrame:
-        rows = []
-        for word, freq in sorted(
-            self.lang_norms.items(), key=lambda x: x[1], reverse=True
-        )[: self.count]:
-            rows.append(
-                {
-                    "word": word,
-                    "frequency in the article": self.article_norms.get(
-                        word, np.nan
-                    ),
-                    "frequency in wiki language": freq,
-                }
-            )
-
-        return pd.DataFrame(rows)
+        top = top_k(self.lang_freqs, self.count)
+        words = self.lang_words[top]
+        if self._binary is not None:
+            positions = self._binary.indices(words)
+        else:
+            positions = pd.Index(self.words).get_indexer(words)
+        article_freqs = _take(self.article_freqs, positions)
+
+        return _table(words, article_freqs, self.lang_freqs[top])
+
+
+def _take(values: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    # The value at every position, or NaN for -1 (a missing word).
+    found = values[positions].astype(float)
+    found[positions < 0] = np.nan
+    return found
+
+
+def _table(
+    words: np.ndarray, article_freqs: np.ndarray, lang_freqs: np.ndarray
+) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "word": words,
+            "frequency in the article": article_freqs,
+            "frequency in wiki language": lang_freqs,
+        }
+    )
@@ -6,10 +6,43 @@ with word counts from a Wiki article then repeats for every internal
 link found within it, up to a certain depth.
 """
 
-import time
+import multiprocessing
 from collections import deque
+from collections.abc import Sequence
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from contextlib import ExitStack
+from itertools import islice
 
+from requests import RequestException
+
+from ..corpus import ArchiveWriter
+from ..storage import (
+    ArticleCountsStore,
+    BloomFilter,
+    CountsStore,
+    CrawlCheckpoint,
+    Frontier,
+    JsonCountsStore,
+    LossyCounter,
+    PageLedger,
+    SqliteCountsStore,
+)
 from ..wiki_page import WikiPage
+from ..wiki_page.utils import (
+    MAX_TITLES,
+    Extracted,
+    PageInfo,
+    canonicalize_phrase,
+    configure_rate_limit,
+    configure_session,
+    resolve_parser,
+    resolve_titles,
+    set_default_parser,
+)
 from .count_words import CountWordsMode
 
 
@@ -18,6 +51,58 @@ class AutoCountWordsMode:
     Update a JSON file with word counts from many Wiki articles
     by following links inside them.
 
+    Articles are downloaded by a pool of worker threads, while
+    counting and link following happen on the calling thread in
+    breadth-first order, so the result is the same as a sequential
+    crawl. With the ``api`` backend, every request fetches the parsed
+    content of up to ``MAX_TITLES`` articles through the MediaWiki API
+    instead of one full rendered page.
+
+    Links are deduplicated by their canonical spelling before they are
+    queued. Queued phrases are kept in a compact ``Frontier``; with
+    ``seen_error_rate``, seen phrases are tracked in a ``BloomFilter``
+    instead of a set, at the cost of skipping that share of new links.
+    With ``resolve``, queued phrases are also resolved to page IDs
+    through the MediaWiki API, ``MAX_TITLES`` per request, so that
+    redirects to articles already visited or scheduled are dropped
+    before anything is downloaded.
+
+    With ``parse_processes``, downloaded pages are handed to a pool of
+    processes that parse them and send back only their word counts and
+    link phrases, so parsing uses more than one core. ``queue_depth``
+    bounds the number of batches downloaded or parsed ahead of the one
+    being processed, and with it the memory taken by pages in flight.
+
+    Counts are written to the store every ``commit_every`` articles.
+    If a checkpoint is given, the crawl state is saved to it right
+    before every write, so that an interrupted crawl can be resumed
+    without fetching or counting any article twice. The whole state is
+    saved every time, so large crawls should commit less often.
+
+    With an ``archive``, the HTML of every counted article is appended
+    to it with its page and revision IDs, so that the crawl can later be
+    replayed from disk, e.g. by ``ReplayCountWordsMode``.
+
+    With a ``ledger``, the crawl is incremental: the revision, counts
+    and links of every counted article are recorded, and articles whose
+    revision has not changed since are not counted again, their links
+    being followed from the ledger. For changed articles, only the
+    difference from the recorded counts is added to the store, which
+    must be the one the ledger was built with. Revisions are compared
+    once a page is downloaded (a cheap revalidation with the page
+    cache), or, with ``resolve``, before, so that unchanged articles are
+    not downloaded at all.
+
+    With ``ngrams``, the n-grams of every article, such as its bigrams
+    and trigrams, are also counted, in a ``LossyCounter`` that drops
+    rare ones to keep memory bounded, and spilled to a separate store
+    every time the word counts are written. N-gram counts cannot be
+    kept in a ledger, so an incremental crawl cannot count them.
+
+    With ``articles``, the word counts of every counted article are
+    also kept separately, keyed by its page ID, and written along with
+    the totals.
+
     Parameters
     ----------
     root_page : WikiPage
@@ -25,19 +110,130 @@ class AutoCountWordsMode:
     max_depth : int, optional
         Maximum depth of links to follow. Defaults to 1
     wait : float, optional
-        Wait time between article scans. Defaults to 0.1
+        Minimum average time between two requests, shared by all
+        workers. Defaults to 0.1
+    workers : int, optional
+        Number of articles downloaded concurrently. Defaults to 4
+    store : CountsStore, optional
+        Store to add the counts to, closed when the crawl ends. It
+        should not flush on its own (``flush_every=None``). Defaults
+        to a ``JsonCountsStore`` at ``CountWordsMode.JSONPATH``
+    backend : str, optional
+        ``'html'`` to download rendered pages or ``'api'`` to batch
+        requests through the MediaWiki API. Defaults to ``'html'``
+    checkpoint : CrawlCheckpoint, optional
+        Where to save the crawl state. Defaults to no checkpoints
+    resume : bool, optional
+        Continue the crawl saved in ``checkpoint``, if there is one.
+        Defaults to False
+    resolve : bool, optional
+        Resolve phrases to page IDs before downloading them. Defaults
+        to False
+    burst : int, optional
+        Number of requests that may start at once after an idle
+        period. Defaults to 1
+    seen_error_rate : float, optional
+        False-positive rate of the Bloom filter of seen phrases.
+        Defaults to None, which keeps them in an exact set
+    seen_capacity : int, optional
+        Number of phrases the Bloom filter is sized for. Defaults to
+        ``SEEN_CAPACITY``
+    parse_processes : int, optional
+        Number of processes parsing pages, or 0 to parse them on the
+        calling thread. Defaults to 0
+    queue_depth : int, optional
+        Maximum number of batches in flight. Defaults to twice the
+        number of workers
+    archive : ArchiveWriter, optional
+        Archive to append counted articles to, closed when the crawl
+        ends. Defaults to no archive
+    ledger : PageLedger, optional
+        Ledger of counted articles from earlier crawls into the same
+        store, closed when the crawl ends. Defaults to no ledger
+    ngrams : Sequence[int], optional
+        Sizes of the n-grams to count, e.g. ``(2, 3)``. Defaults to
+        none
+    ngram_store : CountsStore, optional
+        Store to add the n-gram counts to, closed when the crawl ends.
+        It should not flush on its own. Defaults to a
+        ``SqliteCountsStore`` at ``CountWordsMode.NGRAM_SQLITEPATH``
+        that exports to ``CountWordsMode.NGRAM_JSONPATH``
+    ngram_error : float, optional
+        Largest undercount of an n-gram, as a share of all n-grams
+        counted. Defaults to ``NGRAM_ERROR``
+    articles : ArticleCountsStore, optional
+        Store to keep the counts of every article in, closed when the
+        crawl ends. Defaults to none
+    commit_every : int, optional
+        Number of articles counted between two writes of the counts
+        and the checkpoint. Defaults to ``FLUSH_EVERY``
     """
 
+    FLUSH_EVERY = 50
+    SEEN_CAPACITY = 1_000_000
+    NGRAM_ERROR = 1e-5
+
     def __init__(
-        self, root_page: WikiPage, max_depth: int = 1, wait: float = 0.1
+        self,
+        root_page: WikiPage,
+        max_depth: int = 1,
+        wait: float = 0.1,
+        workers: int = 4,
+        store: CountsStore | None = None,
+        backend: str = "html",
+        checkpoint: CrawlCheckpoint | None = None,
+        resume: bool = False,
+        resolve: bool = False,
+        burst: int = 1,
+        seen_error_rate: float | None = None,
+        seen_capacity: int = SEEN_CAPACITY,
+        parse_processes: int = 0,
+        queue_depth: int | None = None,
+        archive: ArchiveWriter | None = None,
+        ledger: PageLedger | None = None,
+        ngrams: Sequence[int] = (),
+        ngram_store: CountsStore | None = None,
+        ngram_error: float = NGRAM_ERROR,
+        articles: ArticleCountsStore | None = None,
+        commit_every: int | None = None,
     ):
+        if ngrams and ledger is not None:
+            raise ValueError("N-grams cannot be counted with a ledger")
+
         self.root_page = root_page
         self.max_depth = max_depth
         self.wait = wait
+        self.workers = workers
+        self.store = store
+        self.backend = backend
+        self.checkpoint = checkpoint
+        self.resume = resume
+        self.resolve = resolve
+        self.burst = burst
+        self.parse_processes = parse_processes
+        self.queue_depth = queue_depth or 2 * workers
+        self.archive = archive
+        self.ledger = ledger
+        self.ngrams = tuple(ngrams)
+        self.ngram_store = ngram_store
+        self.articles = articles
+        self.commit_every = commit_every or self.FLUSH_EVERY
 
-        self.queue: deque[tuple[str, int]] = deque()
+        self.queue = Frontier()
         self.visited_ids: set[int] = set()
-        self.seen_phrases: set[str] = set()
+        self.seen_phrases: set[str] | BloomFilter = set()
+        if seen_error_rate is not None:
+            self.seen_phrases = BloomFilter(seen_capacity, seen_error_rate)
+
+        self._in_flight: deque[tuple[list[tuple[str, int]], Future]] = deque()
+        self._uncommitted = 0
+        self._resolved: dict[str, PageInfo | None] = {}
+        self._scheduled_ids: set[int] = set()
+        self._parse_pool: ProcessPoolExecutor | None = None
+        self._revisions: dict[int, int] = {}
+        self._ngram_counts: LossyCounter | None = None
+        if self.ngrams:
+            self._ngram_counts = LossyCounter(ngram_error)
 
     def run(self) -> None:
         """
@@ -50,23 +246,367 @@ class AutoCountWordsMode:
         If the root article has no content, an informative message is
         printed instead.
         """
+        if self.store is None:
+            self.store = JsonCountsStore(CountWordsMode.JSONPATH, None)
+        if self.ngrams and self.ngram_store is None:
+            self.ngram_store = SqliteCountsStore(
+                CountWordsMode.NGRAM_SQLITEPATH,
+                None,
+                export_path=CountWordsMode.NGRAM_JSONPATH,
+            )
+
+        # Every request of the crawl, including resolution and API
+        # batches, is throttled in the fetch layer. Pages served from
+        # the offline cache or skipped as known do not take from it.
+        configure_rate_limit(self.wait, self.burst)
+        configure_session(self.workers)
+
+        with ExitStack() as stack:
+            stack.enter_context(self.store)
+            for resource in (
+                self.ngram_store,
+                self.articles,
+                self.archive,
+                self.ledger,
+            ):
+                if resource is not None:
+                    stack.enter_context(resource)
+
+            resumed = self.resume and self._restore()
+            self._sync_ledger()
+            if not resumed and not self._start():
+                return
+
+            try:
+                self._crawl()
+            except BaseException:
+                # Counts merged since the checkpoint would be counted
+                # again on resume, so they must not reach the stores.
+                # Otherwise they are written, with the n-grams counted
+                # so far and the articles they come from in the ledger.
+                if self.checkpoint is not None:
+                    self._discard()
+                else:
+                    self._commit()
+                raise
+
+            self._commit()
+
+        if self.checkpoint is not None:
+            self.checkpoint.remove()
+
+    def _start(self) -> bool:
         root_info = self.root_page.get_info()
         if root_info is None:
             print(f"No article available for '{self.root_page.phrase}'")
+            return False
+
+        # The root article is already downloaded, so it is counted
+        # right away instead of being queued.
+        self.seen_phrases.add(canonicalize_phrase(root_info[1]))
+        self._scheduled_ids.add(root_info[0])
+        self._process_page(self.root_page, 0)
+        return True
+
+    def _crawl(self) -> None:
+        if self.backend == "api":
+            fetch, batch_size = self._fetch_api, MAX_TITLES
+        else:
+            fetch, batch_size = self._fetch_html, 1
+
+        in_flight = self._in_flight
+        # The parsing pool is entered first, so that it is shut down
+        # only after the download threads that submit to it.
+        with ExitStack() as stack:
+            if self.parse_processes:
+                self._parse_pool = stack.enter_context(
+                    ProcessPoolExecutor(
+                        self.parse_processes,
+                        # Spawned, because forking while the download
+                        # threads run is not safe.
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=set_default_parser,
+                        initargs=(resolve_parser(),),
+                    )
+                )
+            executor = stack.enter_context(ThreadPoolExecutor(self.workers))
+
+            while self.queue or in_flight:
+                # Keep a few downloads ahead of the one being processed.
+                # Results are consumed in submission order, which keeps
+                # the traversal breadth-first.
+                while self.queue and len(in_flight) < self.queue_depth:
+                    batch = self._take(batch_size)
+                    if batch:
+                        future = executor.submit(self._download, fetch, batch)
+                        in_flight.append((batch, future))
+
+                if not in_flight:
+                    continue
+
+                batch, future = in_flight[0]
+                pages = future.result()
+                in_flight.popleft()
+
+                for (page, parsed), (_, depth) in zip(
+                    pages, batch, strict=True
+                ):
+                    if page is not None:
+                        self._process_page(page, depth, parsed)
+
+                if self._uncommitted >= self.commit_every:
+                    self._commit()
+
+        self._parse_pool = None
+
+    def _download(
+        self, fetch, batch: list[tuple[str, int]]
+    ) -> list[tuple[WikiPage | None, Future | None]]:
+        pages = fetch([phrase for phrase, _ in batch])
+        if self._parse_pool is None:
+            return [(page, None) for page in pages]
+
+        results = []
+        for page, (_, depth) in zip(pages, batch, strict=True):
+            parsed = None
+            info = page.get_info() if page is not None else None
+            # Known and unchanged articles are skipped on the calling
+            # thread anyway, so they are not worth sending to the pool.
+            if (
+                info is not None
+                and info[0] not in self.visited_ids
+                and not self._unchanged(info[0], page.get_revision_id())
+            ):
+                parsed = self._parse_pool.submit(
+                    extract_counts,
+                    page.phrase,
+                    page.get_html(),
+                    depth < self.max_depth,
+                    self.ngrams,
+                )
+            results.append((page, parsed))
+
+        return results
+
+    def _commit(self) -> None:
+        # The checkpoint is saved before the counts are written, with
+        # the number the write will get and the counts in it. If the
+        # crawl dies in between, resuming writes them again. The ledger
+        # is committed in between, with the same number and counts.
+        pending = self.store.buffered
+        commit_seq = self.store.commit_seq + bool(pending)
+        # N-grams are spilled to their store along with every write,
+        # and saved in the checkpoint the same way.
+        ngrams = {}
+        if self._ngram_counts is not None:
+            self.ngram_store.merge(self._ngram_counts.spill())
+            ngram_pending = self.ngram_store.buffered
+            ngram_seq = self.ngram_store.commit_seq + bool(ngram_pending)
+            ngrams = {"commit_seq": ngram_seq, "pending": ngram_pending}
+
+        if self.checkpoint is not None:
+            frontier = [item for batch, _ in self._in_flight for item in batch]
+            self.checkpoint.save(
+                {
+                    "root": self.root_page.phrase,
+                    "frontier": frontier + list(self.queue),
+                    "visited_ids": list(self.visited_ids),
+                    "seen_phrases": self._dump_seen(),
+                    "commit_seq": commit_seq,
+                    "pending": pending,
+                    "ledger": self._dump_ledger(),
+                    "ngrams": ngrams,
+                }
+            )
+
+        if self.ledger is not None:
+            self.ledger.commit(commit_seq, pending)
+        if self.articles is not None:
+            self.articles.commit()
+        self.store.flush()
+        if self.ngram_store is not None:
+            self.ngram_store.flush()
+        self._uncommitted = 0
+
+    def _discard(self) -> None:
+        self.store.discard()
+        if self.ledger is not None:
+            self.ledger.discard()
+        if self.articles is not None:
+            self.articles.discard()
+        if self._ngram_counts is not None:
+            self._ngram_counts.clear()
+            self.ngram_store.discard()
+
+    def _restore(self) -> bool:
+        state = self.checkpoint.load() if self.checkpoint else None
+        if state is None:
+            return False
+
+        if state["root"] != self.root_page.phrase:
+            raise ValueError(
+                f"Checkpoint {self.checkpoint.path} belongs to a crawl "
+                f"from '{state['root']}'"
+            )
+
+        self._catch_up(self.store, state["commit_seq"], state["pending"])
+        ngrams = state.get("ngrams")
+        if self.ngram_store is not None and ngrams:
+            self._catch_up(
+                self.ngram_store, ngrams["commit_seq"], ngrams["pending"]
+            )
+
+        # The articles of the batch are missing from the ledger if the
+        # crawl died before it was committed.
+        ledger_state = state.get("ledger", {})
+        if self.ledger is not None and (
+            self.ledger.commit_seq < state["commit_seq"]
+        ):
+            for page_id, entry in ledger_state.items():
+                self.ledger.record(int(page_id), *entry)
+            self.ledger.commit(state["commit_seq"], state["pending"])
+
+        self.queue.extend(
+            (phrase, depth) for phrase, depth in state["frontier"]
+        )
+        self.visited_ids.update(state["visited_ids"])
+        self._load_seen(state["seen_phrases"])
+        print(f"Resuming crawl with {len(self.queue)} articles queued")
+        return True
+
+    def _catch_up(
+        self, store: CountsStore, commit_seq: int, pending: dict[str, int]
+    ) -> None:
+        missing = commit_seq - store.commit_seq
+        if missing == 1:
+            store.merge(pending)
+            store.flush()
+        elif missing != 0:
+            raise ValueError(
+                f"Checkpoint {self.checkpoint.path} does not match "
+                f"the counts in {store.path}"
+            )
+
+    def _sync_ledger(self) -> None:
+        if self.ledger is None:
+            return
+
+        # The ledger is committed right before the store is flushed.
+        # If the crawl died in between, the batch is flushed now.
+        if self.ledger.commit_seq == self.store.commit_seq + 1:
+            self.store.merge(self.ledger.pending)
+            self.store.flush()
+
+        self._revisions = self.ledger.revisions()
+
+    def _dump_ledger(self) -> dict:
+        if self.ledger is None:
+            return {}
+
+        return {
+            str(page_id): list(entry)
+            for page_id, entry in self.ledger.buffered.items()
+        }
+
+    def _unchanged(self, page_id: int, rev_id: int | None) -> bool:
+        return rev_id is not None and self._revisions.get(page_id) == rev_id
+
+    def _reuse(self, page_id: int, depth: int) -> bool:
+        # Counts of an unchanged article are already in the store, and
+        # its links in the ledger, unless it was counted too deep to
+        # follow them.
+        entry = self.ledger.get(page_id)
+        follow_links = depth < self.max_depth
+        if entry is None or (follow_links and entry.links is None):
+            return False
+
+        self.visited_ids.add(page_id)
+        print(entry.title)
+        if follow_links:
+            self._enqueue_links(set(entry.links), depth)
+
+        return True
+
+    def _take(self, size: int) -> list[tuple[str, int]]:
+        if not self.resolve:
+            size = min(size, len(self.queue))
+            return [self.queue.popleft() for _ in range(size)]
+
+        batch = []
+        while self.queue and len(batch) < size:
+            if self.queue[0][0] not in self._resolved:
+                self._resolve_queue()
+
+            phrase, depth = self.queue.popleft()
+            info = self._resolved.pop(phrase)
+            if info is None or info.page_id in self._scheduled_ids:
+                continue
+
+            self._scheduled_ids.add(info.page_id)
+            if self._unchanged(info.page_id, info.rev_id) and self._reuse(
+                info.page_id, depth
+            ):
+                continue
+
+            batch.append((info.title, depth))
+
+        return batch
+
+    def _resolve_queue(self) -> None:
+        phrases = [
+            phrase
+            for phrase, _ in islice(self.queue, MAX_TITLES)
+            if phrase not in self._resolved
+        ]
+        try:
+            resolved = resolve_titles(phrases, self.root_page.API_URL)
+        except RequestException as e:
+            # Like a failed fetch, a failed batch drops its articles.
+            print(
+                f"Failed to resolve {len(phrases)} articles - skipping ({e})"
+            )
+            resolved = dict.fromkeys(phrases)
+
+        self._resolved.update(resolved)
+
+    def _dump_seen(self) -> list[str] | dict:
+        if isinstance(self.seen_phrases, BloomFilter):
+            return self.seen_phrases.to_state()
+
+        return list(self.seen_phrases)
+
+    def _load_seen(self, seen: list[str] | dict) -> None:
+        if isinstance(seen, dict):
+            self.seen_phrases = BloomFilter.from_state(seen)
             return
 
-        root_title = root_info[1]
-        self.queue.append((root_title, 0))
-        self.seen_phrases.add(root_title)
+        for phrase in seen:
+            self.seen_phrases.add(phrase)
+
+    def _fetch_html(self, phrases: list[str]) -> list[WikiPage | None]:
+        pages: list[WikiPage | None] = []
+        for phrase in phrases:
+            page = WikiPage(phrase)
+            try:
+                page.get_html()
+            except RequestException as e:
+                # One failed article should not end a long crawl.
+                print(f"Failed to fetch {phrase} - skipping ({e})")
+                page = None
+            pages.append(page)
 
-        while self.queue:
-            self._process_phrase()
-            time.sleep(self.wait)
+        return pages
 
-    def _process_phrase(self) -> None:
-        phrase, depth = self.queue.popleft()
-        page = WikiPage(phrase)
+    def _fetch_api(self, phrases: list[str]) -> list[WikiPage | None]:
+        try:
+            return WikiPage.fetch_batch(phrases, self.root_page.API_URL)
+        except RequestException as e:
+            print(f"Failed to fetch {len(phrases)} articles - skipping ({e})")
+            return [None] * len(phrases)
 
+    def _process_page(
+        self, page: WikiPage, depth: int, parsed: Future | None = None
+    ) -> None:
         info = page.get_info()
         if info is None:
             return
@@ -75,24 +615,79 @@ class AutoCountWordsMode:
         if page_id in self.visited_ids:
             return
 
-        content = page.get_content()
-        if content is None:
+        rev_id = page.get_revision_id() if self.ledger is not None else None
+        if self._unchanged(page_id, rev_id) and self._reuse(page_id, depth):
+            return
+
+        follow_links = depth < self.max_depth
+        if parsed is not None:
+            data = parsed.result()
+        else:
+            data = page.extract(
+                paragraphs=False, links=follow_links, ngrams=self.ngrams
+            )
+        if data is None:
             print(f"No content in {title} - skipping")
             return
 
         self.visited_ids.add(page_id)
+        if self.archive is not None:
+            self.archive.write(
+                page.phrase,
+                page.get_html(),
+                page_id,
+                title,
+                page.get_revision_id(),
+            )
+
         print(title)
-        CountWordsMode(page).run()
+        counts = data.word_counts
+        if self.articles is not None:
+            self.articles.record(
+                page_id, title, counts, page.get_revision_id()
+            )
+        if self.ledger is not None:
+            links = sorted(data.link_phrases) if follow_links else None
+            counts = self.ledger.record(page_id, title, rev_id, counts, links)
 
-        if depth < self.max_depth:
-            self._enqueue_links(page, depth)
+        self.store.merge(counts)
+        if self._ngram_counts is not None:
+            self._ngram_counts.update(data.ngram_counts)
+        self._uncommitted += 1
 
-    def _enqueue_links(self, page: WikiPage, depth: int) -> None:
-        link_phrases = page.get_link_phrases()
-        if link_phrases is None:
-            return
+        if follow_links:
+            self._enqueue_links(data.link_phrases, depth)
 
+    def _enqueue_links(self, link_phrases: set[str], depth: int) -> None:
         for phrase in link_phrases:
-            if phrase not in self.seen_phrases:
-                self.seen_phrases.add(phrase)
+            key = canonicalize_phrase(phrase)
+            if key not in self.seen_phrases:
+                self.seen_phrases.add(key)
                 self.queue.append((phrase, depth + 1))
+
+
+def extract_counts(
+    phrase: str, html: str, links: bool, ngrams: Sequence[int] = ()
+) -> Extracted | None:
+    """
+    Extract the word counts and, optionally, the link phrases and
+    n-gram counts of an article from its HTML, in a parsing process.
+
+    Parameters
+    ----------
+    phrase : str
+        The article phrase.
+    html : str
+        The downloaded HTML.
+    links : bool
+        Whether to extract link phrases too.
+    ngrams : Sequence[int], optional
+        Sizes of the n-grams to count, if any. Defaults to none
+
+    Returns
+    -------
+    Extracted | None
+        Counts and links, or None if the article has no content.
+    """
+    page = WikiPage.from_html(phrase, html)
+    return page.extract(paragraphs=False, links=links, ngrams=ngrams)
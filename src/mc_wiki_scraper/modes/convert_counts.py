@@ -0,0 +1,33 @@
+"""
+Convert word counts mode.
+
+Provides the ``ConvertCountsMode`` class, which converts a
+``word-counts.json`` file to a binary counts file that
+``AnalyzeFrequencyMode`` reads without loading all of its words.
+"""
+
+from pathlib import Path
+
+from ..storage import convert_json_counts
+
+
+class ConvertCountsMode:
+    """
+    Convert a JSON word counts file to a binary counts file.
+
+    Parameters
+    ----------
+    source : str or Path
+        The JSON file mapping words to counts.
+    target : str or Path
+        The binary counts file to write, replaced if it exists.
+    """
+
+    def __init__(self, source: str | Path, target: str | Path):
+        self.source = source
+        self.target = target
+
+    def run(self) -> None:
+        """Convert the file and print the number of words converted."""
+        n = convert_json_counts(self.source, self.target)
+        print(f"Converted {n} words to {self.target}")
@@ -5,10 +5,10 @@ Provides the ``CountWordsMode`` class, which extracts word counts
 from a Wiki article and updates a JSON file with aggregated results.
 """
 
-import json
-from collections import Counter
-from pathlib import Path
+from collections.abc import Sequence
+from contextlib import ExitStack
 
+from ..storage import CountsStore, JsonCountsStore, SqliteCountsStore
 from ..wiki_page import WikiPage
 
 
@@ -16,16 +16,41 @@ class CountWordsMode:
     """
     Read word counts from a Wiki article and update a JSON file.
 
+    With ``ngrams``, the n-grams of the article, such as its bigrams
+    and trigrams, are also counted, into a separate store.
+
     Parameters
     ----------
     page : WikiPage
         A WikiPage instance representing the article
+    store : CountsStore, optional
+        Store to add the counts to. Closed once the counts are added.
+        Defaults to a ``JsonCountsStore`` at ``JSONPATH``
+    ngrams : Sequence[int], optional
+        Sizes of the n-grams to count, e.g. ``(2, 3)``. Defaults to
+        none
+    ngram_store : CountsStore, optional
+        Store to add the n-gram counts to, closed once they are added.
+        Defaults to a ``SqliteCountsStore`` at ``NGRAM_SQLITEPATH``
+        that exports to ``NGRAM_JSONPATH``
     """
 
     JSONPATH = "word-counts.json"
+    SQLITEPATH = "word-counts.sqlite"
+    NGRAM_JSONPATH = "ngram-counts.json"
+    NGRAM_SQLITEPATH = "ngram-counts.sqlite"
 
-    def __init__(self, page: WikiPage):
+    def __init__(
+        self,
+        page: WikiPage,
+        store: CountsStore | None = None,
+        ngrams: Sequence[int] = (),
+        ngram_store: CountsStore | None = None,
+    ):
         self.page = page
+        self.store = store
+        self.ngrams = tuple(ngrams)
+        self.ngram_store = ngram_store
 
     def run(self) -> None:
         """
@@ -34,24 +59,23 @@ class CountWordsMode:
         If the article has no content, an informative message is printed
         instead.
         """
-        counts = self.page.get_word_counts()
-        if counts is None:
-            print(f"No word counts available for {self.page.phrase}")
-            return
-
-        self._update_json(counts)
-
-    def _update_json(self, counts: Counter) -> None:
-        path = Path(self.JSONPATH)
+        store = self.store or JsonCountsStore(self.JSONPATH)
+        ngram_store = self.ngram_store
+        if self.ngrams and ngram_store is None:
+            ngram_store = SqliteCountsStore(
+                self.NGRAM_SQLITEPATH, export_path=self.NGRAM_JSONPATH
+            )
 
-        try:
-            with open(path, encoding="utf-8") as f:
-                total_counts = json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            total_counts = {}
+        with ExitStack() as stack:
+            stack.enter_context(store)
+            if ngram_store is not None:
+                stack.enter_context(ngram_store)
 
-        for word, c in counts.items():
-            total_counts[word] = total_counts.get(word, 0) + c
+            counts = self.page.get_word_counts()
+            if counts is None:
+                print(f"No word counts available for {self.page.phrase}")
+                return
 
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(total_counts, f, ensure_ascii=False, indent=2)
+            store.merge(counts)
+            if self.ngrams:
+                ngram_store.merge(self.page.get_ngram_counts(self.ngrams))
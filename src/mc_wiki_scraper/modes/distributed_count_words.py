@@ -0,0 +1,289 @@
+"""
+Distributed count words mode for Wiki articles.
+
+Provides the ``DistributedCountWordsMode`` class, which crawls Wiki
+articles like ``AutoCountWordsMode`` but with several worker processes,
+possibly on different hosts, sharing one crawl frontier, and merges
+their word counts into a JSON file at the end.
+"""
+
+import multiprocessing
+import os
+import socket
+import time
+from pathlib import Path
+
+from requests import RequestException
+
+from ..corpus import open_corpus
+from ..storage import CountsStore, CrawlResult, JsonCountsStore, SharedFrontier
+from ..wiki_page import WikiPage
+from ..wiki_page.utils import (
+    canonicalize_phrase,
+    configure_cache,
+    configure_corpus,
+    configure_rate_limit,
+    get_cache,
+    get_corpus,
+    resolve_parser,
+    set_default_parser,
+)
+from .count_words import CountWordsMode
+
+ROLES = ("run", "seed", "work", "reduce")
+
+
+class DistributedCountWordsMode:
+    """
+    Update a JSON file with word counts from many Wiki articles,
+    crawled by several worker processes sharing a ``SharedFrontier``.
+
+    The work is split into roles, so that it can be spread over hosts
+    sharing a filesystem:
+
+    - ``seed`` starts a crawl from the root article,
+    - ``work`` claims batches of queued articles, downloads and counts
+      them and commits the counts and new links, until the frontier is
+      exhausted,
+    - ``reduce`` merges the counts of a finished crawl into the store,
+    - ``run`` does all of the above on one host, with ``processes``
+      local workers. A crawl already in the frontier is continued.
+
+    Parameters
+    ----------
+    frontier_path : str or Path
+        Location of the shared frontier database.
+    role : str, optional
+        One of ``ROLES``. Defaults to ``'run'``
+    root_page : WikiPage, optional
+        The article to start from, needed to ``seed`` or ``run``
+    max_depth : int, optional
+        Maximum depth of links to follow. Defaults to 1
+    wait : float, optional
+        Minimum average time between two requests. With ``run`` it is
+        shared by all local workers; a worker started with ``work``
+        keeps it on its own. Defaults to 0.1
+    processes : int, optional
+        Number of local worker processes for ``run``. Defaults to the
+        number of CPUs
+    store : CountsStore, optional
+        Store to merge the counts into with ``reduce`` or ``run``.
+        Defaults to a ``JsonCountsStore`` at ``CountWordsMode.JSONPATH``
+    wal : bool, optional
+        Open the frontier in WAL mode; disable it on network
+        filesystems. Defaults to True
+    """
+
+    BATCH_SIZE = 10
+    POLL_SECONDS = 1.0
+
+    def __init__(
+        self,
+        frontier_path: str | Path,
+        role: str = "run",
+        root_page: WikiPage | None = None,
+        max_depth: int = 1,
+        wait: float = 0.1,
+        processes: int | None = None,
+        store: CountsStore | None = None,
+        wal: bool = True,
+    ):
+        if role not in ROLES:
+            raise ValueError(f"Unknown role '{role}'")
+        if role in ("run", "seed") and root_page is None:
+            raise ValueError(f"Role '{role}' needs a root article")
+
+        self.frontier_path = Path(frontier_path)
+        self.role = role
+        self.root_page = root_page
+        self.max_depth = max_depth
+        self.wait = wait
+        self.processes = processes or os.cpu_count() or 1
+        self.store = store
+        self.wal = wal
+
+        self.worker = f"{socket.gethostname()}-{os.getpid()}"
+
+    def run(self) -> None:
+        """
+        Perform the mode's role.
+
+        Raises
+        ------
+        ValueError
+            If the frontier is not in the state the role needs, e.g.
+            ``reduce`` of a crawl that is not finished.
+        RuntimeError
+            If a local worker process fails.
+        """
+        match self.role:
+            case "seed":
+                self._seed()
+            case "work":
+                self._work()
+            case "reduce":
+                self._reduce()
+            case "run":
+                if self._seed():
+                    self._run_workers()
+                    self._reduce()
+
+    def _frontier(self) -> SharedFrontier:
+        return SharedFrontier(self.frontier_path, self.wal)
+
+    def _seed(self) -> bool:
+        with self._frontier() as frontier:
+            if frontier.seeded and self.role == "run":
+                print(f"Continuing crawl in {self.frontier_path}")
+                return True
+
+            root_info = self.root_page.get_info()
+            if root_info is None:
+                print(f"No article available for '{self.root_page.phrase}'")
+                return False
+
+            title = root_info[1]
+            frontier.seed(canonicalize_phrase(title), title, self.max_depth)
+
+            # The root article is already downloaded, so it is counted
+            # here instead of being fetched again by a worker.
+            frontier.claim(self.worker, 1)
+            result = self._count(self.root_page, root_info, 0, self.max_depth)
+            results = [] if result is None else [(result, 0)]
+            frontier.complete(self.worker, [title], results)
+            return True
+
+    def _run_workers(self) -> None:
+        if self.processes == 1:
+            self._work()
+            return
+
+        # Spawned workers start from scratch, so they are handed the
+        # page cache, corpus and parser configured in this process.
+        cache = get_cache()
+        corpus = get_corpus()
+        config = {
+            "frontier_path": self.frontier_path,
+            "wait": self.wait * self.processes,
+            "wal": self.wal,
+            "cache": (
+                None
+                if cache is None
+                else (cache.directory, cache.max_bytes, cache.offline)
+            ),
+            "corpus": None if corpus is None else corpus.path,
+            "parser": resolve_parser(),
+        }
+
+        ctx = multiprocessing.get_context("spawn")
+        workers = [
+            ctx.Process(target=_run_worker, args=(config,))
+            for _ in range(self.processes)
+        ]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join()
+
+        failed = sum(process.exitcode != 0 for process in workers)
+        if failed:
+            raise RuntimeError(f"{failed} worker processes failed")
+
+    def _work(self) -> None:
+        configure_rate_limit(self.wait)
+
+        with self._frontier() as frontier:
+            max_depth = frontier.max_depth
+            try:
+                while True:
+                    batch = frontier.claim(self.worker, self.BATCH_SIZE)
+                    if not batch:
+                        progress = frontier.progress()
+                        if not progress["queued"] + progress["claimed"]:
+                            break
+
+                        # Other workers may still add links.
+                        time.sleep(self.POLL_SECONDS)
+                        continue
+
+                    results = []
+                    for phrase, depth in batch:
+                        result = self._process(phrase, depth, max_depth)
+                        if result is not None:
+                            results.append((result, depth))
+
+                    frontier.complete(
+                        self.worker, [phrase for phrase, _ in batch], results
+                    )
+            except BaseException:
+                frontier.release(self.worker)
+                raise
+
+    def _process(
+        self, phrase: str, depth: int, max_depth: int
+    ) -> CrawlResult | None:
+        page = WikiPage(phrase)
+        try:
+            info = page.get_info()
+        except RequestException as e:
+            print(f"Failed to fetch {phrase} - skipping ({e})")
+            return None
+
+        if info is None:
+            return None
+
+        return self._count(page, info, depth, max_depth)
+
+    def _count(
+        self,
+        page: WikiPage,
+        info: tuple[int, str],
+        depth: int,
+        max_depth: int,
+    ) -> CrawlResult | None:
+        follow_links = depth < max_depth
+        data = page.extract(paragraphs=False, links=follow_links)
+        if data is None:
+            print(f"No content in {info[1]} - skipping")
+            return None
+
+        print(info[1])
+        links = []
+        if follow_links:
+            links = [(canonicalize_phrase(p), p) for p in data.link_phrases]
+
+        return CrawlResult(info[0], data.word_counts, links)
+
+    def _reduce(self) -> None:
+        with self._frontier() as frontier:
+            progress = frontier.progress()
+            if progress["queued"] or progress["claimed"]:
+                raise ValueError(
+                    f"Crawl in {self.frontier_path} is not finished"
+                )
+            if frontier.reduced:
+                raise ValueError(
+                    f"Counts in {self.frontier_path} were already merged"
+                )
+
+            store = self.store or JsonCountsStore(CountWordsMode.JSONPATH)
+            with store:
+                store.merge(frontier.counts())
+            frontier.mark_reduced()
+
+        print(f"Counted words in {progress['visited']} articles")
+
+
+def _run_worker(config: dict) -> None:
+    if config["cache"] is not None:
+        configure_cache(*config["cache"])
+    if config["corpus"] is not None:
+        configure_corpus(open_corpus(config["corpus"]))
+    set_default_parser(config["parser"])
+
+    DistributedCountWordsMode(
+        config["frontier_path"],
+        "work",
+        wait=config["wait"],
+        wal=config["wal"],
+    ).run()
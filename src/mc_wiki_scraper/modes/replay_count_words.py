@@ -0,0 +1,93 @@
+"""
+Replay count words mode for archived Wiki articles.
+
+Provides the ``ReplayCountWordsMode`` class, which updates a JSON file
+with word counts from every article in a local corpus, such as a crawl
+archive, without fetching anything.
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from ..corpus import Corpus
+from ..storage import CountsStore, JsonCountsStore
+from ..wiki_page.utils import resolve_parser, set_default_parser
+from .auto_count_words import extract_counts
+from .count_words import CountWordsMode
+
+
+class ReplayCountWordsMode:
+    """
+    Update a JSON file with word counts from every article in a
+    corpus.
+
+    Articles are read one at a time in corpus order, so a crawl archive
+    is replayed at disk speed. With ``processes``, they are parsed by a
+    pool of processes, ``CHUNK_SIZE`` at a time.
+
+    Parameters
+    ----------
+    corpus : Corpus
+        The articles to count words in, e.g. a ``WarcCorpus`` over an
+        archive written by ``auto-count-words --archive``. Closed when
+        done.
+    store : CountsStore, optional
+        Store to add the counts to, closed when done. Defaults to a
+        ``JsonCountsStore`` at ``CountWordsMode.JSONPATH``
+    processes : int, optional
+        Number of processes parsing articles, or 0 to parse them on
+        the calling thread. Defaults to 0
+    """
+
+    CHUNK_SIZE = 64
+
+    def __init__(
+        self,
+        corpus: Corpus,
+        store: CountsStore | None = None,
+        processes: int = 0,
+    ):
+        self.corpus = corpus
+        self.store = store
+        self.processes = processes
+
+    def run(self) -> None:
+        """
+        Update a JSON file with word counts from every article in the
+        corpus.
+        """
+        store = self.store or JsonCountsStore(CountWordsMode.JSONPATH, None)
+
+        counted = 0
+        with self.corpus, store:
+            for counts in self._extract():
+                if counts is not None:
+                    store.merge(counts)
+                    counted += 1
+
+        print(f"Counted words in {counted} articles")
+
+    def _extract(self):
+        articles = iter(self.corpus)
+        if not self.processes:
+            for title, html in articles:
+                yield _word_counts(title, html)
+            return
+
+        with ProcessPoolExecutor(
+            self.processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=set_default_parser,
+            initargs=(resolve_parser(),),
+        ) as pool:
+            # Articles are sent in chunks, so that only a chunk of them
+            # is held in memory at a time.
+            while chunk := list(islice(articles, self.CHUNK_SIZE)):
+                titles, htmls = zip(*chunk, strict=True)
+                yield from pool.map(_word_counts, titles, htmls)
+
+
+def _word_counts(title: str, html: str):
+    data = extract_counts(title, html, False)
+    return data.word_counts if data is not None else None
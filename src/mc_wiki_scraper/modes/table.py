@@ -37,7 +37,7 @@ class TableMode:
         If the article has no tables or the table number is out of
         range, an informative message is printed instead.
         """
-        tables = self.page.get_tables()
+        tables = self.page.get_table_index()
         if tables is None:
             print(f"No tables available for {self.page.phrase}")
             return
@@ -0,0 +1,89 @@
+"""
+storage
+-------
+The ``storage`` package provides persistent stores for data collected
+from Wiki articles.
+
+Functionality:
+- accumulate word counts from many articles in a buffered store
+- keep word counts in a JSON file or an SQLite database
+- export word counts to the ``word-counts.json`` format
+- cache normalized word frequencies of a language on disk
+- save and load crawl checkpoints
+- queue crawl phrases compactly and track seen ones in a Bloom filter
+- share a crawl frontier and counts between worker processes
+- remember the revisions and counts of crawled articles
+- count large vocabularies, such as n-grams, in bounded memory
+- keep the word counts of every article and export them to a sparse
+  matrix
+- read word counts from a memory-mapped binary file, converted from
+  JSON, with lookups and top-k selection
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+from .articles import ArticleCountsStore
+from .bloom import BloomFilter
+from .checkpoint import CrawlCheckpoint
+from .counts import CountsStore, JsonCountsStore, SqliteCountsStore
+from .frontier import Frontier
+from .ledger import LedgerEntry, PageLedger
+from .lossy import LossyCounter
+from .shared_frontier import CrawlResult, SharedFrontier
+
+if TYPE_CHECKING:
+    from .article_matrix import ArticleMatrix
+    from .binary_counts import (
+        BinaryCounts,
+        convert_json_counts,
+        is_binary_counts,
+        iter_json_counts,
+        top_k,
+    )
+    from .lang_index import LangFrequencyIndex, default_cache_dir
+
+__all__ = [
+    "CountsStore",
+    "JsonCountsStore",
+    "SqliteCountsStore",
+    "CrawlCheckpoint",
+    "Frontier",
+    "BloomFilter",
+    "SharedFrontier",
+    "CrawlResult",
+    "PageLedger",
+    "LedgerEntry",
+    "LossyCounter",
+    "ArticleCountsStore",
+    "ArticleMatrix",
+    "BinaryCounts",
+    "convert_json_counts",
+    "is_binary_counts",
+    "iter_json_counts",
+    "top_k",
+    "LangFrequencyIndex",
+    "default_cache_dir",
+]
+
+
+def __getattr__(name: str):
+    # The language index, the article matrix and the binary counts file
+    # need NumPy, which the counts stores do not.
+    if name in ("LangFrequencyIndex", "default_cache_dir"):
+        module = importlib.import_module(".lang_index", __name__)
+        return getattr(module, name)
+    if name == "ArticleMatrix":
+        module = importlib.import_module(".article_matrix", __name__)
+        return module.ArticleMatrix
+    if name in (
+        "BinaryCounts",
+        "convert_json_counts",
+        "is_binary_counts",
+        "iter_json_counts",
+        "top_k",
+    ):
+        module = importlib.import_module(".binary_counts", __name__)
+        return getattr(module, name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,153 @@
+"""
+Sparse document-term matrix of article word counts.
+
+Provides the ``ArticleMatrix`` class, which holds the word counts of
+many articles as a compressed sparse row (CSR) matrix in NumPy arrays,
+together with the IDs and titles of the articles and the vocabulary,
+for vectorized statistics over a whole crawl. It is saved as a NumPy
+archive that ``scipy.sparse.load_npz`` can read as well.
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+
+MATRIX_VERSION = 1
+
+
+class ArticleMatrix:
+    """
+    Word counts of articles as a CSR matrix.
+
+    The counts of article ``i`` are ``data[indptr[i]:indptr[i + 1]]``,
+    in the columns ``indices[indptr[i]:indptr[i + 1]]``, i.e. of the
+    words ``words[indices[...]]``.
+
+    Parameters
+    ----------
+    data : numpy.ndarray
+        Non-zero counts, row by row.
+    indices : numpy.ndarray
+        Column of every count.
+    indptr : numpy.ndarray
+        Offset of the first count of every row, and the number of
+        counts at the end.
+    page_ids : numpy.ndarray
+        Article ID of every row.
+    titles : numpy.ndarray
+        Title of every row.
+    words : numpy.ndarray
+        Word of every column.
+    """
+
+    def __init__(
+        self,
+        data: np.ndarray,
+        indices: np.ndarray,
+        indptr: np.ndarray,
+        page_ids: np.ndarray,
+        titles: np.ndarray,
+        words: np.ndarray,
+    ):
+        self.data = data
+        self.indices = indices
+        self.indptr = indptr
+        self.page_ids = page_ids
+        self.titles = titles
+        self.words = words
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """Number of articles and of words."""
+        return len(self.page_ids), len(self.words)
+
+    def row(self, page_id: int) -> dict[str, int]:
+        """
+        Return the word counts of an article.
+
+        Raises
+        ------
+        KeyError
+            If the article is not in the matrix.
+        """
+        (rows,) = np.nonzero(self.page_ids == page_id)
+        if not len(rows):
+            raise KeyError(page_id)
+
+        start, end = self.indptr[rows[0]], self.indptr[rows[0] + 1]
+        words = self.words[self.indices[start:end]]
+        counts = self.data[start:end]
+        return dict(zip(words.tolist(), counts.tolist(), strict=True))
+
+    def word_totals(self) -> np.ndarray:
+        """Return the total count of every word over all articles."""
+        totals = np.bincount(
+            self.indices, weights=self.data, minlength=len(self.words)
+        )
+        return totals.astype(np.int64)
+
+    def document_frequencies(self) -> np.ndarray:
+        """Return the number of articles every word occurs in."""
+        return np.bincount(self.indices, minlength=len(self.words))
+
+    def to_scipy(self):
+        """
+        Return the counts as a SciPy sparse array.
+
+        Raises
+        ------
+        ImportError
+            If SciPy is not installed.
+        """
+        from scipy.sparse import csr_array
+
+        return csr_array(
+            (self.data, self.indices, self.indptr), shape=self.shape
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> "ArticleMatrix":
+        """
+        Load a matrix saved with ``save``.
+
+        Raises
+        ------
+        ValueError
+            If the file holds a matrix of another format version.
+        """
+        with np.load(path) as data:
+            if int(data["version"]) != MATRIX_VERSION:
+                raise ValueError(f"Unsupported matrix version in {path}")
+
+            return cls(
+                data["data"],
+                data["indices"],
+                data["indptr"],
+                data["page_ids"],
+                data["titles"],
+                data["words"],
+            )
+
+    def save(self, path: str | Path) -> None:
+        """
+        Save the matrix as an uncompressed NumPy archive, laid out like
+        the ones written by ``scipy.sparse.save_npz``.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp = path.with_name(f"{path.name}.tmp.npz")
+        np.savez(
+            tmp,
+            version=MATRIX_VERSION,
+            format=np.array("csr"),
+            shape=np.array(self.shape),
+            data=self.data,
+            indices=self.indices,
+            indptr=self.indptr,
+            page_ids=self.page_ids,
+            titles=self.titles,
+            words=self.words,
+        )
+        os.replace(tmp, path)
@@ -0,0 +1,248 @@
+"""
+Per-article word count store.
+
+Provides the ``ArticleCountsStore`` class, which keeps the word counts
+of every article separately, as sparse document-term counts over a
+shared vocabulary in an SQLite database, so that statistics such as
+document frequencies can be computed after a crawl. The counts can be
+exported to a sparse matrix (see ``ArticleMatrix``).
+"""
+
+import sqlite3
+from collections import Counter
+from collections.abc import Mapping
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from .article_matrix import ArticleMatrix
+
+
+class _Article(NamedTuple):
+    title: str
+    rev_id: int | None
+    counts: dict[str, int]
+
+
+class ArticleCountsStore:
+    """
+    Word counts of every article, keyed by article ID.
+
+    Words are numbered in a vocabulary table in the order they are
+    first seen, and the counts of every article are kept as rows of
+    (article ID, word ID, count). Recording an article again replaces
+    its counts. Recorded articles are buffered and written in one
+    transaction by ``commit``, which can therefore be repeated after a
+    crash without counting anything twice.
+
+    Parameters
+    ----------
+    path : str or Path
+        Location of the database. Created if missing.
+    export_path : str or Path, optional
+        ``.npz`` file to export the counts to on ``close``, as with
+        ``export_npz``.
+    """
+
+    def __init__(
+        self, path: str | Path, export_path: str | Path | None = None
+    ):
+        self.path = Path(path)
+        self.export_path = Path(export_path) if export_path else None
+
+        self._conn = sqlite3.connect(self.path)
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS articles ("
+            "page_id INTEGER PRIMARY KEY, title TEXT NOT NULL, "
+            "rev_id INTEGER);"
+            "CREATE TABLE IF NOT EXISTS vocabulary ("
+            "word_id INTEGER PRIMARY KEY, word TEXT NOT NULL UNIQUE);"
+            "CREATE TABLE IF NOT EXISTS article_counts ("
+            "page_id INTEGER NOT NULL, word_id INTEGER NOT NULL, "
+            "count INTEGER NOT NULL, PRIMARY KEY (page_id, word_id)) "
+            "WITHOUT ROWID;"
+        )
+
+        self._buffer: dict[int, _Article] = {}
+
+    def __len__(self) -> int:
+        """Number of articles written."""
+        row = self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()
+        return row[0]
+
+    def record(
+        self,
+        page_id: int,
+        title: str,
+        counts: Mapping[str, int],
+        rev_id: int | None = None,
+    ) -> None:
+        """
+        Record the word counts of an article, replacing the ones
+        recorded for it before.
+
+        Parameters
+        ----------
+        page_id : int
+            The article ID.
+        title : str
+            The canonical title of the article.
+        counts : Mapping[str, int]
+            The word counts of the article. Words counted zero times
+            are left out.
+        rev_id : int, optional
+            The counted revision, if known.
+        """
+        counts = {word: c for word, c in counts.items() if c > 0}
+        self._buffer[page_id] = _Article(title, rev_id, counts)
+
+    def commit(self) -> None:
+        """Write recorded articles in one transaction."""
+        if not self._buffer:
+            return
+
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO vocabulary (word) VALUES (?)",
+                (
+                    (word,)
+                    for article in self._buffer.values()
+                    for word in article.counts
+                ),
+            )
+            for page_id, article in self._buffer.items():
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO articles (page_id, title, rev_id) "
+                    "VALUES (?, ?, ?)",
+                    (page_id, article.title, article.rev_id),
+                )
+                self._conn.execute(
+                    "DELETE FROM article_counts WHERE page_id = ?", (page_id,)
+                )
+                self._conn.executemany(
+                    "INSERT INTO article_counts (page_id, word_id, count) "
+                    "SELECT ?, word_id, ? FROM vocabulary WHERE word = ?",
+                    ((page_id, c, word) for word, c in article.counts.items()),
+                )
+
+        self._buffer = {}
+
+    def discard(self) -> None:
+        """Drop recorded articles without writing them."""
+        self._buffer = {}
+
+    def get(self, page_id: int) -> Counter | None:
+        """
+        Return the written word counts of an article.
+
+        Returns
+        -------
+        Counter | None
+            The counts, or None if the article was never written.
+        """
+        row = self._conn.execute(
+            "SELECT 1 FROM articles WHERE page_id = ?", (page_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        rows = self._conn.execute(
+            "SELECT word, count FROM article_counts "
+            "JOIN vocabulary USING (word_id) WHERE page_id = ?",
+            (page_id,),
+        )
+        return Counter(dict(rows))
+
+    def document_frequencies(self) -> dict[str, int]:
+        """
+        Return the number of written articles every word occurs in.
+
+        Returns
+        -------
+        dict[str, int]
+            Mapping of words to their document frequencies.
+        """
+        rows = self._conn.execute(
+            "SELECT word, COUNT(*) FROM article_counts "
+            "JOIN vocabulary USING (word_id) GROUP BY word_id"
+        )
+        return dict(rows)
+
+    def to_matrix(self) -> "ArticleMatrix":
+        """
+        Return the written counts as a sparse document-term matrix.
+
+        Rows are articles in the order of their IDs, and columns are
+        the words of the vocabulary in the order of their IDs.
+
+        Returns
+        -------
+        ArticleMatrix
+            The matrix, with the IDs and titles of its articles and
+            its vocabulary.
+        """
+        # Only the export needs NumPy.
+        import numpy as np
+
+        from .article_matrix import ArticleMatrix
+
+        articles = self._conn.execute(
+            "SELECT page_id, title, COUNT(word_id) FROM articles "
+            "LEFT JOIN article_counts USING (page_id) "
+            "GROUP BY page_id ORDER BY page_id"
+        ).fetchall()
+        page_ids = np.array([a[0] for a in articles], dtype=np.int64)
+        titles = np.array([a[1] for a in articles], dtype=str)
+        indptr = np.zeros(len(articles) + 1, dtype=np.int64)
+        np.cumsum([a[2] for a in articles], out=indptr[1:])
+
+        # Word IDs are numbered from 1 and never removed, so they map
+        # to consecutive columns.
+        nnz = int(indptr[-1])
+        entries = np.fromiter(
+            self._conn.execute(
+                "SELECT word_id - 1, count FROM article_counts "
+                "ORDER BY page_id, word_id"
+            ),
+            dtype=[("index", np.int64), ("count", np.int64)],
+            count=nnz,
+        )
+        words = [
+            row[0]
+            for row in self._conn.execute(
+                "SELECT word FROM vocabulary ORDER BY word_id"
+            )
+        ]
+
+        return ArticleMatrix(
+            entries["count"].copy(),
+            entries["index"].copy(),
+            indptr,
+            page_ids,
+            titles,
+            np.array(words, dtype=str),
+        )
+
+    def export_npz(self, path: str | Path) -> None:
+        """
+        Write the written counts to a NumPy archive, as saved by
+        ``ArticleMatrix.save``.
+        """
+        self.to_matrix().save(path)
+
+    def close(self) -> None:
+        """
+        Write recorded articles, export them to ``export_path`` if set
+        and close the database.
+        """
+        self.commit()
+        if self.export_path is not None:
+            self.export_npz(self.export_path)
+
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,372 @@
+"""
+Binary word counts file.
+
+Provides the ``BinaryCounts`` class, which reads word counts from a
+compact binary file through a memory map, with point lookups and top-k
+selection that never build a dict of all the words, and the
+``convert_json_counts`` function, which writes such a file from a
+``word-counts.json`` file without loading it whole.
+"""
+
+import json
+import re
+import struct
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+import numpy as np
+
+MAGIC = b"MCWC"
+FORMAT_VERSION = 1
+# Magic, format version, number of words and size of the string table.
+HEADER = struct.Struct("<4sIQQ")
+READ_SIZE = 1 << 20
+
+_NUMBER_RE = re.compile(r"-?\d*")
+# A whole entry of a JSON object of counts, with the character after it.
+_ENTRY_RE = re.compile(
+    r'\s*"([^"\\\x00-\x1f]*(?:\\.[^"\\\x00-\x1f]*)*)"'
+    r"\s*:\s*(-?\d+)\s*([,}])"
+)
+_SPACE_RE = re.compile(r"\s*")
+
+
+class BinaryCounts:
+    """
+    Word counts read from a binary counts file.
+
+    The file holds the words sorted by their UTF-8 bytes, as one string
+    table with the offset of every word in it, and the counts of the
+    words in the same order, as an array. Only the pages of the file
+    that are read are loaded: a lookup reads the offsets and words it
+    bisects, and ``most_common`` reads the counts and decodes just the
+    words it returns.
+
+    Layout, little-endian: the header (``MAGIC``, format version,
+    number of words ``n``, size of the string table), ``n + 1`` offsets
+    (uint64), ``n`` counts (int64) and the string table.
+
+    Parameters
+    ----------
+    path : str or Path
+        A file written by ``write`` or ``convert_json_counts``.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a binary counts file of this format version.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+        with open(self.path, "rb") as f:
+            header = f.read(HEADER.size)
+        if len(header) < HEADER.size or header[:4] != MAGIC:
+            raise ValueError(f"{self.path} is not a binary counts file")
+
+        _, version, n, _ = HEADER.unpack(header)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported counts version in {self.path}")
+
+        self._map = np.memmap(self.path, dtype=np.uint8, mode="r")
+        counts_start = HEADER.size + 8 * (n + 1)
+        self.offsets = np.frombuffer(
+            self._map, dtype="<u8", count=n + 1, offset=HEADER.size
+        )
+        self.counts = np.frombuffer(
+            self._map, dtype="<i8", count=n, offset=counts_start
+        )
+        self._strings = self._map[counts_start + 8 * n :]
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def __contains__(self, word: str) -> bool:
+        return self.index(word) >= 0
+
+    def __getitem__(self, word: str) -> int:
+        i = self.index(word)
+        if i < 0:
+            raise KeyError(word)
+
+        return int(self.counts[i])
+
+    def get(self, word: str, default: int | None = None) -> int | None:
+        """Return the count of a word, or ``default`` if missing."""
+        i = self.index(word)
+        return int(self.counts[i]) if i >= 0 else default
+
+    def word(self, i: int) -> str:
+        """Return the ``i``-th word in sorted order."""
+        return self._word_bytes(i).decode("utf-8")
+
+    def words(self, indices: Iterable[int]) -> np.ndarray:
+        """Return the words at the given positions, as an array."""
+        return np.array([self.word(i) for i in indices], dtype=object)
+
+    def index(self, word: str) -> int:
+        """
+        Return the position of a word in sorted order, by bisection.
+
+        Returns
+        -------
+        int
+            The position, or -1 if the word is missing.
+        """
+        key = word.encode("utf-8")
+        low, high = 0, len(self)
+        while low < high:
+            mid = (low + high) // 2
+            if self._word_bytes(mid) < key:
+                low = mid + 1
+            else:
+                high = mid
+
+        if low < len(self) and self._word_bytes(low) == key:
+            return low
+        return -1
+
+    def indices(self, words: Iterable[str]) -> np.ndarray:
+        """Return the positions of many words, -1 for missing ones."""
+        return np.array([self.index(w) for w in words], dtype=np.intp)
+
+    def most_common(self, k: int) -> list[tuple[str, int]]:
+        """
+        Return the ``k`` words with the highest counts.
+
+        Returns
+        -------
+        list[tuple[str, int]]
+            Words and counts from the highest count, equal counts in
+            sorted order of the words.
+        """
+        top = top_k(self.counts, k)
+        counts = self.counts[top].tolist()
+        return list(zip(self.words(top).tolist(), counts, strict=True))
+
+    def items(self) -> Iterator[tuple[str, int]]:
+        """Iterate over words and counts, in sorted order of words."""
+        for i in range(len(self)):
+            yield self.word(i), int(self.counts[i])
+
+    @staticmethod
+    def write(path: str | Path, items: Iterable[tuple[str, int]]) -> int:
+        """
+        Write word counts to a binary counts file.
+
+        Parameters
+        ----------
+        path : str or Path
+            The file to write, replaced if it exists.
+        items : Iterable[tuple[str, int]]
+            Words and their counts, each word once.
+
+        Returns
+        -------
+        int
+            Number of words written.
+        """
+        entries = sorted((w.encode("utf-8"), c) for w, c in items)
+        n = len(entries)
+
+        offsets = np.zeros(n + 1, dtype="<u8")
+        np.cumsum([len(w) for w, _ in entries], out=offsets[1:])
+        counts = np.fromiter((c for _, c in entries), dtype="<i8", count=n)
+
+        path = Path(path)
+        tmp = path.with_name(f"{path.name}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, n, int(offsets[-1])))
+            f.write(offsets.tobytes())
+            f.write(counts.tobytes())
+            f.writelines(w for w, _ in entries)
+
+        tmp.replace(path)
+        return n
+
+    def _word_bytes(self, i: int) -> bytes:
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return self._strings[start:end].tobytes()
+
+
+def is_binary_counts(path: str | Path) -> bool:
+    """Tell whether a file is a binary counts file, by its magic."""
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def convert_json_counts(json_path: str | Path, path: str | Path) -> int:
+    """
+    Convert a ``word-counts.json`` file to a binary counts file.
+
+    The JSON file is parsed as a stream, so no dict of its words is
+    built; the words are still held in memory once, to be sorted.
+
+    Parameters
+    ----------
+    json_path : str or Path
+        A JSON object mapping words to integer counts.
+    path : str or Path
+        The binary counts file to write.
+
+    Returns
+    -------
+    int
+        Number of words converted.
+    """
+    return BinaryCounts.write(path, iter_json_counts(json_path))
+
+
+def iter_json_counts(path: str | Path) -> Iterator[tuple[str, int]]:
+    """
+    Iterate over the words and counts of a JSON object mapping words
+    to integer counts, reading the file in chunks.
+
+    Raises
+    ------
+    ValueError
+        If the file is not such an object.
+    """
+    with open(path, encoding="utf-8") as f:
+        reader = _ChunkReader(f)
+        reader.expect("{")
+        if reader.peek() == "}":
+            return
+
+        while True:
+            entry = reader.entry()
+            if entry is None:
+                # The entry runs past the buffer, or is invalid.
+                reader.expect('"')
+                word = reader.string()
+                reader.expect(":")
+                entry = word, reader.number(), reader.next_of(",}")
+
+            yield entry[:2]
+            if entry[2] == "}":
+                return
+
+
+class _ChunkReader:
+    # A cursor over a text file, which keeps only the unread part of
+    # the last chunks in memory.
+
+    def __init__(self, f):
+        self._f = f
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def peek(self) -> str:
+        self._skip_space()
+        return self._buf[self._pos : self._pos + 1]
+
+    def expect(self, char: str) -> None:
+        if self.next_of(char) != char:
+            raise ValueError(f"Expected {char!r} in word counts JSON")
+
+    def next_of(self, chars: str) -> str:
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Expected one of {chars!r} in word counts JSON")
+
+        self._pos += 1
+        return char
+
+    def entry(self) -> tuple[str, int, str] | None:
+        # Most entries are read whole with one match, and only those
+        # split between chunks are read token by token.
+        match = _ENTRY_RE.match(self._buf, self._pos)
+        if match is None:
+            return None
+
+        word, count, end = match.groups()
+        if "\\" in word:
+            word = json.decoder.scanstring(word + '"', 0)[0]
+        self._pos = match.end()
+        return word, int(count), end
+
+    def string(self) -> str:
+        # The opening quote was consumed. The string is complete once
+        # an unescaped quote follows, unless the file ends before.
+        while True:
+            try:
+                value, end = json.decoder.scanstring(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+
+            self._pos = end
+            return value
+
+    def number(self) -> int:
+        self._skip_space()
+        while True:
+            match = _NUMBER_RE.match(self._buf, self._pos)
+            # A number running to the end of the buffer may go on.
+            if match.end() < len(self._buf) or not self._fill():
+                break
+
+        if match.group() in ("", "-"):
+            raise ValueError("Expected an integer in word counts JSON")
+
+        self._pos = match.end()
+        return int(match.group())
+
+    def _skip_space(self) -> None:
+        while True:
+            self._pos = _SPACE_RE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf) or not self._fill():
+                return
+
+    def _fill(self) -> bool:
+        chunk = self._f.read(READ_SIZE)
+        self._buf = self._buf[self._pos :] + chunk
+        self._pos = 0
+        self._eof = not chunk
+        return bool(chunk)
+
+
+def top_k(
+    values: np.ndarray, k: int, keys: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    Return the indices of the ``k`` largest values, largest first.
+
+    Equal values are ordered by their keys, or keep their order, as
+    with a stable sort, but only the selected values are sorted.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        Values to select from.
+    k : int
+        Number of values to select.
+    keys : numpy.ndarray, optional
+        Keys to order equal values by, such as their words. Defaults
+        to their positions
+
+    Returns
+    -------
+    numpy.ndarray
+        Indices of at most ``k`` values.
+    """
+    n = len(values)
+    if k >= n:
+        selected = np.arange(n)
+    elif k <= 0:
+        return np.array([], dtype=np.intp)
+    else:
+        # The k-th largest value; of the values equal to it, only the
+        # first ones by key are selected.
+        kth = values[np.argpartition(values, n - k)[n - k]]
+        above = np.flatnonzero(values > kth)
+        ties = np.flatnonzero(values == kth)
+        if keys is not None:
+            ties = ties[np.argsort(keys[ties], kind="stable")]
+        selected = np.concatenate([above, ties[: k - len(above)]])
+
+    tie_keys = selected if keys is None else keys[selected]
+    return selected[np.lexsort((tie_keys, -values[selected]))]
@@ -0,0 +1,106 @@
+"""
+Bloom filter for crawl seen-sets.
+
+Provides the ``BloomFilter`` class, a fixed-size set of strings that
+answers membership with a configurable false-positive rate, using a
+small fraction of the memory of a ``set`` of the strings themselves.
+"""
+
+import base64
+import hashlib
+import math
+
+
+class BloomFilter:
+    """
+    A probabilistic set of strings.
+
+    ``in`` never misses a string that was added, but may report one
+    that was not, with probability ``error_rate`` while at most
+    ``capacity`` strings were added (and more often after that). The
+    filter takes about ``-capacity * ln(error_rate) / ln(2)**2`` bits.
+
+    Parameters
+    ----------
+    capacity : int
+        Number of strings the filter is sized for.
+    error_rate : float
+        False-positive rate at ``capacity`` strings, between 0 and 1.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+
+        bits = -capacity * math.log(error_rate) / math.log(2) ** 2
+        self._size = max(math.ceil(bits), 8)
+        self._hashes = max(round(self._size / capacity * math.log(2)), 1)
+        self._bits = bytearray((self._size + 7) // 8)
+        self._count = 0
+
+    def add(self, item: str) -> None:
+        """Add a string to the filter."""
+        added = False
+        for i in self._indices(item):
+            byte, bit = divmod(i, 8)
+            if not self._bits[byte] & (1 << bit):
+                self._bits[byte] |= 1 << bit
+                added = True
+
+        if added:
+            self._count += 1
+
+    def __contains__(self, item: str) -> bool:
+        for i in self._indices(item):
+            byte, bit = divmod(i, 8)
+            if not self._bits[byte] & (1 << bit):
+                return False
+
+        return True
+
+    def __len__(self) -> int:
+        """Approximate number of distinct strings added."""
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the bit array in bytes."""
+        return len(self._bits)
+
+    def to_state(self) -> dict:
+        """
+        Return the filter as a JSON-serializable dict, e.g. for a crawl
+        checkpoint.
+        """
+        return {
+            "capacity": self.capacity,
+            "error_rate": self.error_rate,
+            "count": self._count,
+            "bits": base64.b64encode(self._bits).decode("ascii"),
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "BloomFilter":
+        """Rebuild a filter saved with ``to_state``."""
+        bloom = cls(state["capacity"], state["error_rate"])
+        bits = base64.b64decode(state["bits"])
+        if len(bits) != len(bloom._bits):
+            raise ValueError("Bloom filter state does not match its size")
+
+        bloom._bits[:] = bits
+        bloom._count = state["count"]
+        return bloom
+
+    def _indices(self, item: str):
+        # Double hashing: k indices from the two halves of one digest.
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+
+        for k in range(self._hashes):
+            yield (h1 + k * h2) % self._size
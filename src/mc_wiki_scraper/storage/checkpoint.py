@@ -0,0 +1,77 @@
+"""
+Crawl checkpoints.
+
+Provides the ``CrawlCheckpoint`` class, which saves a snapshot of
+a crawl's progress to a JSON file, replacing the previous snapshot
+atomically so that a crash never leaves a partial file behind.
+"""
+
+import json
+import os
+from pathlib import Path
+
+CHECKPOINT_VERSION = 1
+
+
+class CrawlCheckpoint:
+    """
+    A crawl snapshot kept in a JSON file.
+
+    Parameters
+    ----------
+    path : str or Path
+        Location of the checkpoint file.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    def save(self, state: dict) -> None:
+        """
+        Replace the saved snapshot with ``state``.
+
+        Parameters
+        ----------
+        state : dict
+            JSON-serializable crawl state.
+        """
+        tmp = self.path.with_name(f"{self.path.name}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": CHECKPOINT_VERSION, **state},
+                f,
+                ensure_ascii=False,
+            )
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp, self.path)
+
+    def load(self) -> dict | None:
+        """
+        Return the saved snapshot.
+
+        Returns
+        -------
+        dict | None
+            The crawl state, or None if there is no checkpoint.
+
+        Raises
+        ------
+        ValueError
+            If the checkpoint was saved in another format version.
+        """
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return None
+
+        if state.pop("version", None) != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version in {self.path}")
+
+        return state
+
+    def remove(self) -> None:
+        """Delete the checkpoint, e.g. once the crawl has finished."""
+        self.path.unlink(missing_ok=True)
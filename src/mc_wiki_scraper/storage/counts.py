@@ -0,0 +1,287 @@
+"""
+Word count stores.
+
+Provides the ``CountsStore`` base class, which buffers word counts
+merged from articles in memory and writes them out in batches, and two
+implementations: ``JsonCountsStore``, which keeps the counts in the
+``word-counts.json`` format, and ``SqliteCountsStore``, which updates
+an SQLite database in place.
+
+Every store numbers the batches it writes, so that a crawl resumed from
+a checkpoint can tell whether its last batch was written. Counts may be
+negative, to take back words of an article that changed; words whose
+total drops to zero are removed.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from collections import Counter
+from collections.abc import Mapping
+from pathlib import Path
+
+
+class CountsStore(ABC):
+    """
+    Accumulate word counts and persist them in batches.
+
+    Merged counts are kept in memory and written out once every
+    ``flush_every`` merges, on ``flush`` and on ``close``. Each write
+    increments the persisted ``commit_seq``.
+    Stores can be used as context managers, which close them on exit.
+
+    Parameters
+    ----------
+    path : str or Path
+        Location of the store.
+    flush_every : int | None, optional
+        Number of merges to buffer before writing, or None to write
+        only on ``flush`` and ``close``. Defaults to 1
+    """
+
+    def __init__(self, path: str | Path, flush_every: int | None = 1):
+        self.path = Path(path)
+        self.flush_every = flush_every
+
+        self._buffer: Counter = Counter()
+        self._pending = 0
+        self._commit_seq: int | None = None
+
+    @property
+    def commit_seq(self) -> int:
+        """Number of batches written to the store so far."""
+        if self._commit_seq is None:
+            self._commit_seq = self._read_seq()
+
+        return self._commit_seq
+
+    @property
+    def buffered(self) -> Counter:
+        """Counts merged but not written yet."""
+        return Counter(self._buffer)
+
+    def merge(self, counts: Mapping[str, int]) -> None:
+        """
+        Add word counts to the store.
+
+        Parameters
+        ----------
+        counts : Mapping[str, int]
+            Word counts to add.
+        """
+        self._buffer.update(counts)
+        self._pending += 1
+
+        if self.flush_every is not None and self._pending >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all buffered counts to the store as one batch."""
+        if self._buffer:
+            seq = self.commit_seq + 1
+            self._write(self._buffer, seq)
+            self._commit_seq = seq
+
+        self._buffer = Counter()
+        self._pending = 0
+
+    def discard(self) -> None:
+        """Drop buffered counts without writing them."""
+        self._buffer = Counter()
+        self._pending = 0
+
+    def close(self) -> None:
+        """Flush buffered counts and release the store."""
+        self.flush()
+
+    def load(self) -> dict[str, int]:
+        """
+        Return all counts in the store, including buffered ones.
+
+        Returns
+        -------
+        dict[str, int]
+            Mapping of every word to its total count.
+        """
+        self.flush()
+        return self._read()
+
+    def export_json(self, path: str | Path) -> None:
+        """
+        Write all counts to a file in the ``word-counts.json`` format.
+        """
+        _dump_json(self.load(), Path(path))
+
+    @abstractmethod
+    def _write(self, counts: Counter, seq: int) -> None: ...
+
+    @abstractmethod
+    def _read(self) -> dict[str, int]: ...
+
+    @abstractmethod
+    def _read_seq(self) -> int: ...
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class JsonCountsStore(CountsStore):
+    """
+    Store word counts in a JSON file mapping words to counts.
+
+    Every flush rewrites the whole file, so buffering many merges
+    between flushes matters for large vocabularies. The batch number
+    is kept next to it, in a ``.seq`` file written right before it
+    with a digest of the new file. If the process dies between the two
+    writes, the digest does not match the file, which tells that the
+    batch was not written, so a resumed crawl writes it exactly once.
+    The file must therefore not be edited while it is being written to.
+    """
+
+    def _write(self, counts: Counter, seq: int) -> None:
+        total_counts = self._read()
+        for word, c in counts.items():
+            total = total_counts.get(word, 0) + c
+            if total > 0:
+                total_counts[word] = total
+            else:
+                total_counts.pop(word, None)
+
+        tmp = _dump_json_tmp(total_counts, self.path)
+        _write_text(self._seq_path(), f"{seq} {_file_digest(tmp)}")
+        os.replace(tmp, self.path)
+
+    def _read(self) -> dict[str, int]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, FileNotFoundError):
+            return {}
+
+    def _read_seq(self) -> int:
+        try:
+            seq, digest = self._seq_path().read_text(encoding="utf-8").split()
+            seq = int(seq)
+        except (ValueError, FileNotFoundError):
+            return 0
+
+        # The number is written before the counts of its batch.
+        try:
+            written = _file_digest(self.path) == digest
+        except FileNotFoundError:
+            written = False
+        return seq if written else seq - 1
+
+    def _seq_path(self) -> Path:
+        return self.path.with_name(f"{self.path.name}.seq")
+
+
+class SqliteCountsStore(CountsStore):
+    """
+    Store word counts in an SQLite database, adding to them with
+    UPSERTs so a flush costs only as much as the words it writes.
+    The batch number is updated in the same transaction as the counts.
+
+    Parameters
+    ----------
+    path : str or Path
+        Location of the database.
+    flush_every : int | None, optional
+        Number of merges to buffer before writing, or None to write
+        only on ``flush`` and ``close``. Defaults to 1
+    export_path : str or Path, optional
+        JSON file to export all counts to on ``close``. If the database
+        is new and this file exists, its counts are imported first.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        flush_every: int | None = 1,
+        export_path: str | Path | None = None,
+    ):
+        super().__init__(path, flush_every)
+        self.export_path = Path(export_path) if export_path else None
+
+        is_new = not self.path.exists()
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS word_counts ("
+            "word TEXT PRIMARY KEY, count INTEGER NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta ("
+            "key TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+        )
+
+        if is_new and self.export_path is not None:
+            self.merge(JsonCountsStore(self.export_path).load())
+            self.flush()
+
+    def close(self) -> None:
+        """
+        Flush buffered counts, export them to ``export_path`` if set
+        and close the database.
+        """
+        self.flush()
+        if self.export_path is not None:
+            self.export_json(self.export_path)
+
+        self._conn.close()
+
+    def _write(self, counts: Counter, seq: int) -> None:
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO word_counts (word, count) VALUES (?, ?) "
+                "ON CONFLICT (word) DO UPDATE "
+                "SET count = count + excluded.count",
+                counts.items(),
+            )
+            if any(c < 0 for c in counts.values()):
+                self._conn.execute("DELETE FROM word_counts WHERE count <= 0")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) "
+                "VALUES ('commit_seq', ?)",
+                (seq,),
+            )
+
+    def _read(self) -> dict[str, int]:
+        rows = self._conn.execute(
+            "SELECT word, count FROM word_counts ORDER BY rowid"
+        )
+        return dict(rows)
+
+    def _read_seq(self) -> int:
+        row = self._conn.execute(
+            "SELECT value FROM meta WHERE key = 'commit_seq'"
+        ).fetchone()
+        return row[0] if row else 0
+
+
+def _dump_json(counts: dict[str, int], path: Path) -> None:
+    os.replace(_dump_json_tmp(counts, path), path)
+
+
+def _dump_json_tmp(counts: dict[str, int], path: Path) -> Path:
+    # Writes the counts next to ``path``, to be moved over it.
+    tmp = path.with_name(f"{path.name}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(counts, f, ensure_ascii=False, indent=2)
+
+    return tmp
+
+
+def _file_digest(path: Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _write_text(path: Path, text: str) -> None:
+    tmp = path.with_name(f"{path.name}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
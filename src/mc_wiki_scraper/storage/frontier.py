@@ -0,0 +1,94 @@
+"""
+Compact crawl frontier.
+
+Provides the ``Frontier`` class, a FIFO queue of ``(phrase, depth)``
+pairs that keeps phrases as UTF-8 bytes in one buffer and depths in a
+packed array, instead of one tuple and one string object per entry.
+"""
+
+from array import array
+from collections.abc import Iterable, Iterator
+
+COMPACT_MIN_ENTRIES = 4096
+
+
+class Frontier:
+    """
+    A FIFO queue of ``(phrase, depth)`` pairs stored compactly.
+
+    An entry takes the length of its phrase in UTF-8 plus 10 bytes,
+    about a fifth of a ``deque`` of tuples. Popped entries are dropped
+    from the buffers once they make up half of them.
+
+    Parameters
+    ----------
+    items : Iterable[tuple[str, int]], optional
+        Entries to start with.
+    """
+
+    def __init__(self, items: Iterable[tuple[str, int]] = ()):
+        self._data = bytearray()
+        self._ends = array("Q")
+        self._depths = array("H")
+        self._head = 0
+
+        self.extend(items)
+
+    def append(self, item: tuple[str, int]) -> None:
+        """Add a ``(phrase, depth)`` pair at the end of the queue."""
+        phrase, depth = item
+        self._data += phrase.encode("utf-8")
+        self._ends.append(len(self._data))
+        self._depths.append(depth)
+
+    def extend(self, items: Iterable[tuple[str, int]]) -> None:
+        """Add ``(phrase, depth)`` pairs at the end of the queue."""
+        for item in items:
+            self.append(item)
+
+    def popleft(self) -> tuple[str, int]:
+        """
+        Remove and return the first ``(phrase, depth)`` pair.
+
+        Raises
+        ------
+        IndexError
+            If the queue is empty.
+        """
+        if not self:
+            raise IndexError("pop from an empty frontier")
+
+        item = self[0]
+        self._head += 1
+
+        if self._head >= COMPACT_MIN_ENTRIES and 2 * self._head >= len(
+            self._ends
+        ):
+            self._compact()
+
+        return item
+
+    def __getitem__(self, index: int) -> tuple[str, int]:
+        if not 0 <= index < len(self):
+            raise IndexError("frontier index out of range")
+
+        i = self._head + index
+        start = self._ends[i - 1] if i else 0
+        phrase = self._data[start : self._ends[i]].decode("utf-8")
+        return phrase, self._depths[i]
+
+    def __len__(self) -> int:
+        return len(self._ends) - self._head
+
+    def __iter__(self) -> Iterator[tuple[str, int]]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def _compact(self) -> None:
+        offset = self._ends[self._head - 1]
+        del self._data[:offset]
+        self._ends = array(
+            "Q", (end - offset for end in self._ends[self._head :])
+        )
+        self._depths = self._depths[self._head :]
+        self._head = 0
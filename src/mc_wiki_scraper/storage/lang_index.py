@@ -0,0 +1,140 @@
+"""
+Language frequency index.
+
+Provides the ``LangFrequencyIndex`` class, which holds the normalized
+frequencies of the most common words of a language, as given by
+``wordfreq``. The index is built once per language, size and
+``wordfreq`` version, saved as a compact NumPy archive in a cache
+directory and loaded from there on later runs.
+"""
+
+import os
+from importlib.metadata import version
+from pathlib import Path
+from zipfile import BadZipFile
+
+import numpy as np
+
+INDEX_VERSION = 1
+
+
+def default_cache_dir() -> Path:
+    """
+    Return the directory for cached data of this program.
+
+    Returns
+    -------
+    Path
+        ``$XDG_CACHE_HOME/mc-wiki-scraper``, or
+        ``~/.cache/mc-wiki-scraper`` if the variable is not set.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "mc-wiki-scraper"
+
+
+class LangFrequencyIndex:
+    """
+    Normalized frequencies of the most common words of a language.
+
+    Parameters
+    ----------
+    words : numpy.ndarray
+        Words, from the most to the least frequent.
+    freqs : numpy.ndarray
+        Frequency of every word divided by the highest frequency.
+    """
+
+    def __init__(self, words: np.ndarray, freqs: np.ndarray):
+        self.words = words
+        self.freqs = freqs
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    @classmethod
+    def build(cls, lang: str, size: int) -> "LangFrequencyIndex":
+        """
+        Build the index from ``wordfreq`` data.
+
+        Parameters
+        ----------
+        lang : str
+            Language code, e.g. ``'en'``.
+        size : int
+            Number of the most common words to include.
+        """
+        from wordfreq import top_n_list, word_frequency
+
+        words = top_n_list(lang, size)
+        freqs = np.array([word_frequency(w, lang) for w in words])
+
+        return cls(np.array(words, dtype=str), freqs / freqs.max())
+
+    @classmethod
+    def load(cls, path: str | Path) -> "LangFrequencyIndex":
+        """
+        Load an index saved with ``save``.
+
+        Raises
+        ------
+        ValueError
+            If the file holds an index of another format version.
+        """
+        with np.load(path) as data:
+            if int(data["version"]) != INDEX_VERSION:
+                raise ValueError(f"Unsupported index version in {path}")
+
+            return cls(data["words"], data["freqs"])
+
+    def save(self, path: str | Path) -> None:
+        """Save the index as an uncompressed NumPy archive."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp = path.with_name(f"{path.name}.tmp.npz")
+        np.savez(
+            tmp, version=INDEX_VERSION, words=self.words, freqs=self.freqs
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def get(
+        cls, lang: str, size: int, cache_dir: str | Path | None = None
+    ) -> "LangFrequencyIndex":
+        """
+        Load the index from the cache, building and saving it first if
+        it is not there yet or cannot be read. The index is returned
+        even if it cannot be saved, e.g. to a read-only cache directory.
+
+        Parameters
+        ----------
+        lang : str
+            Language code, e.g. ``'en'``.
+        size : int
+            Number of the most common words to include.
+        cache_dir : str or Path, optional
+            Directory with cached indexes. Defaults to
+            ``default_cache_dir() / 'lang-index'``
+        """
+        cache_dir = Path(cache_dir or default_cache_dir() / "lang-index")
+        name = f"{lang}-{size}-v{INDEX_VERSION}-wf{version('wordfreq')}.npz"
+        path = cache_dir / name
+
+        try:
+            return cls.load(path)
+        except (OSError, EOFError, BadZipFile, ValueError, KeyError):
+            # Missing, truncated or corrupt: the index is rebuilt.
+            pass
+
+        index = cls.build(lang, size)
+        try:
+            index.save(path)
+        except OSError:
+            pass
+        return index
+
+    def as_dict(self) -> dict[str, float]:
+        """
+        Return the index as a mapping of words to their frequencies.
+        """
+        return dict(zip(self.words.tolist(), self.freqs.tolist(), strict=True))
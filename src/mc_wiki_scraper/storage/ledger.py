@@ -0,0 +1,218 @@
+"""
+Page ledger of incremental crawls.
+
+Provides the ``PageLedger`` class, which remembers the revision, word
+counts and link phrases of every article a crawl counted, so that a
+later crawl can skip unchanged articles and replace the counts of
+changed ones.
+"""
+
+import json
+import sqlite3
+from collections import Counter
+from collections.abc import Mapping
+from pathlib import Path
+from typing import NamedTuple
+
+
+class LedgerEntry(NamedTuple):
+    """What a crawl counted in an article."""
+
+    title: str
+    rev_id: int | None
+    counts: dict[str, int]
+    links: list[str] | None
+
+
+class PageLedger:
+    """
+    Revisions, word counts and link phrases of counted articles, kept
+    in an SQLite database next to a counts store.
+
+    Recorded articles are buffered and written in one transaction by
+    ``commit``, which also stores the ``commit_seq`` the counts store
+    will have once the same batch is flushed to it, and the counts of
+    that batch. If the crawl dies after the ledger is committed but
+    before the store is flushed, the store can be brought in line with
+    ``pending`` (see ``AutoCountWordsMode``).
+
+    Parameters
+    ----------
+    path : str or Path
+        Location of the database. Created if missing.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "page_id INTEGER PRIMARY KEY, title TEXT NOT NULL, "
+            "rev_id INTEGER, counts TEXT NOT NULL, links TEXT)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+        self._buffer: dict[int, LedgerEntry] = {}
+
+    @property
+    def commit_seq(self) -> int:
+        """The ``commit_seq`` of the store as of the last commit."""
+        value = self._meta("commit_seq")
+        return int(value) if value is not None else 0
+
+    @property
+    def pending(self) -> dict[str, int]:
+        """The counts of the batch of the last commit."""
+        value = self._meta("pending")
+        return json.loads(value) if value is not None else {}
+
+    @property
+    def buffered(self) -> dict[int, LedgerEntry]:
+        """Articles recorded but not committed yet."""
+        return dict(self._buffer)
+
+    def revisions(self) -> dict[int, int]:
+        """
+        Return the recorded revision of every article that has one.
+
+        Returns
+        -------
+        dict[int, int]
+            Mapping of page IDs to revision IDs.
+        """
+        rows = self._conn.execute(
+            "SELECT page_id, rev_id FROM pages WHERE rev_id IS NOT NULL"
+        )
+        revisions = dict(rows)
+        for page_id, entry in self._buffer.items():
+            if entry.rev_id is not None:
+                revisions[page_id] = entry.rev_id
+
+        return revisions
+
+    def get(self, page_id: int) -> LedgerEntry | None:
+        """
+        Return what was recorded for an article.
+
+        Returns
+        -------
+        LedgerEntry | None
+            The entry, or None if the article was never recorded.
+        """
+        if page_id in self._buffer:
+            return self._buffer[page_id]
+
+        row = self._conn.execute(
+            "SELECT title, rev_id, counts, links FROM pages WHERE page_id = ?",
+            (page_id,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        title, rev_id, counts, links = row
+        links = json.loads(links) if links is not None else None
+        return LedgerEntry(title, rev_id, json.loads(counts), links)
+
+    def record(
+        self,
+        page_id: int,
+        title: str,
+        rev_id: int | None,
+        counts: Mapping[str, int],
+        links: list[str] | None = None,
+    ) -> Counter:
+        """
+        Record what was counted in an article, replacing what was
+        recorded for it before.
+
+        Parameters
+        ----------
+        page_id : int
+            The article ID.
+        title : str
+            The canonical title of the article.
+        rev_id : int | None
+            The counted revision, if known.
+        counts : Mapping[str, int]
+            The word counts of the revision.
+        links : list[str], optional
+            The link phrases of the revision, if they were extracted.
+
+        Returns
+        -------
+        Counter
+            The change to add to the store: the new counts minus the
+            ones recorded before, with negative counts kept.
+        """
+        delta = Counter(counts)
+        old = self.get(page_id)
+        if old is not None:
+            delta.subtract(old.counts)
+
+        self._buffer[page_id] = LedgerEntry(title, rev_id, dict(counts), links)
+        return Counter({word: c for word, c in delta.items() if c})
+
+    def commit(self, commit_seq: int, pending: Mapping[str, int]) -> None:
+        """
+        Write recorded articles in one transaction.
+
+        Parameters
+        ----------
+        commit_seq : int
+            The ``commit_seq`` the store will have once ``pending`` is
+            flushed to it.
+        pending : Mapping[str, int]
+            The counts the store is about to flush.
+        """
+        rows = [
+            (
+                page_id,
+                entry.title,
+                entry.rev_id,
+                json.dumps(entry.counts, ensure_ascii=False),
+                json.dumps(entry.links, ensure_ascii=False)
+                if entry.links is not None
+                else None,
+            )
+            for page_id, entry in self._buffer.items()
+        ]
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO pages "
+                "(page_id, title, rev_id, counts, links) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [
+                    ("commit_seq", str(commit_seq)),
+                    ("pending", json.dumps(pending, ensure_ascii=False)),
+                ],
+            )
+
+        self._buffer = {}
+
+    def discard(self) -> None:
+        """Drop recorded articles without writing them."""
+        self._buffer = {}
+
+    def close(self) -> None:
+        """Close the database, dropping uncommitted articles."""
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _meta(self, key: str) -> str | None:
+        row = self._conn.execute(
+            "SELECT value FROM meta WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
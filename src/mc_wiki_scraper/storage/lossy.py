@@ -0,0 +1,111 @@
+"""
+Lossy counter for large vocabularies.
+
+Provides the ``LossyCounter`` class, which counts a stream of strings,
+such as the n-grams of many articles, in bounded memory by dropping
+rare ones, with a bounded error.
+"""
+
+import math
+from collections import Counter
+from collections.abc import Mapping
+
+
+class LossyCounter:
+    """
+    Approximate counts of a stream of strings (lossy counting).
+
+    The stream is split into buckets of ``ceil(1 / error)`` counted
+    occurrences. At the end of every bucket, strings whose count, plus
+    the most they may have been undercounted by, does not exceed the
+    number of buckets so far are dropped. A string's count is therefore
+    at most ``error * total`` below its true count, while about
+    ``log(error * total) / error`` strings are kept at most, whatever
+    the size of the vocabulary.
+
+    ``spill`` returns the counts and starts a new stream, e.g. to add
+    them to a counts store every few articles; the errors of the
+    streams add up.
+
+    Parameters
+    ----------
+    error : float
+        Largest undercount, as a share of the counted occurrences,
+        between 0 and 1.
+    """
+
+    def __init__(self, error: float):
+        if not 0 < error < 1:
+            raise ValueError("error must be between 0 and 1")
+
+        self.error = error
+        self.bucket_width = math.ceil(1 / error)
+
+        self._counts: dict[str, int] = {}
+        self._deltas: dict[str, int] = {}
+        self._total = 0
+
+    @property
+    def total(self) -> int:
+        """Number of occurrences counted since the last spill."""
+        return self._total
+
+    def __len__(self) -> int:
+        """Number of strings kept."""
+        return len(self._counts)
+
+    def update(self, counts: Mapping[str, int]) -> None:
+        """
+        Count strings, e.g. the n-grams of one article.
+
+        Parameters
+        ----------
+        counts : Mapping[str, int]
+            Number of occurrences of each string, all positive.
+        """
+        bucket = self._bucket()
+        for item, c in counts.items():
+            if item in self._counts:
+                self._counts[item] += c
+            else:
+                # A string not kept may have been dropped before, with
+                # a count of at most one per bucket that has ended.
+                self._counts[item] = c
+                self._deltas[item] = bucket - 1
+
+        self._total += sum(counts.values())
+        if self._bucket() != bucket:
+            self._prune(self._bucket() - 1)
+
+    def spill(self) -> Counter:
+        """
+        Return the counts of the strings kept and start over.
+
+        Returns
+        -------
+        Counter
+            Lower bounds of the counts of the strings kept.
+        """
+        counts = Counter(self._counts)
+        self.clear()
+        return counts
+
+    def clear(self) -> None:
+        """Drop all counts."""
+        self._counts = {}
+        self._deltas = {}
+        self._total = 0
+
+    def _bucket(self) -> int:
+        # The bucket the next occurrence falls into, numbered from 1.
+        return self._total // self.bucket_width + 1
+
+    def _prune(self, bucket: int) -> None:
+        dropped = [
+            item
+            for item, c in self._counts.items()
+            if c + self._deltas[item] <= bucket
+        ]
+        for item in dropped:
+            del self._counts[item]
+            del self._deltas[item]
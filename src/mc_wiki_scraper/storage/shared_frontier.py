@@ -0,0 +1,293 @@
+"""
+Shared crawl frontier.
+
+Provides the ``SharedFrontier`` class, an SQLite database holding the
+queue, the visited-set and the word counts of a crawl split between
+several worker processes, possibly on different hosts sharing a
+filesystem.
+"""
+
+import sqlite3
+import time
+from collections.abc import Iterable, Mapping
+from contextlib import contextmanager
+from pathlib import Path
+from typing import NamedTuple
+
+QUEUED, CLAIMED, DONE = 0, 1, 2
+LEASE_SECONDS = 300.0
+
+
+class CrawlResult(NamedTuple):
+    """An article processed by a worker, to be committed."""
+
+    page_id: int
+    counts: Mapping[str, int]
+    links: list[tuple[str, str]]
+
+
+class SharedFrontier:
+    """
+    Queue, visited-set and word counts of a distributed crawl, kept in
+    an SQLite database.
+
+    Workers ``claim`` a batch of phrases, process them and ``complete``
+    the batch. Completing a batch is one transaction: an article's
+    counts and links are added only if its page ID was not visited
+    yet, so every article is counted exactly once even if two workers
+    downloaded it under different phrases. Batches claimed by a worker
+    that did not complete them within ``lease`` seconds are handed out
+    again.
+
+    Parameters
+    ----------
+    path : str or Path
+        Location of the database.
+    wal : bool, optional
+        Use write-ahead logging, which lets workers read while another
+        one writes. WAL needs shared memory, so it only works for
+        workers on the same host; disable it when the database is on
+        a network filesystem. Defaults to True
+    lease : float, optional
+        Seconds after which a claimed batch is handed out again.
+        Defaults to ``LEASE_SECONDS``
+    timeout : float, optional
+        Seconds to wait for another worker's write lock. Defaults to 60
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        wal: bool = True,
+        lease: float = LEASE_SECONDS,
+        timeout: float = 60.0,
+    ):
+        self.path = Path(path)
+        self.lease = lease
+
+        self._conn = sqlite3.connect(
+            self.path, timeout=timeout, isolation_level=None
+        )
+        journal_mode = "WAL" if wal else "DELETE"
+        self._conn.execute(f"PRAGMA journal_mode={journal_mode}")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS frontier ("
+            "key TEXT PRIMARY KEY, phrase TEXT NOT NULL, "
+            "depth INTEGER NOT NULL, state INTEGER NOT NULL DEFAULT 0, "
+            "worker TEXT, claimed_at REAL);"
+            "CREATE INDEX IF NOT EXISTS frontier_queue "
+            "ON frontier (state, depth);"
+            "CREATE INDEX IF NOT EXISTS frontier_phrase "
+            "ON frontier (phrase);"
+            "CREATE TABLE IF NOT EXISTS visited ("
+            "page_id INTEGER PRIMARY KEY);"
+            "CREATE TABLE IF NOT EXISTS word_counts ("
+            "word TEXT PRIMARY KEY, count INTEGER NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS meta ("
+            "key TEXT PRIMARY KEY, value);"
+        )
+
+    def seed(self, key: str, phrase: str, max_depth: int) -> None:
+        """
+        Start a crawl from ``phrase``, following links up to
+        ``max_depth``.
+
+        Raises
+        ------
+        ValueError
+            If the database already holds a crawl.
+        """
+        with self._transaction():
+            if self.seeded:
+                raise ValueError(f"{self.path} already holds a crawl")
+
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('max_depth', ?)",
+                (max_depth,),
+            )
+            self._conn.execute(
+                "INSERT INTO frontier (key, phrase, depth) VALUES (?, ?, 0)",
+                (key, phrase),
+            )
+
+    @property
+    def seeded(self) -> bool:
+        """Whether the database holds a crawl."""
+        return self._meta("max_depth") is not None
+
+    @property
+    def max_depth(self) -> int:
+        """
+        Maximum depth of the crawl.
+
+        Raises
+        ------
+        ValueError
+            If the crawl was not seeded.
+        """
+        max_depth = self._meta("max_depth")
+        if max_depth is None:
+            raise ValueError(f"{self.path} holds no crawl, seed it first")
+
+        return max_depth
+
+    def claim(self, worker: str, size: int) -> list[tuple[str, int]]:
+        """
+        Claim up to ``size`` queued phrases for ``worker``, shallowest
+        first, including ones whose lease has expired.
+
+        Returns
+        -------
+        list[tuple[str, int]]
+            Claimed ``(phrase, depth)`` pairs, empty if nothing is
+            queued at the moment.
+        """
+        now = time.time()
+        with self._transaction():
+            rows = self._conn.execute(
+                "SELECT key, phrase, depth FROM frontier "
+                "WHERE state = ? OR (state = ? AND claimed_at < ?) "
+                "ORDER BY depth, rowid LIMIT ?",
+                (QUEUED, CLAIMED, now - self.lease, size),
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE frontier SET state = ?, worker = ?, claimed_at = ? "
+                "WHERE key = ?",
+                [(CLAIMED, worker, now, key) for key, _, _ in rows],
+            )
+
+        return [(phrase, depth) for _, phrase, depth in rows]
+
+    def complete(
+        self,
+        worker: str,
+        phrases: Iterable[str],
+        results: Iterable[tuple[CrawlResult, int]],
+    ) -> int:
+        """
+        Commit a processed batch in one transaction.
+
+        Parameters
+        ----------
+        worker : str
+            Worker that claimed the batch.
+        phrases : Iterable[str]
+            Claimed phrases, marked as done.
+        results : Iterable[tuple[CrawlResult, int]]
+            Articles found, with the depth they were found at. Their
+            links, as ``(key, phrase)`` pairs, are queued one level
+            deeper.
+
+        Returns
+        -------
+        int
+            Number of articles counted, i.e. not visited before.
+        """
+        counted = 0
+        with self._transaction():
+            for result, depth in results:
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO visited (page_id) VALUES (?)",
+                    (result.page_id,),
+                )
+                if cursor.rowcount == 0:
+                    continue
+
+                counted += 1
+                self._conn.executemany(
+                    "INSERT INTO word_counts (word, count) VALUES (?, ?) "
+                    "ON CONFLICT (word) DO UPDATE "
+                    "SET count = count + excluded.count",
+                    result.counts.items(),
+                )
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO frontier (key, phrase, depth) "
+                    "VALUES (?, ?, ?)",
+                    [(key, p, depth + 1) for key, p in result.links],
+                )
+
+            self._conn.executemany(
+                "UPDATE frontier SET state = ?, worker = NULL "
+                "WHERE phrase = ? AND worker = ?",
+                [(DONE, phrase, worker) for phrase in phrases],
+            )
+
+        return counted
+
+    def release(self, worker: str) -> None:
+        """
+        Queue again every phrase ``worker`` claimed and did not
+        complete, e.g. when it stops early.
+        """
+        with self._transaction():
+            self._conn.execute(
+                "UPDATE frontier SET state = ?, worker = NULL "
+                "WHERE state = ? AND worker = ?",
+                (QUEUED, CLAIMED, worker),
+            )
+
+    def progress(self) -> dict[str, int]:
+        """
+        Return the number of phrases queued, claimed and done, and the
+        number of articles visited.
+        """
+        states = dict(
+            self._conn.execute(
+                "SELECT state, COUNT(*) FROM frontier GROUP BY state"
+            ).fetchall()
+        )
+        (visited,) = self._conn.execute(
+            "SELECT COUNT(*) FROM visited"
+        ).fetchone()
+        return {
+            "queued": states.get(QUEUED, 0),
+            "claimed": states.get(CLAIMED, 0),
+            "done": states.get(DONE, 0),
+            "visited": visited,
+        }
+
+    def counts(self) -> dict[str, int]:
+        """Return the word counts of all committed articles."""
+        return dict(self._conn.execute("SELECT word, count FROM word_counts"))
+
+    @property
+    def reduced(self) -> bool:
+        """Whether the counts were already merged into a store."""
+        return bool(self._meta("reduced"))
+
+    def mark_reduced(self) -> None:
+        """Record that the counts were merged into a store."""
+        with self._transaction():
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) "
+                "VALUES ('reduced', 1)"
+            )
+
+    def close(self) -> None:
+        """Close the database."""
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _meta(self, key: str):
+        row = self._conn.execute(
+            "SELECT value FROM meta WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    @contextmanager
+    def _transaction(self):
+        # BEGIN IMMEDIATE takes the write lock up front, so two workers
+        # never read the same queued rows and then both claim them.
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+        self._conn.execute("COMMIT")
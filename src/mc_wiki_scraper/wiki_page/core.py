@@ -2,25 +2,43 @@
 Core module for extracting structured data from Wiki articles.
 
 Provides the ``WikiPage`` class, which handles fetching HTML from a URL
-or file, parsing it with BeautifulSoup, and extracting paragraphs,
-links, tables, word counts, and article metadata.
+or file, parsing it with BeautifulSoup (on the fastest installed tree
+builder), and extracting paragraphs,
+links, tables, word and n-gram counts, and article metadata. With lxml,
+paragraphs, links and counts are extracted from a native lxml tree.
 """
 
 from collections import Counter
+from collections.abc import Sequence
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from bs4 import BeautifulSoup, Tag
-from pandas import DataFrame
 
 from .utils import (
+    Extracted,
+    TableIndex,
+    extract_all,
+    extract_all_lxml,
+    extract_content_html,
     extract_id_and_title,
     extract_internal_link_phrases,
+    extract_ngram_counts,
     extract_paragraphs,
-    extract_tables,
+    extract_revision_id,
     extract_word_counts,
     fetch_html,
+    fetch_parsed_pages,
+    find_lxml,
+    make_soup,
+    parse_lxml,
+    resolve_parser,
 )
 
+if TYPE_CHECKING:
+    from lxml.html import HtmlElement
+    from pandas import DataFrame
+
 
 class WikiPage:
     """
@@ -38,6 +56,11 @@ class WikiPage:
     html_file : str or Path, optional
         Path to a local HTML file to read instead of fetching from
         the web.
+    parser : str, optional
+        Parser to use, ``'lxml'`` or ``'html.parser'``. Defaults to the
+        fastest installed one. With ``'lxml'``, paragraphs, links and
+        counts are extracted from an lxml tree, and BeautifulSoup is
+        only used for the soup, the content Tag and tables.
 
     Attributes
     ----------
@@ -50,8 +73,18 @@ class WikiPage:
     """
 
     BASE_URL = "https://minecraft.wiki/w/"
+    API_URL = "https://minecraft.wiki/api.php"
     NO_ARTICLE = ".noarticletext"
     CONTENT_TAG = "#mw-content-text .mw-parser-output"
+    # The same elements, for lxml.
+    NO_ARTICLE_XPATH = (
+        "//*[contains(concat(' ', normalize-space(@class), ' '), "
+        "' noarticletext ')]"
+    )
+    CONTENT_XPATH = (
+        "//*[@id='mw-content-text']//*[contains(concat(' ', "
+        "normalize-space(@class), ' '), ' mw-parser-output ')]"
+    )
 
     def __init__(
         self,
@@ -59,8 +92,10 @@ class WikiPage:
         base_url: str = BASE_URL,
         forced_url: str | None = None,
         html_file: str | Path | None = None,
+        parser: str | None = None,
     ):
         self.base_url = base_url.rstrip("/") + "/"
+        self.parser = parser
         self.phrase = None
         self.url = None
         self.html_file = None
@@ -68,6 +103,10 @@ class WikiPage:
         self._html: str | None = None
         self._soup: BeautifulSoup | None = None
         self._content: Tag | None = None
+        self._lxml_content: HtmlElement | None = None
+        self._info: tuple[int, str] | None = None
+        self._rev_id: int | None = None
+        self._tables: TableIndex | None = None
 
         if html_file:
             self.html_file = Path(html_file)
@@ -81,6 +120,78 @@ class WikiPage:
         else:
             raise ValueError("Must provide phrase, forced_url or html_file")
 
+    @classmethod
+    def from_html(
+        cls,
+        phrase: str,
+        html: str,
+        info: tuple[int, str] | None = None,
+        rev_id: int | None = None,
+    ) -> "WikiPage":
+        """
+        Create a page from already fetched HTML.
+
+        Parameters
+        ----------
+        phrase : str
+            The article title the HTML was fetched for.
+        html : str
+            HTML containing the ``#mw-content-text`` container.
+        info : tuple[int, str], optional
+            (page_id, page_name), if known. Otherwise it is extracted
+            from the HTML.
+        rev_id : int, optional
+            The revision ID, if known. Otherwise it is extracted from
+            the HTML.
+
+        Returns
+        -------
+        WikiPage
+            A page that never fetches anything.
+        """
+        page = cls(phrase)
+        page.url = None
+        page._html = html
+        page._info = info
+        page._rev_id = rev_id
+        return page
+
+    @classmethod
+    def fetch_batch(
+        cls, phrases: list[str], api_url: str = API_URL
+    ) -> list["WikiPage | None"]:
+        """
+        Fetch many articles at once through the MediaWiki API.
+
+        Parameters
+        ----------
+        phrases : list[str]
+            Article titles to fetch.
+        api_url : str, default: "https://minecraft.wiki/api.php"
+            URL of the wiki's ``api.php``.
+
+        Returns
+        -------
+        list[WikiPage | None]
+            A page for every phrase, in order, or None for articles
+            that do not exist.
+        """
+        api_pages = fetch_parsed_pages(phrases, api_url)
+
+        pages = []
+        for phrase in phrases:
+            api_page = api_pages[phrase]
+            if api_page is None:
+                pages.append(None)
+                continue
+
+            info = (api_page.page_id, api_page.title)
+            pages.append(
+                cls.from_html(phrase, api_page.html, info, api_page.rev_id)
+            )
+
+        return pages
+
     def get_html(self) -> str | None:
         """
         Return the HTML of the page, reading from file or
@@ -123,8 +234,8 @@ class WikiPage:
         if html is None:
             return None
 
-        soup = BeautifulSoup(html, "html.parser")
-        if soup.select_one(self.NO_ARTICLE) is not None:
+        soup = make_soup(html, self.parser)
+        if self._is_missing(html, soup):
             return None
 
         self._soup = soup
@@ -134,6 +245,10 @@ class WikiPage:
         """
         Return the main content container of the article.
 
+        Only the ``#mw-content-text`` element is parsed, unless the page
+        has already been parsed whole or the element cannot be located
+        in the HTML.
+
         Returns
         -------
         Tag | None
@@ -143,7 +258,7 @@ class WikiPage:
         if self._content is not None:
             return self._content
 
-        soup = self.get_soup()
+        soup = self._get_content_soup()
         if soup is None:
             return None
 
@@ -156,6 +271,60 @@ class WikiPage:
         self._content = content
         return content
 
+    def _get_content_soup(self) -> BeautifulSoup | None:
+        if self._soup is not None:
+            return self._soup
+
+        html = self.get_html()
+        if html is None:
+            return None
+
+        fragment = extract_content_html(html)
+        if fragment is None:
+            return self.get_soup()
+
+        soup = make_soup(fragment, self.parser)
+        if self._is_missing(fragment, soup):
+            return None
+
+        return soup
+
+    def _is_missing(self, html: str, soup: BeautifulSoup) -> bool:
+        # Cheap text check first, to avoid walking the whole tree
+        # for every existing article.
+        if self.NO_ARTICLE.lstrip(".") not in html:
+            return False
+
+        return soup.select_one(self.NO_ARTICLE) is not None
+
+    def _uses_lxml(self) -> bool:
+        # A content Tag already parsed is reused rather than parsing
+        # the article again.
+        return self._content is None and resolve_parser(self.parser) == "lxml"
+
+    def _get_lxml_content(self) -> "HtmlElement | None":
+        if self._lxml_content is not None:
+            return self._lxml_content
+
+        html = self.get_html()
+        if html is None:
+            return None
+
+        html = extract_content_html(html) or html
+        root = parse_lxml(html)
+        if root is not None and self.NO_ARTICLE.lstrip(".") in html:
+            if find_lxml(root, self.NO_ARTICLE_XPATH) is not None:
+                return None
+
+        content = None if root is None else find_lxml(root, self.CONTENT_XPATH)
+        if content is None:
+            raise RuntimeError(
+                "Content container not found - site incompatible?"
+            )
+
+        self._lxml_content = content
+        return content
+
     def get_info(self) -> tuple[int, str] | None:
         """
         Extract the article ID and canonical title from HTML.
@@ -165,11 +334,34 @@ class WikiPage:
         tuple[int, str] | None
             (page_id, page_name) or None if not found.
         """
+        if self._info is not None:
+            return self._info
+
         html = self.get_html()
         if html is None:
             return None
 
-        return extract_id_and_title(html)
+        self._info = extract_id_and_title(html)
+        return self._info
+
+    def get_revision_id(self) -> int | None:
+        """
+        Return the ID of the revision of the article the HTML shows.
+
+        Returns
+        -------
+        int | None
+            The revision ID, or None if not found.
+        """
+        if self._rev_id is not None:
+            return self._rev_id
+
+        html = self.get_html()
+        if html is None:
+            return None
+
+        self._rev_id = extract_revision_id(html)
+        return self._rev_id
 
     def get_paragraphs(self) -> list[Tag] | None:
         """
@@ -180,6 +372,10 @@ class WikiPage:
         list[Tag] | None
             List of <p> Tags, or None if content is missing.
         """
+        if self._uses_lxml():
+            data = self.extract(paragraphs=True, links=False, counts=False)
+            return None if data is None else data.paragraphs
+
         content = self.get_content()
         if content is None:
             return None
@@ -196,13 +392,17 @@ class WikiPage:
             Set of linked article phrases, or None if content is
             missing.
         """
+        if self._uses_lxml():
+            data = self.extract(paragraphs=False, links=True, counts=False)
+            return None if data is None else data.link_phrases
+
         content = self.get_content()
         if content is None:
             return None
 
         return extract_internal_link_phrases(content)
 
-    def get_tables(self) -> list[DataFrame] | None:
+    def get_tables(self) -> "list[DataFrame] | None":
         """
         Extract all HTML tables from the article.
 
@@ -212,11 +412,32 @@ class WikiPage:
             List of pandas DataFrames representing tables, or
             None if HTML missing.
         """
+        tables = self.get_table_index()
+        if tables is None:
+            return None
+
+        return list(tables)
+
+    def get_table_index(self) -> TableIndex | None:
+        """
+        Locate the HTML tables in the article without converting them.
+
+        Returns
+        -------
+        TableIndex | None
+            Sequence of the article's tables, each converted to
+            a pandas DataFrame only when accessed, or None if HTML
+            missing.
+        """
+        if self._tables is not None:
+            return self._tables
+
         html = self.get_html()
         if html is None:
             return None
 
-        return extract_tables(html)
+        self._tables = TableIndex(html)
+        return self._tables
 
     def get_word_counts(self) -> Counter | None:
         """
@@ -227,8 +448,78 @@ class WikiPage:
         Counter | None
             Counter of words, or None if content is missing.
         """
+        if self._uses_lxml():
+            data = self.extract(paragraphs=False, links=False, counts=True)
+            return None if data is None else data.word_counts
+
         content = self.get_content()
         if content is None:
             return None
 
         return extract_word_counts(content)
+
+    def get_ngram_counts(self, sizes: Sequence[int] = (2,)) -> Counter | None:
+        """
+        Extract n-gram counts from the article content.
+
+        Parameters
+        ----------
+        sizes : Sequence[int], optional
+            Numbers of words of the n-grams to count. Defaults to
+            bigrams only
+
+        Returns
+        -------
+        Counter | None
+            Counter of n-grams, or None if content is missing.
+        """
+        if self._uses_lxml():
+            data = self.extract(False, False, False, sizes)
+            return None if data is None else data.ngram_counts
+
+        content = self.get_content()
+        if content is None:
+            return None
+
+        return extract_ngram_counts(content, sizes)
+
+    def extract(
+        self,
+        paragraphs: bool = True,
+        links: bool = True,
+        counts: bool = True,
+        ngrams: Sequence[int] = (),
+    ) -> Extracted | None:
+        """
+        Extract paragraphs, link phrases, word counts and n-gram
+        counts from the article content in a single pass over it.
+
+        Parameters
+        ----------
+        paragraphs : bool, optional
+            Extract the main paragraphs. Defaults to True
+        links : bool, optional
+            Extract internal link phrases. Defaults to True
+        counts : bool, optional
+            Extract word counts. Defaults to True
+        ngrams : Sequence[int], optional
+            Sizes of the n-grams to count, if any. Defaults to none
+
+        Returns
+        -------
+        Extracted | None
+            The requested data (None in fields not requested), or None
+            if content is missing.
+        """
+        if self._uses_lxml():
+            content = self._get_lxml_content()
+            if content is None:
+                return None
+
+            return extract_all_lxml(content, paragraphs, links, counts, ngrams)
+
+        content = self.get_content()
+        if content is None:
+            return None
+
+        return extract_all(content, paragraphs, links, counts, ngrams)
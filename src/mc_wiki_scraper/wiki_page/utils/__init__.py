@@ -6,27 +6,113 @@ articles and extracting their contents.
 
 Functionality:
 - start a ``requests`` session and fetch HTML from a link
-- extract article ID and its canonical title
+- size the connection pool and count requests and connections
+- cache fetched pages on disk and revalidate them
+- read pages from a local corpus instead of the network
+- fetch many parsed articles at once through the MediaWiki API
+- resolve many phrases to article and revision IDs without fetching
+  their content
+- parse HTML with the fastest installed parser
+- locate the content of an article without parsing the page
+- extract article ID and its canonical title, and the revision ID
 - extract an article's paragraphs
 - extract phrases from internal links from within an article
-- extract tables from an article
+- reduce spellings of a title to its canonical form
+- extract tables from an article, all at once or lazily by index
 - extract word counts from an article
+- count words in a stream of text, chunk by chunk
+- count n-grams of words, such as bigrams and trigrams
+- extract paragraphs, link phrases and word counts in a single pass
+- do the same on a native lxml tree, without BeautifulSoup
+- throttle requests to a shared token bucket, backing off on errors
 """
 
-from .fetch import fetch_html, get_session
-from .info import extract_id_and_title
-from .links import extract_internal_link_phrases, normalize_phrase_from_href
+from .api import (
+    MAX_TITLES,
+    ApiPage,
+    PageInfo,
+    fetch_parsed_pages,
+    resolve_titles,
+)
+from .content import extract_content_html
+from .extract import Extracted, extract_all
+from .fetch import (
+    FetchStats,
+    HttpCache,
+    configure_cache,
+    configure_corpus,
+    configure_rate_limit,
+    configure_session,
+    fetch_html,
+    get_cache,
+    get_corpus,
+    get_fetch_stats,
+    get_rate_limiter,
+    get_session,
+    throttled_get,
+)
+from .info import extract_id_and_title, extract_revision_id
+from .links import (
+    canonicalize_phrase,
+    extract_internal_link_phrases,
+    normalize_phrase_from_href,
+)
+from .lxml_extract import extract_all_lxml, find_lxml, parse_lxml
+from .ngrams import count_ngrams, extract_ngram_counts
 from .paragraphs import extract_paragraphs
-from .tables import extract_tables
-from .word_counts import extract_word_counts
+from .parser import (
+    PARSERS,
+    available_parsers,
+    make_soup,
+    resolve_parser,
+    set_default_parser,
+)
+from .tables import TableIndex, extract_tables, locate_tables
+from .throttle import TokenBucket
+from .word_counts import count_words, extract_word_counts
 
 __all__ = [
     "fetch_html",
     "get_session",
+    "configure_session",
+    "FetchStats",
+    "get_fetch_stats",
+    "HttpCache",
+    "configure_cache",
+    "get_cache",
+    "configure_corpus",
+    "get_corpus",
+    "throttled_get",
+    "configure_rate_limit",
+    "get_rate_limiter",
+    "MAX_TITLES",
+    "ApiPage",
+    "fetch_parsed_pages",
+    "resolve_titles",
+    "PageInfo",
+    "extract_content_html",
+    "PARSERS",
+    "available_parsers",
+    "make_soup",
+    "resolve_parser",
+    "set_default_parser",
     "extract_id_and_title",
+    "extract_revision_id",
     "extract_paragraphs",
     "normalize_phrase_from_href",
+    "canonicalize_phrase",
     "extract_internal_link_phrases",
     "extract_tables",
+    "locate_tables",
+    "TableIndex",
     "extract_word_counts",
+    "count_words",
+    "extract_ngram_counts",
+    "count_ngrams",
+    "Extracted",
+    "extract_all",
+    "parse_lxml",
+    "find_lxml",
+    "extract_all_lxml",
+    "TokenBucket",
 ]
@@ -0,0 +1,192 @@
+"""
+MediaWiki API utilities for Wiki articles.
+
+Provides functions to fetch the parsed content, page IDs and revision
+IDs of many articles at once through the wiki's ``api.php``, or only
+their page IDs, canonical titles and latest revision IDs, resolving
+title normalization and redirects in the same request.
+"""
+
+from typing import NamedTuple
+from urllib.parse import unquote
+
+from .fetch import throttled_get
+
+MAX_TITLES = 50
+
+
+class ApiPage(NamedTuple):
+    """An article as returned by the MediaWiki API."""
+
+    page_id: int
+    title: str
+    rev_id: int | None
+    html: str
+
+
+class PageInfo(NamedTuple):
+    """An article as resolved by the MediaWiki API."""
+
+    page_id: int
+    title: str
+    rev_id: int | None
+
+
+def fetch_parsed_pages(
+    phrases: list[str], api_url: str
+) -> dict[str, ApiPage | None]:
+    """
+    Fetch the parsed content of many articles through the MediaWiki
+    API, ``MAX_TITLES`` per request.
+
+    Each phrase is resolved to its article the same way the wiki does
+    for ``/w/<phrase>`` URLs: the title is normalized and redirects are
+    followed.
+
+    Parameters
+    ----------
+    phrases : list[str]
+        Article phrases, as found in links (underscores and
+        percent-encoding allowed).
+    api_url : str
+        URL of the wiki's ``api.php``.
+
+    Returns
+    -------
+    dict[str, ApiPage | None]
+        Mapping of every phrase to its article, or None if it does not
+        exist. The article HTML is the parser output wrapped in a
+        ``#mw-content-text`` container, like on a rendered page.
+
+    Raises
+    ------
+    HTTPError
+        If the API request fails.
+    """
+    params = {"prop": "revisions", "rvprop": "ids|content", "rvparse": "1"}
+    pages = _query(phrases, api_url, params)
+    return {phrase: _to_api_page(page) for phrase, page in pages.items()}
+
+
+def resolve_titles(
+    phrases: list[str], api_url: str
+) -> dict[str, PageInfo | None]:
+    """
+    Resolve many article phrases to page IDs, canonical titles and
+    latest revision IDs without downloading their content,
+    ``MAX_TITLES`` per request.
+
+    Parameters
+    ----------
+    phrases : list[str]
+        Article phrases, as found in links (underscores and
+        percent-encoding allowed).
+    api_url : str
+        URL of the wiki's ``api.php``.
+
+    Returns
+    -------
+    dict[str, PageInfo | None]
+        Mapping of every phrase to the page ID and title (with
+        underscores) of its article, the same as
+        ``WikiPage.get_info``, and its latest revision ID, or None if
+        it does not exist.
+
+    Raises
+    ------
+    HTTPError
+        If the API request fails.
+    """
+    pages = _query(phrases, api_url, {"prop": "info"})
+    return {phrase: _to_info(page) for phrase, page in pages.items()}
+
+
+def _query(
+    phrases: list[str], api_url: str, props: dict[str, str]
+) -> dict[str, dict | None]:
+    pages = {}
+    for i in range(0, len(phrases), MAX_TITLES):
+        batch = phrases[i : i + MAX_TITLES]
+        pages.update(_query_batch(batch, api_url, props))
+
+    return pages
+
+
+def _query_batch(
+    phrases: list[str], api_url: str, props: dict[str, str]
+) -> dict[str, dict | None]:
+    titles = {phrase: unquote(phrase) for phrase in phrases}
+    params = {
+        "action": "query",
+        "format": "json",
+        "formatversion": "2",
+        "redirects": "1",
+        **props,
+        "titles": "|".join(dict.fromkeys(titles.values())),
+    }
+
+    resolved: dict[str, str] = {}
+    found: dict[str, dict] = {}
+    cont: dict = {}
+
+    # Large batches may be answered in parts, each with a "continue"
+    # block that has to be sent back for the rest of the content.
+    while True:
+        response = throttled_get(api_url, params={**params, **cont})
+        response.raise_for_status()
+        data = response.json()
+
+        query = data.get("query", {})
+        for step in query.get("normalized", []) + query.get("redirects", []):
+            resolved[step["from"]] = step["to"]
+
+        for page in query.get("pages", []):
+            entry = found.setdefault(page["title"], page)
+            if page.get("revisions"):
+                entry["revisions"] = page["revisions"]
+
+        if "continue" not in data:
+            break
+        cont = data["continue"]
+
+    return {
+        phrase: found.get(_resolve(title, resolved))
+        for phrase, title in titles.items()
+    }
+
+
+def _resolve(title: str, resolved: dict[str, str]) -> str:
+    seen = {title}
+    while title in resolved:
+        title = resolved[title]
+        if title in seen:
+            break
+        seen.add(title)
+
+    return title
+
+
+def _to_info(page: dict | None) -> PageInfo | None:
+    if page is None or page.get("missing") or "pageid" not in page:
+        return None
+
+    return PageInfo(
+        page["pageid"], page["title"].replace(" ", "_"), page.get("lastrevid")
+    )
+
+
+def _to_api_page(page: dict | None) -> ApiPage | None:
+    if page is None or page.get("missing") or "pageid" not in page:
+        return None
+
+    revisions = page.get("revisions") or [{}]
+    revision = revisions[0]
+    if "content" not in revision:
+        return None
+
+    return ApiPage(
+        page_id=page["pageid"],
+        title=page["title"].replace(" ", "_"),
+        rev_id=revision.get("revid"),
+        html=f'<div id="mw-content-text">{revision["content"]}</div>',
+    )
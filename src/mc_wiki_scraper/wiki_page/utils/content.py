@@ -0,0 +1,52 @@
+"""
+Content location utility for Wiki articles.
+
+Provides a function to cut the ``#mw-content-text`` element out of the
+HTML of a Wiki article with a plain text scan, so that only the article
+content, and not the navigation, footer and scripts around it, has to
+be parsed.
+"""
+
+import re
+
+CONTENT_START_RE = re.compile(
+    r"""<div\b[^>]*\bid\s*=\s*["']?mw-content-text["'\s>]""", re.IGNORECASE
+)
+DIV_OR_COMMENT_RE = re.compile(r"<!--.*?-->|<(/?)div\b", re.IGNORECASE | re.S)
+
+
+def extract_content_html(html: str) -> str | None:
+    """
+    Return the HTML of the ``#mw-content-text`` element.
+
+    The element is found by its opening tag and ended at the matching
+    ``</div>``, counting nested ``<div>`` tags and skipping comments.
+
+    Parameters
+    ----------
+    html : str
+        The HTML content of a Wiki article page.
+
+    Returns
+    -------
+    str | None
+        HTML of the content element, or None if it could not be found
+        or is not closed.
+    """
+    start_match = CONTENT_START_RE.search(html)
+    if start_match is None:
+        return None
+
+    start = start_match.start()
+    depth = 0
+
+    for match in DIV_OR_COMMENT_RE.finditer(html, start):
+        if match.group(0).startswith("<!--"):
+            continue
+
+        depth += -1 if match.group(1) else 1
+        if depth == 0:
+            end = html.find(">", match.end())
+            return html[start : end + 1] if end != -1 else None
+
+    return None
@@ -0,0 +1,148 @@
+"""
+Single-pass extraction utility for Wiki articles.
+
+Provides a function that collects paragraphs, internal link phrases,
+word counts and n-gram counts from a bs4 Tag in one walk over its tree,
+with the same results as the separate ``extract_paragraphs``,
+``extract_internal_link_phrases``, ``extract_word_counts`` and
+``extract_ngram_counts``.
+"""
+
+from collections import Counter
+from collections.abc import Sequence
+from typing import NamedTuple
+
+from bs4 import Tag
+
+from .links import normalize_phrase_from_href
+from .ngrams import count_ngrams
+from .paragraphs import SKIP_CLASSES, SKIP_TAGS
+from .word_counts import count_words
+
+
+class Extracted(NamedTuple):
+    """Data extracted from an article; None if not requested."""
+
+    paragraphs: list[str] | None
+    link_phrases: set[str] | None
+    word_counts: Counter | None
+    ngram_counts: Counter | None = None
+
+
+def extract_all(
+    content: Tag,
+    paragraphs: bool = True,
+    links: bool = True,
+    counts: bool = True,
+    ngrams: Sequence[int] = (),
+) -> Extracted:
+    """
+    Extract the requested data from a Wiki article content Tag in
+    a single traversal.
+
+    Parameters
+    ----------
+    content : Tag
+        A bs4 Tag containing the main content of a Wiki article.
+    paragraphs : bool, optional
+        Extract the main paragraphs. Defaults to True
+    links : bool, optional
+        Extract internal link phrases. Defaults to True
+    counts : bool, optional
+        Extract word counts. Defaults to True
+    ngrams : Sequence[int], optional
+        Sizes of the n-grams to count, if any. Defaults to none
+
+    Returns
+    -------
+    Extracted
+        The requested paragraphs, link phrases, word counts and n-gram
+        counts.
+    """
+    string_types = content.interesting_string_types
+    found_paragraphs: list[list[str] | None] = []
+    open_paragraphs: list[list[str]] = []
+    link_phrases: set[str] = set()
+    count_texts: list[str] = []
+
+    skipped = any(_is_skip(tag) for tag in (content, *content.parents))
+
+    # Each entry holds the children left to visit in a tag, whether its
+    # paragraphs are skipped and whether the tag is an open paragraph.
+    stack = [(iter(content.contents), skipped, False)]
+    while stack:
+        children, skipped, is_paragraph = stack[-1]
+        child = next(children, None)
+
+        if child is None:
+            stack.pop()
+            if is_paragraph:
+                open_paragraphs.pop()
+            continue
+
+        if isinstance(child, Tag):
+            if links and child.name == "a" and child.has_attr("href"):
+                phrase = normalize_phrase_from_href(_href(child))
+                if phrase is not None:
+                    link_phrases.add(phrase)
+
+            starts_paragraph = paragraphs and child.name == "p"
+            if starts_paragraph:
+                pieces = [] if not skipped else None
+                found_paragraphs.append(pieces)
+                open_paragraphs.append(pieces)
+
+            stack.append(
+                (
+                    iter(child.contents),
+                    skipped or _is_skip(child),
+                    starts_paragraph,
+                )
+            )
+
+        elif type(child) in string_types:
+            for pieces in open_paragraphs:
+                if pieces is not None:
+                    pieces.append(child)
+
+            if counts or ngrams:
+                count_texts.append(child)
+
+    return Extracted(
+        paragraphs=_join_paragraphs(found_paragraphs) if paragraphs else None,
+        link_phrases=link_phrases if links else None,
+        word_counts=count_words(count_texts) if counts else None,
+        ngram_counts=count_ngrams(count_texts, ngrams) if ngrams else None,
+    )
+
+
+def _is_skip(tag: Tag) -> bool:
+    if tag.name in SKIP_TAGS:
+        return True
+
+    classes = tag.get("class") or ()
+    if isinstance(classes, str):
+        classes = classes.split()
+
+    return not SKIP_CLASSES.isdisjoint(classes)
+
+
+def _href(tag: Tag) -> str:
+    href = tag["href"]
+    if isinstance(href, list):
+        href = "".join(href)
+
+    return href
+
+
+def _join_paragraphs(found: list[list[str] | None]) -> list[str]:
+    paragraphs = []
+    for pieces in found:
+        if pieces is None:
+            continue
+
+        text = "".join(pieces).strip()
+        if text:
+            paragraphs.append(text)
+
+    return paragraphs
@@ -3,42 +3,493 @@ HTML fetching utilities for Wiki articles.
 
 Provides a requests session with default headers and functions
 to fetch HTML content safely, handling 404 errors gracefully.
+Fetched pages can optionally be kept in an on-disk cache, which is
+revalidated with conditional requests or used on its own when offline.
+Requests can be throttled by a shared token bucket, which also handles
+``Retry-After`` and backs off on 429 and 5xx responses. The session
+keeps a connection pool sized for the crawl, retries dropped
+connections with jittered backoff and records request timings.
+A local corpus can stand in for the wiki, serving every page offline.
 """
 
+import hashlib
+import json
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import HTTPError
+from urllib3.util import Retry, make_headers
+
+from .throttle import TokenBucket
+
+if TYPE_CHECKING:
+    from ...corpus import Corpus
 
 HEADERS = {
     "User-Agent": "wiki-scraper (for university project | "
-    "contact: oskar.rowicki@gmail.com)"
+    "contact: oskar.rowicki@gmail.com)",
+    # gzip and deflate, plus br and zstd when their decoders are
+    # installed; urllib3 decompresses all of them transparently.
+    **make_headers(accept_encoding=True),
 }
 TIMEOUT = 10
+DEFAULT_CACHE_BYTES = 512 * 1024 * 1024
+# Share of the size limit the cache is trimmed down to, so that it is
+# not scanned again on every page stored once it is full.
+CACHE_LOW_WATER = 0.9
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+MAX_RETRIES = 5
+BACKOFF_SECONDS = 1.0
+DEFAULT_POOL_SIZE = 10
+CONNECTION_RETRIES = 3
 
 _session: requests.Session | None = None
+_stats_lock = threading.Lock()
+_request_count = 0
+_request_seconds = 0.0
+_cache: "HttpCache | None" = None
+_limiter: TokenBucket | None = None
+_corpus: "Corpus | None" = None
+
+
+class HttpCache:
+    """
+    On-disk cache of fetched pages.
+
+    Every entry is addressed by the SHA-256 of its URL and consists of
+    the body and a small JSON file holding the validators (``ETag``
+    and ``Last-Modified``) needed to revalidate it. When the cache
+    grows over ``max_bytes``, the least recently used entries are
+    removed until it is back under ``CACHE_LOW_WATER`` of the limit.
+
+    Parameters
+    ----------
+    directory : str or Path
+        Directory to keep cached pages in. Created if missing.
+    max_bytes : int, optional
+        Size limit of all cached bodies. Defaults to 512 MiB
+    offline : bool, optional
+        Serve pages only from the cache and never touch the network.
+        Defaults to False
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        max_bytes: int = DEFAULT_CACHE_BYTES,
+        offline: bool = False,
+    ):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.offline = offline
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._size = sum(p.stat().st_size for p in self._bodies())
+
+    def get(self, url: str) -> tuple[str, dict] | None:
+        """
+        Return the cached body of a URL and its metadata, marking
+        the entry as recently used.
+
+        Returns
+        -------
+        tuple[str, dict] | None
+            (body, metadata), or None if the URL is not cached.
+        """
+        body_path, meta_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            body = body_path.read_text(encoding="utf-8")
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        self._touch(body_path)
+        return body, meta
+
+    def put(
+        self,
+        url: str,
+        body: str,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """
+        Store a fetched body with its validators, evicting old entries
+        if the cache grows over its size limit.
+        """
+        body_path, meta_path = self._paths(url)
+        body_path.parent.mkdir(exist_ok=True)
+
+        data = body.encode("utf-8")
+        meta = {"url": url, "etag": etag, "last_modified": last_modified}
+
+        try:
+            old_size = body_path.stat().st_size
+        except FileNotFoundError:
+            old_size = 0
+
+        _write_atomic(body_path, data)
+        _write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+
+        with self._lock:
+            self._size += len(data) - old_size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    @staticmethod
+    def validators(meta: dict) -> dict[str, str]:
+        """
+        Build conditional request headers from an entry's metadata.
+        """
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+        return headers
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = self.directory / key[:2] / key
+        return base.with_suffix(".html"), base.with_suffix(".json")
+
+    def _bodies(self):
+        return self.directory.glob("*/*.html")
+
+    def _touch(self, path: Path) -> None:
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self._bodies():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        entries.sort()
+        self._size = sum(size for _, size, _ in entries)
+        low_water = self.max_bytes * CACHE_LOW_WATER
+
+        for _, size, path in entries:
+            if self._size <= low_water:
+                break
+
+            path.unlink(missing_ok=True)
+            path.with_suffix(".json").unlink(missing_ok=True)
+            self._size -= size
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    # Thread IDs repeat across processes sharing the cache directory,
+    # such as parse pools and distributed workers.
+    tmp = path.with_name(
+        f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+class FetchStats(NamedTuple):
+    """Counters of the requests sent through the global session."""
+
+    requests: int
+    connections: int
+    seconds: float
+
+    @property
+    def reuse_rate(self) -> float:
+        """Share of requests sent over an already open connection."""
+        if self.requests == 0:
+            return 0.0
+
+        return max(1 - self.connections / self.requests, 0.0)
+
+    def __str__(self) -> str:
+        average = 1000 * self.seconds / self.requests if self.requests else 0
+        return (
+            f"{self.requests} requests over {self.connections} "
+            f"connections ({self.reuse_rate:.0%} reused), "
+            f"{average:.0f} ms on average"
+        )
 
 
 def get_session() -> requests.Session:
     """
-    Get a singleton requests.Session configured with default headers.
+    Get a singleton requests.Session configured with default headers,
+    a connection pool of ``DEFAULT_POOL_SIZE`` connections per host
+    and retries of failed connections.
 
     Returns
     -------
     requests.Session
         A persistent session object for making HTTP requests.
     """
-    global _session
     if _session is None:
-        s = requests.Session()
-        s.headers.update(HEADERS)
-        _session = s
+        configure_session()
 
     return _session
 
 
+def configure_session(
+    pool_size: int = DEFAULT_POOL_SIZE,
+    retries: int = CONNECTION_RETRIES,
+) -> requests.Session:
+    """
+    Replace the global session with one keeping up to ``pool_size``
+    connections alive per host, e.g. one for every crawl worker.
+
+    Connection errors and read timeouts are retried ``retries`` times
+    with exponential, jittered backoff. Error statuses are not retried
+    here but in ``throttled_get``, so that they slow down the shared
+    rate limit.
+
+    Parameters
+    ----------
+    pool_size : int, optional
+        Number of connections kept per host. Defaults to
+        ``DEFAULT_POOL_SIZE``
+    retries : int, optional
+        Number of retries of a failed connection. Defaults to
+        ``CONNECTION_RETRIES``
+
+    Returns
+    -------
+    requests.Session
+        The new session.
+    """
+    global _session, _request_count, _request_seconds
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=0,
+        backoff_factor=0.5,
+        backoff_jitter=0.5,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=retry,
+    )
+
+    s = requests.Session()
+    s.headers.update(HEADERS)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+
+    with _stats_lock:
+        old, _session = _session, s
+        _request_count, _request_seconds = 0, 0.0
+
+    if old is not None:
+        old.close()
+
+    return s
+
+
+def get_fetch_stats() -> FetchStats:
+    """
+    Return how many requests the current session has sent, how many
+    connections it had to open for them and the time spent waiting
+    for responses.
+    """
+    connections = 0
+    if _session is not None:
+        for adapter in set(_session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is not None:
+                    connections += pool.num_connections
+
+    with _stats_lock:
+        return FetchStats(_request_count, connections, _request_seconds)
+
+
+def _record(response: requests.Response) -> None:
+    global _request_count, _request_seconds
+    with _stats_lock:
+        _request_count += 1
+        _request_seconds += response.elapsed.total_seconds()
+
+
+def get_cache() -> HttpCache | None:
+    """Return the cache used by ``fetch_html``, if one is configured."""
+    return _cache
+
+
+def configure_cache(
+    directory: str | Path | None,
+    max_bytes: int = DEFAULT_CACHE_BYTES,
+    offline: bool = False,
+) -> HttpCache | None:
+    """
+    Set up (or, with ``directory=None``, disable) the on-disk cache
+    used by ``fetch_html``.
+
+    Returns
+    -------
+    HttpCache | None
+        The configured cache.
+    """
+    global _cache
+    if directory is None:
+        _cache = None
+    else:
+        _cache = HttpCache(directory, max_bytes, offline)
+
+    return _cache
+
+
+def get_corpus() -> "Corpus | None":
+    """Return the corpus pages are read from instead, if one is set."""
+    return _corpus
+
+
+def configure_corpus(corpus: "Corpus | None") -> "Corpus | None":
+    """
+    Set (or, with ``corpus=None``, unset) a local corpus that
+    ``fetch_html`` reads every page from, never touching the network.
+
+    Returns
+    -------
+    Corpus | None
+        The configured corpus.
+    """
+    global _corpus
+    _corpus = corpus
+    return _corpus
+
+
+def get_rate_limiter() -> TokenBucket | None:
+    """Return the limiter shared by all requests, if one is set."""
+    return _limiter
+
+
+def configure_rate_limit(
+    interval: float | None, burst: int = 1
+) -> TokenBucket | None:
+    """
+    Set up (or, with ``interval=None``, disable) the token bucket
+    shared by all requests made through ``throttled_get``.
+
+    Returns
+    -------
+    TokenBucket | None
+        The configured limiter.
+    """
+    global _limiter
+    if interval is None:
+        _limiter = None
+    else:
+        _limiter = TokenBucket(interval, burst)
+
+    return _limiter
+
+
+def throttled_get(
+    url: str,
+    params: dict[str, str] | None = None,
+    headers: dict[str, str] | None = None,
+) -> requests.Response:
+    """
+    Send a GET request through the global session within the shared
+    rate limit.
+
+    Responses with a status in ``RETRY_STATUSES`` are retried up to
+    ``MAX_RETRIES`` times, after the delay given in their
+    ``Retry-After`` header or an exponential backoff. While waiting,
+    the shared limiter holds back every other request too, and its
+    interval is doubled until requests succeed again.
+
+    Parameters
+    ----------
+    url : str
+        The URL to fetch.
+    params : dict[str, str], optional
+        Query parameters.
+    headers : dict[str, str], optional
+        Extra request headers.
+
+    Returns
+    -------
+    requests.Response
+        The last response received. Its status is not checked.
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        limiter = _limiter
+        if limiter is not None:
+            limiter.acquire()
+
+        response = get_session().get(
+            url, params=params, headers=headers, timeout=TIMEOUT
+        )
+        _record(response)
+        if response.status_code not in RETRY_STATUSES:
+            if limiter is not None:
+                limiter.speed_up()
+            return response
+
+        if attempt == MAX_RETRIES:
+            break
+
+        delay = _retry_after(response)
+        if delay is None:
+            delay = BACKOFF_SECONDS * 2**attempt
+
+        if limiter is not None:
+            limiter.slow_down()
+            limiter.defer(delay)
+        else:
+            time.sleep(delay)
+
+    return response
+
+
+def _retry_after(response: requests.Response) -> float | None:
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max(when.timestamp() - time.time(), 0.0)
+
+
 def fetch_html(url: str) -> str | None:
     """
     Fetch the HTML content of a URL using the global session.
 
+    If a cache is configured, a cached copy is revalidated with
+    ``If-None-Match``/``If-Modified-Since`` and reused when the server
+    answers 304. In offline mode only the cache is consulted, without
+    taking from the rate limit. Requests go through ``throttled_get``.
+    If a corpus is configured, the page is read from it instead.
+
     Parameters
     ----------
     url : str
@@ -47,20 +498,44 @@ def fetch_html(url: str) -> str | None:
     Returns
     -------
     str | None
-        The HTML content as a string, or None if the URL returns a 404.
+        The HTML content as a string, or None if the URL returns a 404
+        (or, offline, is not cached or not in the corpus).
 
     Raises
     ------
     HTTPError
         For HTTP errors other than 404.
     """
+    if _corpus is not None:
+        return _corpus.fetch(url)
+
+    cache = _cache
+    cached = cache.get(url) if cache is not None else None
+
+    if cache is not None and cache.offline:
+        return cached[0] if cached is not None else None
+
+    headers = HttpCache.validators(cached[1]) if cached is not None else {}
+
     try:
-        response = get_session().get(url, timeout=TIMEOUT)
+        response = throttled_get(url, headers=headers)
+        if response.status_code == 304 and cached is not None:
+            return cached[0]
+
         response.raise_for_status()
-        return response.text
 
     except HTTPError as e:
         if e.response is not None and e.response.status_code == 404:
             return None
         else:
             raise
+
+    if cache is not None:
+        cache.put(
+            url,
+            response.text,
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+        )
+
+    return response.text
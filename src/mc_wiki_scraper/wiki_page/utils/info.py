@@ -1,14 +1,15 @@
 """
 Info extraction utility for Wiki articles
 
-Provides a function to extract article ID and page name the HTML of a
-Wiki article.
+Provides functions to extract the article ID and page name, and the
+revision ID, from the HTML of a Wiki article.
 """
 
 import re
 
 PAGE_ID_RE = re.compile(r'"wgArticleId"\s*:\s*(\d+)')
 PAGE_NAME_RE = re.compile(r'"wg(PageName|CanonicalTitle)"\s*:\s*"([^"]+)"')
+REVISION_ID_RE = re.compile(r'"wgRevisionId"\s*:\s*(\d+)')
 
 
 def extract_id_and_title(html: str) -> tuple[int, str] | None:
@@ -37,3 +38,21 @@ def extract_id_and_title(html: str) -> tuple[int, str] | None:
     page_name = name_match.group(2)
 
     return page_id, page_name
+
+
+def extract_revision_id(html: str) -> int | None:
+    """
+    Extract the ID of the revision a Wiki article HTML string shows.
+
+    Parameters
+    ----------
+    html : str
+        The HTML content of a Wiki article page.
+
+    Returns
+    -------
+    int | None
+        The revision ID, or None if it could not be found.
+    """
+    match = REVISION_ID_RE.search(html)
+    return int(match.group(1)) if match else None
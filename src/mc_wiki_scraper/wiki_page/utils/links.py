@@ -3,9 +3,13 @@ Internal link extraction utility for Wiki articles.
 
 Provides a function to extract normalized internal link phrases from
 a bs4 Tag containing article content, ignoring external links,
-query parameters, and blocked namespaces.
+query parameters, and blocked namespaces, and a function to reduce
+the different spellings of a title to one key.
 """
 
+import re
+from urllib.parse import unquote
+
 from bs4 import Tag
 
 WIKI_PREFIX = "/w/"
@@ -19,6 +23,7 @@ BLOCKED_PREFIXES = (
     "User:",
     "User_talk:",
 )
+UNDERSCORES_RE = re.compile(r"[\s_]+")
 
 
 def normalize_phrase_from_href(href: str) -> str | None:
@@ -48,6 +53,29 @@ def normalize_phrase_from_href(href: str) -> str | None:
     return phrase
 
 
+def canonicalize_phrase(phrase: str) -> str:
+    """
+    Reduce a phrase to the title the wiki would show for it.
+
+    Percent-encoding is decoded, runs of spaces and underscores become
+    a single underscore and the first letter is capitalized, like the
+    wiki does. Redirects are not followed.
+
+    Parameters
+    ----------
+    phrase : str
+        An article phrase, e.g. as returned by
+        ``normalize_phrase_from_href``.
+
+    Returns
+    -------
+    str
+        The canonical spelling of the phrase.
+    """
+    title = UNDERSCORES_RE.sub("_", unquote(phrase)).strip("_")
+    return title[:1].upper() + title[1:]
+
+
 def extract_internal_link_phrases(content: Tag) -> set[str]:
     """
     Extract all normalized internal link phrases from
@@ -0,0 +1,189 @@
+"""
+Native lxml extraction utility for Wiki articles.
+
+Provides functions to parse article HTML with ``lxml.html`` and to
+collect paragraphs, internal link phrases, word counts and n-gram
+counts from the lxml tree in one walk, with the same results as
+``extract_all`` on a BeautifulSoup tree, which is much slower to build.
+"""
+
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+from .extract import Extracted, _join_paragraphs
+from .links import normalize_phrase_from_href
+from .ngrams import count_ngrams
+from .paragraphs import SKIP_CLASSES, SKIP_TAGS
+from .word_counts import count_words
+
+if TYPE_CHECKING:
+    from lxml.html import HtmlElement
+
+# Strings in these tags are not text to BeautifulSoup (scripts, styles,
+# templates and ruby annotations), nor are they here.
+HIDDEN_TAGS = frozenset({"script", "style", "template", "rt", "rp"})
+# Tags in which whitespace-only strings are kept as they are.
+PRESERVE_WHITESPACE_TAGS = frozenset({"pre", "textarea"})
+ASCII_SPACES = " \n\t\f\r"
+
+
+def parse_lxml(html: str) -> "HtmlElement | None":
+    """
+    Parse HTML into an lxml tree.
+
+    Parameters
+    ----------
+    html : str
+        HTML to parse.
+
+    Returns
+    -------
+    HtmlElement | None
+        The root of the document, or None if the HTML is empty or
+        cannot be parsed.
+
+    Raises
+    ------
+    ImportError
+        If lxml is not installed.
+    """
+    from lxml import etree
+    from lxml.html import document_fromstring
+
+    try:
+        return document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        return None
+
+
+def find_lxml(root: "HtmlElement", xpath: str) -> "HtmlElement | None":
+    """Return the first element an XPath expression selects, if any."""
+    found = root.xpath(xpath)
+    return found[0] if found else None
+
+
+def extract_all_lxml(
+    content: "HtmlElement",
+    paragraphs: bool = True,
+    links: bool = True,
+    counts: bool = True,
+    ngrams: Sequence[int] = (),
+) -> Extracted:
+    """
+    Extract the requested data from a Wiki article content element in
+    a single traversal, like ``extract_all``.
+
+    Parameters
+    ----------
+    content : HtmlElement
+        An lxml element containing the main content of a Wiki article.
+    paragraphs : bool, optional
+        Extract the main paragraphs. Defaults to True
+    links : bool, optional
+        Extract internal link phrases. Defaults to True
+    counts : bool, optional
+        Extract word counts. Defaults to True
+    ngrams : Sequence[int], optional
+        Sizes of the n-grams to count, if any. Defaults to none
+
+    Returns
+    -------
+    Extracted
+        The requested paragraphs, link phrases, word counts and n-gram
+        counts.
+    """
+    found_paragraphs: list[list[str] | None] = []
+    open_paragraphs: list[list[str]] = []
+    link_phrases: set[str] = set()
+    count_texts: list[str] = []
+    keep_texts = counts or bool(ngrams)
+
+    def add_text(text: str, hidden: bool, preserve: bool) -> None:
+        if hidden:
+            return
+
+        # BeautifulSoup replaces whitespace-only strings with a single
+        # newline or space.
+        if not preserve and not text.strip(ASCII_SPACES):
+            text = "\n" if "\n" in text else " "
+
+        for pieces in open_paragraphs:
+            if pieces is not None:
+                pieces.append(text)
+        if keep_texts:
+            count_texts.append(text)
+
+    ancestors = (content, *content.iterancestors())
+    skipped = any(_is_skip(el) for el in ancestors)
+    hidden = any(el.tag in HIDDEN_TAGS for el in ancestors)
+    preserve = any(el.tag in PRESERVE_WHITESPACE_TAGS for el in ancestors)
+    if content.text:
+        add_text(content.text, hidden, preserve)
+
+    # Each entry holds an element, the children left to visit in it,
+    # whether its paragraphs are skipped or its strings hidden, whether
+    # its whitespace is preserved and whether it is an open paragraph.
+    stack = [(content, iter(content), skipped, hidden, preserve, False)]
+    while stack:
+        element, children, skipped, hidden, preserve, is_paragraph = stack[-1]
+        child = next(children, None)
+
+        if child is None:
+            stack.pop()
+            if is_paragraph:
+                open_paragraphs.pop()
+            # The tail follows the element, in its parent.
+            if stack and element.tail:
+                _, _, _, hidden, preserve, _ = stack[-1]
+                add_text(element.tail, hidden, preserve)
+            continue
+
+        tag = child.tag
+        if not isinstance(tag, str):
+            # Comments and processing instructions have only a tail.
+            if child.tail:
+                add_text(child.tail, hidden, preserve)
+            continue
+
+        if links and tag == "a":
+            href = child.get("href")
+            phrase = None if href is None else normalize_phrase_from_href(href)
+            if phrase is not None:
+                link_phrases.add(phrase)
+
+        starts_paragraph = paragraphs and tag == "p"
+        if starts_paragraph:
+            pieces = [] if not skipped else None
+            found_paragraphs.append(pieces)
+            open_paragraphs.append(pieces)
+
+        child_hidden = hidden or tag in HIDDEN_TAGS
+        child_preserve = preserve or tag in PRESERVE_WHITESPACE_TAGS
+        if child.text:
+            add_text(child.text, child_hidden, child_preserve)
+
+        stack.append(
+            (
+                child,
+                iter(child),
+                skipped or _is_skip(child),
+                child_hidden,
+                child_preserve,
+                starts_paragraph,
+            )
+        )
+
+    return Extracted(
+        paragraphs=_join_paragraphs(found_paragraphs) if paragraphs else None,
+        link_phrases=link_phrases if links else None,
+        word_counts=count_words(count_texts) if counts else None,
+        ngram_counts=count_ngrams(count_texts, ngrams) if ngrams else None,
+    )
+
+
+def _is_skip(element: "HtmlElement") -> bool:
+    if element.tag in SKIP_TAGS:
+        return True
+
+    classes = element.get("class")
+    return bool(classes) and not SKIP_CLASSES.isdisjoint(classes.split())
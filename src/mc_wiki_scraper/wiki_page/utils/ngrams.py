@@ -0,0 +1,95 @@
+"""
+N-gram count extraction utility for Wiki articles.
+
+Provides functions to count the n-grams of words, such as bigrams and
+trigrams, in a bs4 Tag or in a stream of text pieces.
+"""
+
+from collections import Counter, deque
+from collections.abc import Iterable, Sequence
+from itertools import islice
+
+from bs4 import Tag
+
+from .word_counts import WORD_RE
+
+
+def extract_ngram_counts(content: Tag, sizes: Sequence[int]) -> Counter:
+    """
+    Extract n-grams of words from a Tag into a Counter.
+
+    Words are those counted by ``extract_word_counts``. An n-gram is
+    a run of n consecutive words with only whitespace between them, so
+    n-grams do not span punctuation, digits or other symbols. N-grams
+    are keyed by their words joined with single spaces.
+
+    Parameters
+    ----------
+    content : Tag
+        bs4 Tag containing the content to process
+    sizes : Sequence[int]
+        Numbers of words of the n-grams to count, e.g. ``(2, 3)`` for
+        bigrams and trigrams
+
+    Returns
+    -------
+    Counter
+        a Counter mapping each n-gram to its frequency in the content
+    """
+    return count_ngrams(content.strings, sizes)
+
+
+def count_ngrams(
+    texts: Iterable[str],
+    sizes: Sequence[int],
+    counts: Counter | None = None,
+) -> Counter:
+    """
+    Count the n-grams of words in pieces of text, such as the strings
+    of a Tag, as if the pieces were joined with spaces.
+
+    Parameters
+    ----------
+    texts : Iterable[str]
+        The pieces of text, consumed once.
+    sizes : Sequence[int]
+        Numbers of words of the n-grams to count.
+    counts : Counter, optional
+        Counter to add the n-grams to. Defaults to a new one
+
+    Returns
+    -------
+    Counter
+        ``counts``, or the new Counter, with the n-grams added.
+    """
+    if any(n < 1 for n in sizes):
+        raise ValueError("n-gram sizes must be positive")
+
+    counts = Counter() if counts is None else counts
+    if not sizes:
+        return counts
+
+    # The last words of the current run, enough for the longest n-gram.
+    window: deque[str] = deque(maxlen=max(sizes))
+    for text in texts:
+        text = text.lower()
+        end = 0
+        for match in WORD_RE.finditer(text):
+            if not _is_space(text, end, match.start()):
+                window.clear()
+
+            window.append(match.group())
+            for n in sizes:
+                start = len(window) - n
+                if start >= 0:
+                    counts[" ".join(islice(window, start, None))] += 1
+            end = match.end()
+
+        if not _is_space(text, end, len(text)):
+            window.clear()
+
+    return counts
+
+
+def _is_space(text: str, start: int, end: int) -> bool:
+    return start == end or text[start:end].isspace()
@@ -7,9 +7,13 @@ content, skipping tables, sidebars, notes, and other non-main text.
 
 from bs4 import Tag
 
-SKIP_SELECTOR = (
-    "table p, aside p, figure p, .infobox p, .thumb p, "
-    ".sidebar p, .navbox p, .toc p, .hatnote p"
+SKIP_TAGS = frozenset({"table", "aside", "figure"})
+SKIP_CLASSES = frozenset(
+    {"infobox", "thumb", "sidebar", "navbox", "toc", "hatnote"}
+)
+SKIP_SELECTOR = ", ".join(
+    [f"{tag} p" for tag in sorted(SKIP_TAGS)]
+    + [f".{cls} p" for cls in sorted(SKIP_CLASSES)]
 )
 
 
@@ -0,0 +1,95 @@
+"""
+HTML parser selection utility for Wiki articles.
+
+Provides functions to choose the tree builder BeautifulSoup uses to
+parse articles. The fastest installed one is preferred: ``lxml`` if
+available, with the pure-Python ``html.parser`` as the fallback.
+"""
+
+from bs4 import BeautifulSoup
+from bs4.builder import builder_registry
+
+PARSERS = ("lxml", "html.parser")
+
+_default_parser: str | None = None
+
+
+def available_parsers() -> list[str]:
+    """
+    Return the supported parsers that are installed, fastest first.
+
+    Returns
+    -------
+    list[str]
+        Names of the available parsers.
+    """
+    return [name for name in PARSERS if builder_registry.lookup(name)]
+
+
+def set_default_parser(name: str | None) -> None:
+    """
+    Set the parser used when none is requested explicitly.
+
+    Parameters
+    ----------
+    name : str | None
+        One of ``PARSERS``, or None to pick the fastest available.
+
+    Raises
+    ------
+    ValueError
+        If the parser is not supported or not installed.
+    """
+    global _default_parser
+    _default_parser = None if name is None else resolve_parser(name)
+
+
+def resolve_parser(name: str | None = None) -> str:
+    """
+    Return the name of the parser to use.
+
+    Parameters
+    ----------
+    name : str | None, optional
+        Requested parser. If None, the default set with
+        ``set_default_parser`` or the fastest available is used.
+
+    Returns
+    -------
+    str
+        Name of an installed parser.
+
+    Raises
+    ------
+    ValueError
+        If the parser is not supported or not installed.
+    """
+    if name is None:
+        return _default_parser or available_parsers()[0]
+
+    if name not in PARSERS:
+        raise ValueError(f"Unknown parser '{name}'")
+
+    if builder_registry.lookup(name) is None:
+        raise ValueError(f"Parser '{name}' is not installed")
+
+    return name
+
+
+def make_soup(html: str, parser: str | None = None) -> BeautifulSoup:
+    """
+    Parse HTML with the chosen parser.
+
+    Parameters
+    ----------
+    html : str
+        HTML to parse.
+    parser : str | None, optional
+        Parser to use, see ``resolve_parser``.
+
+    Returns
+    -------
+    BeautifulSoup
+        The parsed document.
+    """
+    return BeautifulSoup(html, resolve_parser(parser))
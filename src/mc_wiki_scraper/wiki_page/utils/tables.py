@@ -1,18 +1,35 @@
 """
 Table extraction utility for Wiki articles.
 
-Provides a function to extract tables the HTML of a Wiki article and
-convert them into pandas DataFrames.
+Provides functions to extract tables the HTML of a Wiki article and
+convert them into pandas DataFrames, either all at once or lazily,
+one table at a time. pandas is imported only once a table is converted.
 """
 
 import re
+from collections.abc import Sequence
 from html import unescape
 from io import StringIO
+from typing import TYPE_CHECKING
 
-import pandas as pd
+if TYPE_CHECKING:
+    import pandas as pd
 
+SPAN_RE = re.compile(r'(colspan|rowspan)\s*=\s*"?([^"> ]*)"?')
+TABLE_TAG_RE = re.compile(r"<!--.*?-->|<(/?)table\b", re.IGNORECASE | re.S)
+TEXT_RE = re.compile(r">([^<]*[^<\s])")
 
-def extract_tables(html: str) -> list[pd.DataFrame]:
+
+def _fix_spans(html: str) -> str:
+    def fix(match):
+        value = match.group(2)
+        digits = re.findall(r"\d+", value)
+        return f'{match.group(1)}="{digits[0] if digits else "1"}"'
+
+    return SPAN_RE.sub(fix, html)
+
+
+def extract_tables(html: str) -> "list[pd.DataFrame]":
     """
     Extract all HTML tables into pandas DataFrames.
 
@@ -30,13 +47,95 @@ def extract_tables(html: str) -> list[pd.DataFrame]:
     list[pandas.DataFrame]
         List of DataFrames parsed from the HTML tables.
     """
-    html = unescape(html)
-
-    def fix(match):
-        value = match.group(2)
-        digits = re.findall(r"\d+", value)
-        return f'{match.group(1)}="{digits[0] if digits else "1"}"'
+    import pandas as pd
 
-    html = re.sub(r'(colspan|rowspan)\s*=\s*"?([^"> ]*)"?', fix, html)
+    html = _fix_spans(unescape(html))
 
     return pd.read_html(StringIO(html))
+
+
+def locate_tables(html: str) -> list[tuple[int, int]]:
+    """
+    Find the positions of all tables in HTML without parsing it.
+
+    Tables are listed in document order, nested tables included,
+    skipping tables with no text, like ``pandas.read_html`` does.
+
+    Parameters
+    ----------
+    html : str
+        Raw HTML content.
+
+    Returns
+    -------
+    list[tuple[int, int]]
+        (start, end) offsets of every ``<table>`` element.
+    """
+    spans: list[list[int]] = []
+    open_tables: list[int] = []
+
+    for match in TABLE_TAG_RE.finditer(html):
+        if match.group(0).startswith("<!--"):
+            continue
+
+        if not match.group(1):
+            open_tables.append(len(spans))
+            spans.append([match.start(), -1])
+        elif open_tables:
+            end = html.find(">", match.end())
+            spans[open_tables.pop()][1] = end + 1 if end != -1 else -1
+
+    return [
+        (start, end)
+        for start, end in spans
+        if end != -1 and _has_text(html, start, end)
+    ]
+
+
+def _has_text(html: str, start: int, end: int) -> bool:
+    # pandas keeps a table if any text in it is not whitespace once
+    # entities such as &nbsp; are unescaped.
+    return any(
+        unescape(match.group(1)).strip()
+        for match in TEXT_RE.finditer(html, start, end)
+    )
+
+
+class TableIndex(Sequence):
+    """
+    Lazily converted tables of an HTML document.
+
+    The tables are located once, when the index is created, and each
+    one is converted into a DataFrame only when it is first accessed.
+
+    Parameters
+    ----------
+    html : str
+        Raw HTML content.
+    """
+
+    def __init__(self, html: str):
+        self._html = html
+        self._spans = locate_tables(html)
+        self._frames: dict[int, pd.DataFrame] = {}
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def __getitem__(self, index: int) -> "pd.DataFrame":
+        """
+        Convert the table at ``index`` (0-based) into a DataFrame.
+
+        Raises
+        ------
+        IndexError
+            If there is no such table.
+        """
+        import pandas as pd
+
+        start, end = self._spans[index]
+        if start not in self._frames:
+            html = _fix_spans(unescape(self._html[start:end]))
+            self._frames[start] = pd.read_html(StringIO(html))[0]
+
+        return self._frames[start]
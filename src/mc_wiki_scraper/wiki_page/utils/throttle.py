@@ -0,0 +1,107 @@
+"""
+Request throttling utility for Wiki crawls.
+
+Provides a thread-safe token bucket that spaces out requests made by
+any number of concurrent workers so that, together, they stay within
+a global requests-per-second budget, and that slows down when the
+server asks it to.
+"""
+
+import threading
+import time
+
+MAX_INTERVAL = 60.0
+MIN_BACKOFF_INTERVAL = 1.0
+
+
+class TokenBucket:
+    """
+    Share a request budget of one request every ``interval`` seconds
+    between any number of threads, allowing short bursts.
+
+    The bucket holds up to ``burst`` tokens and gains one every
+    ``interval`` seconds; each request takes one. The interval adapts
+    to the server: ``slow_down`` doubles it after an error response
+    and ``speed_up`` brings it back towards the configured value after
+    successful ones. ``defer`` stops all requests for a while, e.g.
+    for the duration of a ``Retry-After`` header.
+
+    Parameters
+    ----------
+    interval : float
+        Minimum average number of seconds between two requests.
+        ``0`` disables throttling, apart from ``defer``.
+    burst : int, optional
+        Number of requests that may start at once after an idle
+        period. Defaults to 1
+    """
+
+    def __init__(self, interval: float, burst: int = 1):
+        self.base_interval = interval
+        self.interval = interval
+        self.burst = burst
+
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+
+    def acquire(self) -> None:
+        """
+        Block until the caller is allowed to make its request.
+
+        Tokens are handed out in the order callers arrive; callers that
+        find the bucket empty reserve the next token and wait for it.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+
+            ready = self._last
+            if self._tokens < 0:
+                ready += -self._tokens * self.interval
+
+        delay = ready - now
+        if delay > 0:
+            time.sleep(delay)
+
+    def defer(self, seconds: float) -> None:
+        """
+        Let no new request start for ``seconds`` seconds, after which
+        one request may go through to probe the server.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._last = max(self._last, now + seconds)
+            self._tokens = min(self._tokens, 1.0)
+
+    def slow_down(self) -> None:
+        """Double the interval, e.g. after a 429 or 5xx response."""
+        with self._lock:
+            self.interval = min(
+                max(2 * self.interval, MIN_BACKOFF_INTERVAL), MAX_INTERVAL
+            )
+
+    def speed_up(self) -> None:
+        """
+        Shorten the interval by a tenth after a successful response,
+        down to the configured one.
+        """
+        with self._lock:
+            interval = 0.9 * self.interval
+            if interval - self.base_interval < 0.01:
+                interval = self.base_interval
+            self.interval = interval
+
+    def _refill(self, now: float) -> None:
+        if now <= self._last:
+            return
+
+        if self.interval > 0:
+            gained = (now - self._last) / self.interval
+            self._tokens = min(self._tokens + gained, float(self.burst))
+        else:
+            self._tokens = float(self.burst)
+
+        self._last = now
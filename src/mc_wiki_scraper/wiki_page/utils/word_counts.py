@@ -2,14 +2,24 @@
 Word count extraction utility for Wiki articles.
 
 Provides a function to extract word counts from a bs4 Tag and
-convert them into a Counter.
+convert them into a Counter, and a function to count words in a stream
+of text pieces.
 """
 
+import re
 from collections import Counter
+from collections.abc import Iterable
 
 import regex
 from bs4 import Tag
 
+WORD_RE = regex.compile(r"\b\p{L}+(?:[-']\p{L}+)*\b")
+# On lowercased ASCII text, \p{L} matches just [a-z], so the stdlib
+# engine finds the same words as WORD_RE, several times faster.
+ASCII_WORD_RE = re.compile(r"\b[a-z]+(?:[-'][a-z]+)*\b", re.ASCII)
+
+CHUNK_SIZE = 64 * 1024
+
 
 def extract_word_counts(content: Tag) -> Counter:
     """
@@ -30,7 +40,60 @@ def extract_word_counts(content: Tag) -> Counter:
     Counter
         a Counter mapping each word to its frequency in the content
     """
-    text = content.get_text(separator=" ", strip=True).lower()
-    words = regex.findall(r"\b\p{L}+(?:[-']\p{L}+)*\b", text)
+    return count_words(content.strings)
+
+
+def count_words(
+    texts: Iterable[str], counts: Counter | None = None
+) -> Counter:
+    """
+    Count the words in pieces of text, such as the strings of a Tag.
+
+    The result is the same as counting the words of the pieces joined
+    with spaces, as ``extract_word_counts`` defines them, but the text
+    is never joined whole: pieces are tokenized in chunks of about
+    ``CHUNK_SIZE`` characters, and pure ASCII pieces, which make up
+    most of an article, with ``ASCII_WORD_RE``.
+
+    Parameters
+    ----------
+    texts : Iterable[str]
+        The pieces of text, consumed once.
+    counts : Counter, optional
+        Counter to add the words to. Defaults to a new one
+
+    Returns
+    -------
+    Counter
+        ``counts``, or the new Counter, with the words added.
+    """
+    counts = Counter() if counts is None else counts
+    ascii_chunk: list[str] = []
+    other_chunk: list[str] = []
+    ascii_size = other_size = 0
+
+    for text in texts:
+        # Pieces are split before lowercasing, which can make non-ASCII
+        # letters ASCII (e.g. the Kelvin sign becomes "k").
+        if text.isascii():
+            ascii_chunk.append(text)
+            ascii_size += len(text)
+            if ascii_size >= CHUNK_SIZE:
+                _count_chunk(ASCII_WORD_RE, ascii_chunk, counts)
+                ascii_size = 0
+        else:
+            other_chunk.append(text)
+            other_size += len(text)
+            if other_size >= CHUNK_SIZE:
+                _count_chunk(WORD_RE, other_chunk, counts)
+                other_size = 0
+
+    _count_chunk(ASCII_WORD_RE, ascii_chunk, counts)
+    _count_chunk(WORD_RE, other_chunk, counts)
+    return counts
+
 
-    return Counter(words)
+def _count_chunk(pattern, chunk: list[str], counts: Counter) -> None:
+    if chunk:
+        counts.update(pattern.findall(" ".join(chunk).lower()))
+        chunk.clear()
@@ -0,0 +1,163 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from mc_wiki_scraper.wiki_page import core
+
+BASE_URL = "https://minecraft.wiki/w/"
+
+CONTENT_TEMPLATE = (
+    '<div class="mw-parser-output"><p>{text}</p><p>{links}</p></div>'
+)
+
+PAGE_TEMPLATE = """<html><head><script>
+"wgArticleId":{page_id},"wgPageName":"{title}","wgRevisionId":{rev_id}
+</script></head><body>
+<div id="mw-content-text" class="mw-body-content">
+{content}
+</div></body></html>
+"""
+
+
+def make_content(text: str, links=()) -> str:
+    """Build the parser output of a minimal Wiki article."""
+    anchors = " ".join(f'<a href="/w/{link}"></a>' for link in links)
+    return CONTENT_TEMPLATE.format(text=text, links=anchors)
+
+
+def make_page(
+    page_id: int, title: str, text: str, links=(), rev_id: int = 0
+) -> str:
+    """Build a minimal rendered Wiki article page."""
+    return PAGE_TEMPLATE.format(
+        page_id=page_id,
+        title=title,
+        rev_id=rev_id,
+        content=make_content(text, links),
+    )
+
+
+def normalize_title(phrase: str) -> str:
+    title = phrase.replace("_", " ").strip()
+    return title[:1].upper() + title[1:]
+
+
+class FakeWiki:
+    """
+    In-memory stand-in for the wiki, serving rendered pages keyed by
+    the phrase in the URL and MediaWiki API queries.
+    Records every requested phrase in ``requests`` and every API query
+    in ``api_requests``. API queries for a ``prop`` in ``failing_props``
+    fail with a server error.
+    """
+
+    def __init__(self):
+        self.pages: dict[str, str] = {}
+        self.articles: dict[str, dict] = {}
+        self.redirects: dict[str, str] = {}
+        self.requests: list[str] = []
+        self.api_requests: list[dict] = []
+        self.failing_props: set[str] = set()
+
+    def add(self, page_id, title, text, links=(), aliases=(), rev_id=None):
+        rev_id = rev_id or 100 + page_id
+        html = make_page(page_id, title, text, links, rev_id)
+        for phrase in (title, *aliases):
+            self.pages[phrase] = html
+
+        self.articles[normalize_title(title)] = {
+            "pageid": page_id,
+            "ns": 0,
+            "title": normalize_title(title),
+            "lastrevid": rev_id,
+            "revisions": [
+                {"revid": rev_id, "content": make_content(text, links)}
+            ],
+        }
+        for alias in aliases:
+            self.redirects[normalize_title(alias)] = normalize_title(title)
+
+    def fetch_html(self, url: str) -> str | None:
+        phrase = url.removeprefix(BASE_URL)
+        self.requests.append(phrase)
+        return self.pages.get(phrase)
+
+    def api(self, params: dict[str, str]) -> dict:
+        self.api_requests.append(params)
+        query = {"normalized": [], "redirects": [], "pages": []}
+
+        for title in params["titles"].split("|"):
+            normalized = normalize_title(title)
+            if normalized != title:
+                query["normalized"].append({"from": title, "to": normalized})
+
+            target = self.redirects.get(normalized, normalized)
+            if target != normalized:
+                query["redirects"].append({"from": normalized, "to": target})
+
+            page = self.articles.get(target)
+            if page is None:
+                page = {"ns": 0, "title": target, "missing": True}
+            if page not in query["pages"]:
+                query["pages"].append(page)
+
+        return {"batchcomplete": True, "query": query}
+
+
+@pytest.fixture
+def fake_wiki(monkeypatch):
+    """
+    A small linked wiki served in place of the network::
+
+        Root -> Alpha, Beta
+        Alpha -> Gamma, Beta_(redirect)
+        Beta -> Root, Gamma
+    """
+    wiki = FakeWiki()
+    wiki.add(1, "Root", "root words", ["Alpha", "Beta"])
+    wiki.add(2, "Alpha", "alpha words", ["Gamma", "Beta_(redirect)"])
+    wiki.add(3, "Beta", "beta words", ["Root", "Gamma"], ["Beta_(redirect)"])
+    wiki.add(4, "Gamma", "gamma words")
+
+    monkeypatch.setattr(core, "fetch_html", wiki.fetch_html)
+    return wiki
+
+
+@pytest.fixture
+def fake_api(fake_wiki):
+    """
+    Local HTTP server answering MediaWiki API queries from
+    ``fake_wiki``. Yields the URL of its ``api.php``.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlsplit(self.path)
+            params = {k: v[0] for k, v in parse_qs(url.query).items()}
+            if params.get("prop") in fake_wiki.failing_props:
+                fake_wiki.api_requests.append(params)
+                self.send_error(500)
+                return
+
+            body = json.dumps(fake_wiki.api(params)).encode("utf-8")
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(
+        target=httpd.serve_forever, args=(0.01,), daemon=True
+    )
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}/api.php"
+    httpd.shutdown()
+    httpd.server_close()
@@ -0,0 +1,120 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mc_wiki_scraper.modes import AnalyzeFrequencyMode
+from mc_wiki_scraper.storage import convert_json_counts, top_k
+
+
+@pytest.fixture
+def mode_class(tmp_path, monkeypatch):
+    counts = {"the": 50, "creeper": 50, "of": 20, "explodes": 20, "zz": 20}
+    counts.update({f"w{i}": i % 7 + 1 for i in range(100)})
+    path = tmp_path / "word-counts.json"
+    path.write_text(json.dumps(counts), encoding="utf-8")
+
+    monkeypatch.setattr(AnalyzeFrequencyMode, "WORD_COUNTS_FILE", path)
+    monkeypatch.setattr(AnalyzeFrequencyMode, "MAX_LANG_WORDS", 200)
+    monkeypatch.setattr(AnalyzeFrequencyMode, "LANG_INDEX_DIR", tmp_path)
+    return AnalyzeFrequencyMode
+
+
+def sorted_table(mode, ranked: str, count: int) -> pd.DataFrame:
+    # The tables as computed before, with a full sort of dicts, with
+    # article words of equal counts in sorted order.
+    article = dict(
+        zip(mode.words.tolist(), mode.article_freqs.tolist(), strict=True)
+    )
+    lang = dict(
+        zip(mode.lang_words.tolist(), mode.lang_freqs.tolist(), strict=True)
+    )
+    ranked_norms, other = article, lang
+    if ranked == "language":
+        ranked_norms, other = lang, article
+
+    def key(item):
+        word, freq = item
+        return (-freq, word) if ranked == "article" else -freq
+
+    rows = []
+    for word, freq in sorted(ranked_norms.items(), key=key)[:count]:
+        freqs = (freq, other.get(word, np.nan))
+        if ranked == "language":
+            freqs = freqs[::-1]
+        rows.append(
+            {
+                "word": word,
+                "frequency in the article": freqs[0],
+                "frequency in wiki language": freqs[1],
+            }
+        )
+
+    return pd.DataFrame(rows)
+
+
+@pytest.mark.parametrize("ranked", ["article", "language"])
+@pytest.mark.parametrize("count", [1, 4, 10, 1000])
+def test_matches_full_sort(mode_class, ranked, count):
+    mode = mode_class(ranked, count)
+    mode.load_word_counts()
+    mode.normalize_article_counts()
+    mode.normalize_lang_counts()
+
+    if ranked == "article":
+        table = mode._get_table_article_mode()
+    else:
+        table = mode._get_table_lang_mode()
+
+    pd.testing.assert_frame_equal(
+        table, sorted_table(mode, ranked, count), check_dtype=False
+    )
+
+
+def test_run_prints_table(mode_class, capsys):
+    mode_class("article", 3).run()
+
+    # Of the words tied for third, the first in sorted order is shown.
+    out = capsys.readouterr().out
+    assert "creeper" in out
+    assert "explodes" in out
+    assert "zz" not in out
+
+
+@pytest.mark.parametrize("ranked", ["article", "language"])
+@pytest.mark.parametrize("count", [3, 4, 1000])
+def test_binary_counts_match_json(mode_class, tmp_path, ranked, count):
+    path = tmp_path / "word-counts.bin"
+    convert_json_counts(mode_class.WORD_COUNTS_FILE, path)
+
+    tables = []
+    for counts_path in (None, str(path)):
+        mode = mode_class(ranked, count, counts_path=counts_path)
+        mode.load_word_counts()
+        mode.normalize_article_counts()
+        mode.normalize_lang_counts()
+        if ranked == "article":
+            tables.append(mode._get_table_article_mode())
+        else:
+            tables.append(mode._get_table_lang_mode())
+
+    # "of", "explodes" and "zz" tie at the cutoff of 3 and 4 words.
+    json_table, binary_table = tables
+    pd.testing.assert_frame_equal(binary_table, json_table)
+
+
+def test_top_k_keeps_order_of_ties():
+    values = np.array([1.0, 3.0, 2.0, 3.0, 2.0, 2.0])
+
+    assert top_k(values, 4).tolist() == [1, 3, 2, 4]
+    assert top_k(values, 0).tolist() == []
+    assert top_k(values, 10).tolist() == [1, 3, 2, 4, 5, 0]
+
+
+def test_top_k_orders_ties_by_key():
+    values = np.array([1.0, 3.0, 2.0, 3.0, 2.0, 2.0])
+    keys = np.array(["f", "e", "d", "c", "b", "a"], dtype=object)
+
+    assert top_k(values, 4, keys).tolist() == [3, 1, 5, 4]
+    assert top_k(values, 10, keys).tolist() == [3, 1, 5, 4, 2, 0]
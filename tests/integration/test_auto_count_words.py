@@ -0,0 +1,435 @@
+import json
+
+import pytest
+from requests import HTTPError
+
+from mc_wiki_scraper.cli import args
+from mc_wiki_scraper.cli.mode_builder import build_mode
+from mc_wiki_scraper.modes import AutoCountWordsMode, CountWordsMode
+from mc_wiki_scraper.storage import (
+    ArticleCountsStore,
+    ArticleMatrix,
+    CrawlCheckpoint,
+    JsonCountsStore,
+    PageLedger,
+)
+from mc_wiki_scraper.wiki_page import WikiPage, core
+from mc_wiki_scraper.wiki_page.utils import fetch
+
+
+@pytest.fixture
+def counts_path(tmp_path, monkeypatch):
+    path = tmp_path / "word-counts.json"
+    monkeypatch.setattr(CountWordsMode, "JSONPATH", path)
+    return path
+
+
+def crawl(depth, workers, path, backend="html", resolve=False, ledger=None):
+    AutoCountWordsMode(
+        WikiPage("Root"),
+        depth,
+        0,
+        workers,
+        backend=backend,
+        resolve=resolve,
+        ledger=ledger,
+    ).run()
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_depth_limit(fake_wiki, counts_path):
+    counts = crawl(1, 1, counts_path)
+
+    assert counts["words"] == 3
+    assert "gamma" not in counts
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_visits_each_article_once(fake_wiki, counts_path, capsys, workers):
+    counts = crawl(2, workers, counts_path)
+
+    assert counts == {
+        "root": 1,
+        "alpha": 1,
+        "beta": 1,
+        "gamma": 1,
+        "words": 4,
+    }
+    titles = capsys.readouterr().out.split()
+    assert titles[0] == "Root"
+    assert sorted(titles[1:3]) == ["Alpha", "Beta"]
+    assert titles[3] == "Gamma"
+
+
+def test_api_backend(fake_wiki, fake_api, counts_path, monkeypatch):
+    monkeypatch.setattr(WikiPage, "API_URL", fake_api)
+    counts = crawl(2, 2, counts_path, backend="api")
+
+    assert counts["words"] == 4
+    assert fake_wiki.requests == ["Root"]
+    assert len(fake_wiki.api_requests) == 2
+
+
+def test_parse_processes(fake_wiki, counts_path, capsys, monkeypatch):
+    # Spawned parsing processes do not see this patch, so only pages
+    # parsed on the calling thread are recorded, even across commits.
+    extracted = []
+    extract = WikiPage.extract
+
+    def record(page, *args, **kwargs):
+        extracted.append(page.phrase)
+        return extract(page, *args, **kwargs)
+
+    monkeypatch.setattr(WikiPage, "extract", record)
+    monkeypatch.setattr(AutoCountWordsMode, "FLUSH_EVERY", 1)
+
+    AutoCountWordsMode(
+        WikiPage("Root"), 2, 0, 2, parse_processes=2, queue_depth=1
+    ).run()
+
+    with open(counts_path, encoding="utf-8") as f:
+        assert json.load(f) == {
+            "root": 1,
+            "alpha": 1,
+            "beta": 1,
+            "gamma": 1,
+            "words": 4,
+        }
+    assert capsys.readouterr().out.split()[-1] == "Gamma"
+    assert extracted == ["Root"]
+
+
+def test_resolve_skips_known_articles(
+    fake_wiki, fake_api, counts_path, monkeypatch
+):
+    monkeypatch.setattr(WikiPage, "API_URL", fake_api)
+    counts = crawl(2, 2, counts_path, resolve=True)
+
+    assert counts["words"] == 4
+    assert sorted(fake_wiki.requests) == ["Alpha", "Beta", "Gamma", "Root"]
+    assert all(r["prop"] == "info" for r in fake_wiki.api_requests)
+
+
+def test_resolve_once_across_commits(
+    fake_wiki, fake_api, counts_path, monkeypatch
+):
+    monkeypatch.setattr(WikiPage, "API_URL", fake_api)
+    monkeypatch.setattr(AutoCountWordsMode, "FLUSH_EVERY", 1)
+    crawl(2, 1, counts_path, resolve=True)
+
+    titles = [
+        title
+        for r in fake_wiki.api_requests
+        for title in r["titles"].split("|")
+    ]
+    assert len(titles) == len(set(titles))
+
+
+def test_resolve_failure_skips_batch(
+    fake_wiki, fake_api, counts_path, tmp_path, monkeypatch, capsys
+):
+    monkeypatch.setattr(WikiPage, "API_URL", fake_api)
+    monkeypatch.setattr(fetch, "MAX_RETRIES", 0)
+    fake_wiki.failing_props.add("info")
+    checkpoint = CrawlCheckpoint(tmp_path / "checkpoint.json")
+
+    AutoCountWordsMode(
+        WikiPage("Root"), 2, 0, 1, checkpoint=checkpoint, resolve=True
+    ).run()
+    with open(counts_path, encoding="utf-8") as f:
+        counts = json.load(f)
+
+    assert counts == {"root": 1, "words": 1}
+    assert fake_wiki.requests == ["Root"]
+    assert "Failed to resolve 2 articles - skipping" in capsys.readouterr().out
+    assert not checkpoint.path.exists()
+
+
+@pytest.mark.parametrize("seen_error_rate", [None, 0.01])
+def test_resume_after_crash(
+    fake_wiki, counts_path, monkeypatch, tmp_path, seen_error_rate
+):
+    checkpoint = CrawlCheckpoint(tmp_path / "crawl.json")
+    monkeypatch.setattr(AutoCountWordsMode, "FLUSH_EVERY", 2)
+
+    fetch_html = fake_wiki.fetch_html
+
+    def crash_on_gamma(url):
+        if url.endswith("Gamma"):
+            raise ConnectionError
+        return fetch_html(url)
+
+    monkeypatch.setattr(core, "fetch_html", crash_on_gamma)
+    with pytest.raises(ConnectionError):
+        AutoCountWordsMode(
+            WikiPage("Root"),
+            2,
+            0,
+            1,
+            checkpoint=checkpoint,
+            seen_error_rate=seen_error_rate,
+        ).run()
+
+    assert checkpoint.load() is not None
+
+    monkeypatch.setattr(core, "fetch_html", fetch_html)
+    fake_wiki.requests.clear()
+    AutoCountWordsMode(
+        WikiPage("Root"),
+        2,
+        0,
+        1,
+        checkpoint=checkpoint,
+        resume=True,
+        seen_error_rate=seen_error_rate,
+    ).run()
+
+    with open(counts_path, encoding="utf-8") as f:
+        assert json.load(f)["words"] == 4
+    assert "Root" not in fake_wiki.requests
+    assert checkpoint.load() is None
+
+
+@pytest.mark.parametrize(("commit_every", "saves"), [(1, 4), (3, 2)])
+def test_commit_every(
+    fake_wiki, counts_path, monkeypatch, tmp_path, commit_every, saves
+):
+    checkpoint = CrawlCheckpoint(tmp_path / "crawl.json")
+    saved = []
+    monkeypatch.setattr(checkpoint, "save", saved.append)
+
+    AutoCountWordsMode(
+        WikiPage("Root"),
+        2,
+        0,
+        1,
+        checkpoint=checkpoint,
+        commit_every=commit_every,
+    ).run()
+
+    # After every few articles of 4, and once at the end.
+    assert len(saved) == saves
+    with open(counts_path, encoding="utf-8") as f:
+        assert json.load(f)["words"] == 4
+
+
+def test_ledger_resume_after_crash(
+    fake_wiki, counts_path, monkeypatch, tmp_path
+):
+    checkpoint = CrawlCheckpoint(tmp_path / "crawl.json")
+    ledger_path = tmp_path / "ledger.sqlite"
+    monkeypatch.setattr(AutoCountWordsMode, "FLUSH_EVERY", 2)
+
+    # Die right after the first checkpoint, before the ledger commit.
+    commit = PageLedger.commit
+    monkeypatch.setattr(PageLedger, "commit", _raise)
+    with pytest.raises(ConnectionError):
+        AutoCountWordsMode(
+            WikiPage("Root"),
+            2,
+            0,
+            1,
+            checkpoint=checkpoint,
+            ledger=PageLedger(ledger_path),
+        ).run()
+
+    monkeypatch.setattr(PageLedger, "commit", commit)
+    AutoCountWordsMode(
+        WikiPage("Root"),
+        2,
+        0,
+        1,
+        checkpoint=checkpoint,
+        resume=True,
+        ledger=PageLedger(ledger_path),
+    ).run()
+
+    with PageLedger(ledger_path) as ledger:
+        assert len(ledger.revisions()) == 4
+
+    # Nothing changed, so a recrawl adds nothing.
+    counts = crawl(2, 1, counts_path, ledger=PageLedger(ledger_path))
+    assert counts["words"] == 4
+
+
+def _raise(*args):
+    raise ConnectionError
+
+
+def test_failed_article_is_skipped(fake_wiki, counts_path, monkeypatch):
+    fetch_html = fake_wiki.fetch_html
+
+    def fail_on_gamma(url):
+        if url.endswith("Gamma"):
+            raise HTTPError("500 Server Error")
+        return fetch_html(url)
+
+    monkeypatch.setattr(core, "fetch_html", fail_on_gamma)
+    counts = crawl(2, 2, counts_path)
+
+    assert counts["words"] == 3
+    assert "gamma" not in counts
+
+
+@pytest.mark.parametrize("resolve", [False, True])
+def test_incremental_recrawl(
+    fake_wiki, fake_api, counts_path, tmp_path, monkeypatch, resolve
+):
+    monkeypatch.setattr(WikiPage, "API_URL", fake_api)
+    ledger_path = tmp_path / "ledger.sqlite"
+    crawl(2, 2, counts_path, resolve=resolve, ledger=PageLedger(ledger_path))
+
+    fake_wiki.add(2, "Alpha", "alpha edited", ["Gamma"], rev_id=202)
+    fake_wiki.requests.clear()
+    counts = crawl(
+        2, 2, counts_path, resolve=resolve, ledger=PageLedger(ledger_path)
+    )
+
+    assert counts == {
+        "root": 1,
+        "alpha": 1,
+        "edited": 1,
+        "beta": 1,
+        "gamma": 1,
+        "words": 3,
+    }
+    # Unchanged articles are revalidated, or with resolve, not even
+    # downloaded.
+    if resolve:
+        assert fake_wiki.requests == ["Root", "Alpha"]
+    else:
+        assert sorted(fake_wiki.requests) == ["Alpha", "Beta", "Gamma", "Root"]
+
+
+def test_ledger_batch_missing_from_store(fake_wiki, counts_path, tmp_path):
+    # The crawl died after committing the ledger, before the store
+    # was flushed.
+    with PageLedger(tmp_path / "ledger.sqlite") as ledger:
+        ledger.commit(1, {"lost": 2})
+
+    counts = crawl(0, 1, counts_path, ledger=PageLedger(ledger.path))
+
+    assert counts == {"lost": 2, "root": 1, "words": 1}
+
+
+@pytest.mark.parametrize("parse_processes", [0, 2])
+def test_ngram_counts(fake_wiki, counts_path, tmp_path, parse_processes):
+    ngram_store = JsonCountsStore(tmp_path / "ngram-counts.json", None)
+    AutoCountWordsMode(
+        WikiPage("Root"),
+        2,
+        0,
+        2,
+        parse_processes=parse_processes,
+        ngrams=(2,),
+        ngram_store=ngram_store,
+    ).run()
+
+    with open(tmp_path / "ngram-counts.json", encoding="utf-8") as f:
+        ngrams = json.load(f)
+    assert ngrams["gamma words"] == 1
+    assert sum(ngrams.values()) >= 4
+
+
+def test_ngrams_resume_after_crash(
+    fake_wiki, counts_path, monkeypatch, tmp_path
+):
+    checkpoint = CrawlCheckpoint(tmp_path / "crawl.json")
+    ngram_path = tmp_path / "ngram-counts.json"
+    monkeypatch.setattr(AutoCountWordsMode, "FLUSH_EVERY", 2)
+
+    def run(**kwargs):
+        AutoCountWordsMode(
+            WikiPage("Root"),
+            2,
+            0,
+            1,
+            ngrams=(2,),
+            ngram_store=JsonCountsStore(ngram_path, None),
+            ngram_error=0.1,
+            **kwargs,
+        ).run()
+        with open(ngram_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    expected = run()
+    ngram_path.unlink()
+    counts_path.unlink()
+
+    fetch_html = fake_wiki.fetch_html
+
+    def crash_on_gamma(url):
+        if url.endswith("Gamma"):
+            raise ConnectionError
+        return fetch_html(url)
+
+    monkeypatch.setattr(core, "fetch_html", crash_on_gamma)
+    with pytest.raises(ConnectionError):
+        run(checkpoint=checkpoint)
+
+    monkeypatch.setattr(core, "fetch_html", fetch_html)
+    assert run(checkpoint=checkpoint, resume=True) == expected
+
+
+def test_ngrams_need_no_ledger(tmp_path):
+    with pytest.raises(ValueError):
+        AutoCountWordsMode(
+            WikiPage("Root"),
+            ngrams=(2,),
+            ledger=PageLedger(tmp_path / "ledger.sqlite"),
+        )
+
+
+def test_article_counts(fake_wiki, counts_path, tmp_path, monkeypatch):
+    monkeypatch.setattr(AutoCountWordsMode, "FLUSH_EVERY", 1)
+    npz_path = tmp_path / "articles.sqlite.npz"
+    articles = ArticleCountsStore(tmp_path / "articles.sqlite", npz_path)
+
+    AutoCountWordsMode(WikiPage("Root"), 2, 0, 2, articles=articles).run()
+
+    matrix = ArticleMatrix.load(npz_path)
+    assert matrix.page_ids.tolist() == [1, 2, 3, 4]
+    assert matrix.row(4) == {"gamma": 1, "words": 1}
+
+    words = matrix.words.tolist()
+    totals = dict(zip(words, matrix.word_totals().tolist(), strict=True))
+    with open(counts_path, encoding="utf-8") as f:
+        assert totals == json.load(f)
+
+
+def test_built_from_args(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    argv = [
+        "auto-count-words",
+        "Bee",
+        "--depth",
+        "2",
+        "--wait",
+        "0.5",
+        "--workers",
+        "3",
+        "--backend",
+        "api",
+        "--resolve",
+        "--burst",
+        "4",
+        "--parse-processes",
+        "2",
+        "--queue-depth",
+        "7",
+        "--commit-every",
+        "9",
+    ]
+
+    mode = build_mode(args._build_parser().parse_args(argv))
+
+    assert mode.max_depth == 2
+    assert mode.wait == 0.5
+    assert mode.workers == 3
+    assert mode.backend == "api"
+    assert mode.resolve is True
+    assert mode.burst == 4
+    assert mode.parse_processes == 2
+    assert mode.queue_depth == 7
+    assert mode.commit_every == 9
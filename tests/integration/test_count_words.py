@@ -2,7 +2,12 @@ import json
 from collections import Counter
 from pathlib import Path
 
+import pytest
+
+from mc_wiki_scraper.cli import args
+from mc_wiki_scraper.cli.mode_builder import build_mode
 from mc_wiki_scraper.modes import CountWordsMode
+from mc_wiki_scraper.storage import SqliteCountsStore
 from mc_wiki_scraper.wiki_page import WikiPage
 
 HERE = Path(__file__).parent
@@ -32,3 +37,40 @@ def test_count_words_integration(tmp_path):
 
     for word, count in expected_words.items():
         assert counts[word] == count
+
+
+def test_count_ngrams_integration(tmp_path, monkeypatch):
+    html_path = HERE.parent / "test_files" / "Creeper.html"
+    ngram_path = tmp_path / "ngram-counts.json"
+    monkeypatch.setattr(CountWordsMode, "JSONPATH", tmp_path / "words.json")
+    monkeypatch.setattr(CountWordsMode, "NGRAM_JSONPATH", ngram_path)
+    monkeypatch.setattr(
+        CountWordsMode, "NGRAM_SQLITEPATH", tmp_path / "ngram-counts.sqlite"
+    )
+
+    CountWordsMode(WikiPage(html_file=html_path), ngrams=(2, 3)).run()
+
+    with open(ngram_path, encoding="utf-8") as f:
+        counts = json.load(f)
+
+    assert counts["charged creeper"] > 0
+    assert all(len(ngram.split()) in (2, 3) for ngram in counts)
+    assert (tmp_path / "ngram-counts.sqlite").exists()
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["count-words", "Bee"],
+        ["auto-count-words", "Bee", "--depth", "1", "--wait", "0"],
+    ],
+)
+def test_ngrams_kept_in_sqlite(tmp_path, monkeypatch, argv):
+    monkeypatch.chdir(tmp_path)
+    parser = args._build_parser()
+
+    built = build_mode(parser.parse_args([*argv, "--ngrams", "2"]))
+    built.ngram_store.close()
+
+    assert isinstance(built.ngram_store, SqliteCountsStore)
+    assert built.ngram_store.export_path.name == "ngram-counts.json"
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from mc_wiki_scraper.modes import CountWordsMode, DistributedCountWordsMode
+from mc_wiki_scraper.wiki_page import WikiPage
+from mc_wiki_scraper.wiki_page.utils import configure_cache
+
+EXPECTED = {"root": 1, "alpha": 1, "beta": 1, "gamma": 1, "words": 4}
+
+
+@pytest.fixture
+def counts_path(tmp_path, monkeypatch):
+    path = tmp_path / "word-counts.json"
+    monkeypatch.setattr(CountWordsMode, "JSONPATH", path)
+    return path
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_roles(fake_wiki, counts_path, tmp_path):
+    frontier = tmp_path / "frontier.sqlite"
+
+    def mode(role, root_page=None):
+        return DistributedCountWordsMode(frontier, role, root_page, 2, 0)
+
+    mode("seed", WikiPage("Root")).run()
+    with pytest.raises(ValueError):
+        mode("seed", WikiPage("Root")).run()
+    fake_wiki.requests.clear()
+
+    mode("work").run()
+    mode("work").run()
+    mode("reduce").run()
+
+    assert load(counts_path) == EXPECTED
+    # The root article is counted when seeding, not fetched again.
+    assert "Root" not in fake_wiki.requests
+    with pytest.raises(ValueError):
+        mode("reduce").run()
+
+
+def test_reduce_needs_finished_crawl(fake_wiki, counts_path, tmp_path):
+    frontier = tmp_path / "frontier.sqlite"
+    DistributedCountWordsMode(frontier, "seed", WikiPage("Root")).run()
+
+    with pytest.raises(ValueError):
+        DistributedCountWordsMode(frontier, "reduce").run()
+
+
+def test_worker_processes(fake_wiki, counts_path, tmp_path):
+    # Spawned workers do not see the fake wiki, so its pages are put
+    # in an offline cache, which is handed to them.
+    cache = configure_cache(tmp_path / "cache", offline=True)
+    for phrase, html in fake_wiki.pages.items():
+        cache.put(WikiPage.BASE_URL + phrase, html)
+
+    try:
+        DistributedCountWordsMode(
+            tmp_path / "frontier.sqlite",
+            root_page=WikiPage("Root"),
+            max_depth=2,
+            wait=0,
+            processes=2,
+        ).run()
+    finally:
+        configure_cache(None)
+
+    assert load(counts_path) == EXPECTED
+
+
+def test_processes_default_to_cpus(monkeypatch, tmp_path):
+    monkeypatch.setattr("os.cpu_count", lambda: 3)
+    mode = DistributedCountWordsMode(tmp_path / "frontier.sqlite", "work")
+
+    assert mode.processes == 3
@@ -0,0 +1,100 @@
+import json
+
+import pytest
+
+from mc_wiki_scraper.corpus import (
+    ArchiveWriter,
+    index_path,
+    open_corpus,
+    read_index,
+)
+from mc_wiki_scraper.modes import (
+    AutoCountWordsMode,
+    CountWordsMode,
+    ReplayCountWordsMode,
+)
+from mc_wiki_scraper.wiki_page import WikiPage
+from mc_wiki_scraper.wiki_page.utils import configure_corpus, fetch
+
+PAGES = [
+    (1, "Root", "Root words. [[Alpha]] [[Beta]]"),
+    (2, "Alpha", "Alpha words. [[Gamma]] [[Beta (redirect)]]"),
+    (3, "Beta", "Beta words. [[Root]] [[Gamma|the gamma]]"),
+    (
+        4,
+        "Gamma",
+        'Gamma words.\n{| class="wikitable"\n! Item !! Count\n'
+        "|-\n| Gunpowder || 2\n|}",
+    ),
+]
+
+
+def write_dump(path) -> None:
+    pages = [
+        f"<page><title>{title}</title><id>{page_id}</id>"
+        f"<revision><text>{text}</text></revision></page>"
+        for page_id, title, text in PAGES
+    ]
+    pages.append(
+        '<page><title>Beta (redirect)</title><redirect title="Beta" />'
+        "<revision><text>#REDIRECT [[Beta]]</text></revision></page>"
+    )
+    path.write_text(f"<mediawiki>{''.join(pages)}</mediawiki>")
+
+
+@pytest.fixture
+def dump_corpus(tmp_path, monkeypatch):
+    def offline(*args, **kwargs):
+        raise AssertionError("network used in offline corpus mode")
+
+    monkeypatch.setattr(fetch, "throttled_get", offline)
+
+    path = tmp_path / "dump.xml"
+    write_dump(path)
+    with open_corpus(path) as corpus:
+        configure_corpus(corpus)
+        yield corpus
+        configure_corpus(None)
+
+
+def test_crawl_from_dump(dump_corpus, tmp_path, monkeypatch):
+    counts_path = tmp_path / "word-counts.json"
+    monkeypatch.setattr(CountWordsMode, "JSONPATH", counts_path)
+
+    AutoCountWordsMode(WikiPage("Root"), 2, 0, 2).run()
+
+    with open(counts_path, encoding="utf-8") as f:
+        counts = json.load(f)
+
+    assert counts["words"] == 4
+    assert counts["gunpowder"] == 1
+
+
+def test_tables_from_dump(dump_corpus):
+    pytest.importorskip("lxml")
+    tables = WikiPage("Gamma").get_tables()
+
+    assert len(tables) == 1
+    assert list(tables[0].columns) == ["Item", "Count"]
+    assert tables[0].iloc[0].tolist() == ["Gunpowder", 2]
+
+
+@pytest.mark.parametrize("processes", [0, 2])
+def test_replay_crawl_archive(fake_wiki, tmp_path, monkeypatch, processes):
+    counts_path = tmp_path / "word-counts.json"
+    monkeypatch.setattr(CountWordsMode, "JSONPATH", counts_path)
+    archive_path = tmp_path / "crawl.warc.gz"
+
+    archive = ArchiveWriter(archive_path)
+    AutoCountWordsMode(WikiPage("Root"), 2, 0, 2, archive=archive).run()
+    with open(counts_path, encoding="utf-8") as f:
+        crawled = json.load(f)
+    counts_path.unlink()
+
+    requests = list(fake_wiki.requests)
+    ReplayCountWordsMode(open_corpus(archive_path), processes=processes).run()
+    with open(counts_path, encoding="utf-8") as f:
+        assert json.load(f) == crawled
+
+    assert fake_wiki.requests == requests
+    assert len(read_index(index_path(archive_path))) == 4
@@ -0,0 +1,46 @@
+import subprocess
+import sys
+
+MAX_STARTUP_SECONDS = 0.5
+HEAVY_MODULES = ("pandas", "numpy", "matplotlib", "wordfreq")
+
+SUMMARY_STARTUP = """
+import sys, time
+start = time.perf_counter()
+from mc_wiki_scraper.cli import args
+from mc_wiki_scraper.cli.mode_builder import build_mode
+build_mode(args._build_parser().parse_args(["summary", "Bee"]))
+print(time.perf_counter() - start)
+print(" ".join(sys.modules))
+"""
+
+HELP_STARTUP = """
+import sys
+from mc_wiki_scraper.cli.scraper import Scraper
+print(" ".join(sys.modules))
+"""
+
+
+def run(script: str) -> list[str]:
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.splitlines()
+
+
+def test_summary_startup_is_fast():
+    elapsed, modules = run(SUMMARY_STARTUP)
+    modules = {name.split(".")[0] for name in modules.split()}
+
+    assert modules.isdisjoint(HEAVY_MODULES)
+    assert float(elapsed) < MAX_STARTUP_SECONDS
+
+
+def test_help_does_not_load_article_machinery():
+    (modules,) = run(HELP_STARTUP)
+    modules = {name.split(".")[0] for name in modules.split()}
+
+    assert modules.isdisjoint(HEAVY_MODULES + ("bs4", "requests"))
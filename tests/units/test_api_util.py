@@ -0,0 +1,43 @@
+from mc_wiki_scraper.wiki_page import WikiPage
+from mc_wiki_scraper.wiki_page.utils import fetch_parsed_pages, resolve_titles
+
+
+def test_resolves_normalized_titles_and_redirects(fake_api):
+    pages = fetch_parsed_pages(["alpha", "Beta_(redirect)", "Beta"], fake_api)
+
+    assert pages["alpha"].page_id == 2
+    assert pages["alpha"].title == "Alpha"
+    assert pages["Beta_(redirect)"].page_id == 3
+    assert pages["Beta"].page_id == 3
+    assert pages["Beta"].rev_id == 103
+
+
+def test_missing_page_is_none(fake_api):
+    pages = fetch_parsed_pages(["Nope", "Root"], fake_api)
+
+    assert pages["Nope"] is None
+    assert pages["Root"].page_id == 1
+
+
+def test_batches_titles(fake_api, fake_wiki, monkeypatch):
+    monkeypatch.setattr("mc_wiki_scraper.wiki_page.utils.api.MAX_TITLES", 2)
+    fetch_parsed_pages(["Root", "Alpha", "Beta", "Gamma", "Nope"], fake_api)
+
+    assert len(fake_wiki.api_requests) == 3
+
+
+def test_fetch_batch_builds_pages(fake_api):
+    root, missing = WikiPage.fetch_batch(["Root", "Nope"], fake_api)
+
+    assert missing is None
+    assert root.get_info() == (1, "Root")
+    assert root.get_paragraphs() == ["root words"]
+    assert root.get_link_phrases() == {"Alpha", "Beta"}
+
+
+def test_resolve_titles(fake_api):
+    assert resolve_titles(["beta", "Beta_(redirect)", "Nope"], fake_api) == {
+        "beta": (3, "Beta", 103),
+        "Beta_(redirect)": (3, "Beta", 103),
+        "Nope": None,
+    }
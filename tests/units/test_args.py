@@ -38,6 +38,12 @@ def test_wait_seconds_invalid(val):
         args.wait_seconds(val)
 
 
+@pytest.mark.parametrize("val", ["0", "1", "nan", "x"])
+def test_probability_invalid(val):
+    with pytest.raises(argparse.ArgumentTypeError):
+        args.probability(val)
+
+
 def test_summary_parsing():
     parser = args._build_parser()
     ns = parser.parse_args(["summary", "Bee"])
@@ -67,6 +73,23 @@ def test_analyze_freq_parsing():
     assert ns.command == "analyze-relative-word-frequency"
     assert ns.mode == "article"
     assert ns.count == 5
+    assert ns.counts is None
+
+
+def test_convert_word_counts_parsing():
+    parser = args._build_parser()
+    ns = parser.parse_args(
+        ["convert-word-counts", "word-counts.json", "word-counts.bin"]
+    )
+    assert ns.command == "convert-word-counts"
+    assert ns.source == "word-counts.json"
+    assert ns.target == "word-counts.bin"
+
+    ns = parser.parse_args(
+        ["analyze-relative-word-frequency", "--mode", "language"]
+        + ["--count", "5", "--counts", "word-counts.bin"]
+    )
+    assert ns.counts == "word-counts.bin"
 
 
 def test_auto_count_words_parsing():
@@ -84,3 +107,129 @@ def test_version_flag():
     parser = args._build_parser()
     with pytest.raises(SystemExit):
         parser.parse_args(["--version"])
+
+
+def test_auto_count_words_workers():
+    parser = args._build_parser()
+    ns = parser.parse_args(
+        ["auto-count-words", "Bee", "--depth", "1", "--wait", "0"]
+    )
+    assert ns.workers == 4
+
+    ns = parser.parse_args(
+        ["auto-count-words", "Bee", "--depth", "1", "--wait", "0"]
+        + ["--workers", "8"]
+    )
+    assert ns.workers == 8
+
+
+def test_cache_options():
+    parser = args._build_parser()
+    ns = parser.parse_args(
+        ["--cache-dir", "cache", "--offline", "summary", "Bee"]
+    )
+    assert ns.cache_dir == "cache"
+    assert ns.offline
+    assert ns.cache_size == 512
+    assert not ns.stats
+
+
+def test_store_option():
+    parser = args._build_parser()
+    ns = parser.parse_args(["count-words", "Bee"])
+    assert ns.store == "json"
+
+    ns = parser.parse_args(["count-words", "Bee", "--store", "sqlite"])
+    assert ns.store == "sqlite"
+
+
+def test_checkpoint_options():
+    parser = args._build_parser()
+    ns = parser.parse_args(
+        ["auto-count-words", "Bee", "--depth", "1", "--wait", "0"]
+    )
+    assert ns.checkpoint is None
+    assert not ns.resume
+    assert ns.commit_every == 50
+    assert not ns.resolve
+    assert ns.burst == 1
+    assert ns.seen_error_rate is None
+    assert ns.parse_processes == 0
+    assert ns.queue_depth is None
+
+    ns = parser.parse_args(
+        [
+            "auto-count-words",
+            "Bee",
+            "--depth",
+            "1",
+            "--wait",
+            "0",
+            "--checkpoint",
+            "crawl.json",
+            "--resume",
+            "--commit-every",
+            "500",
+        ]
+    )
+    assert ns.checkpoint == "crawl.json"
+    assert ns.resume
+    assert ns.commit_every == 500
+
+
+def test_distributed_count_words_parsing():
+    parser = args._build_parser()
+    ns = parser.parse_args(
+        ["distributed-count-words", "--frontier", "f.sqlite", "--wait", "0"]
+    )
+    assert ns.role == "run"
+    assert ns.phrase is None
+    assert ns.processes is None
+    assert ns.wal
+
+    ns = parser.parse_args(
+        [
+            "distributed-count-words",
+            "--frontier",
+            "f.sqlite",
+            "--wait",
+            "0",
+            "--role",
+            "work",
+            "--no-wal",
+        ]
+    )
+    assert ns.role == "work"
+    assert not ns.wal
+
+
+def test_replay_count_words_parsing():
+    parser = args._build_parser()
+    ns = parser.parse_args(
+        ["--corpus", "dump.xml", "replay-count-words", "crawl.warc.gz"]
+    )
+    assert ns.corpus == "dump.xml"
+    assert ns.path == "crawl.warc.gz"
+    assert ns.processes == 0
+
+    ns = parser.parse_args(
+        ["auto-count-words", "Bee", "--depth", "1", "--wait", "0"]
+        + ["--archive", "a.warc.gz", "--articles", "a.sqlite"]
+    )
+    assert ns.archive == "a.warc.gz"
+    assert ns.articles == "a.sqlite"
+
+
+def test_ngrams_parsing():
+    parser = args._build_parser()
+    ns = parser.parse_args(["count-words", "Bee", "--ngrams", "2", "3"])
+    assert ns.ngrams == [2, 3]
+
+    ns = parser.parse_args(
+        ["auto-count-words", "Bee", "--depth", "1", "--wait", "0"]
+    )
+    assert ns.ngrams == []
+    assert ns.ngram_error == 1e-5
+
+    with pytest.raises(SystemExit):
+        parser.parse_args(["count-words", "Bee", "--ngrams", "0"])
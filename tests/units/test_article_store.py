@@ -0,0 +1,68 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from mc_wiki_scraper.storage import ArticleCountsStore, ArticleMatrix
+
+
+@pytest.fixture
+def store(tmp_path):
+    with ArticleCountsStore(tmp_path / "articles.sqlite") as store:
+        store.record(5, "Creeper", {"creeper": 2, "explodes": 1}, 50)
+        store.record(3, "Bee", {"bee": 4, "explodes": 0})
+        store.record(9, "Empty", {})
+        store.commit()
+        yield store
+
+
+def test_record_and_replace(store):
+    assert len(store) == 3
+    assert store.get(5) == Counter({"creeper": 2, "explodes": 1})
+
+    store.record(5, "Creeper", {"creeper": 1, "hisses": 1}, 51)
+    assert store.get(5) == Counter({"creeper": 2, "explodes": 1})
+    store.commit()
+
+    assert store.get(5) == Counter({"creeper": 1, "hisses": 1})
+    assert store.get(7) is None
+    assert store.document_frequencies() == {
+        "creeper": 1,
+        "bee": 1,
+        "hisses": 1,
+    }
+
+
+def test_discard(store):
+    store.record(7, "Zombie", {"zombie": 1})
+    store.discard()
+    store.commit()
+
+    assert store.get(7) is None
+
+
+def test_matrix(store, tmp_path):
+    store.export_npz(tmp_path / "articles.npz")
+    matrix = ArticleMatrix.load(tmp_path / "articles.npz")
+
+    assert matrix.shape == (3, 3)
+    assert matrix.titles.tolist() == ["Bee", "Creeper", "Empty"]
+    assert matrix.indptr.tolist() == [0, 1, 3, 3]
+    assert matrix.row(3) == {"bee": 4}
+    assert matrix.row(9) == {}
+    with pytest.raises(KeyError):
+        matrix.row(7)
+
+    words = matrix.words.tolist()
+    totals = dict(zip(words, matrix.word_totals().tolist(), strict=True))
+    assert totals == {"creeper": 2, "explodes": 1, "bee": 4}
+    np.testing.assert_array_equal(matrix.document_frequencies(), [1, 1, 1])
+
+
+def test_scipy_reads_export(store, tmp_path):
+    sparse = pytest.importorskip("scipy.sparse")
+    store.export_npz(tmp_path / "articles.npz")
+
+    loaded = sparse.load_npz(tmp_path / "articles.npz")
+    assert loaded.shape == (3, 3)
+    assert loaded.sum() == 7
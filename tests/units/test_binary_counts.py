@@ -0,0 +1,102 @@
+import json
+
+import numpy as np
+import pytest
+
+from mc_wiki_scraper.storage import (
+    BinaryCounts,
+    binary_counts,
+    convert_json_counts,
+    is_binary_counts,
+    iter_json_counts,
+)
+
+COUNTS = {
+    "creeper": 12,
+    "zombie": 7,
+    "ánvil": 3,
+    'ender "dragon"': 7,
+    "tab\there": -1,
+    "élytra": 0,
+    "": 5,
+}
+
+
+@pytest.fixture
+def json_path(tmp_path):
+    path = tmp_path / "word-counts.json"
+    path.write_text(json.dumps(COUNTS, indent=2), encoding="utf-8")
+    return path
+
+
+@pytest.mark.parametrize("read_size", [1, 3, 1 << 20])
+def test_iter_json_counts_streams_any_chunks(
+    json_path, monkeypatch, read_size
+):
+    monkeypatch.setattr(binary_counts, "READ_SIZE", read_size)
+
+    assert dict(iter_json_counts(json_path)) == COUNTS
+
+
+@pytest.mark.parametrize("text", ["", "[]", '{"a": 1', '{"a": x}', "{1: 2}"])
+def test_iter_json_counts_rejects_other_json(tmp_path, text):
+    path = tmp_path / "bad.json"
+    path.write_text(text, encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        list(iter_json_counts(path))
+
+
+def test_lookups(json_path, tmp_path):
+    path = tmp_path / "word-counts.bin"
+    assert convert_json_counts(json_path, path) == len(COUNTS)
+    assert is_binary_counts(path)
+    assert not is_binary_counts(json_path)
+
+    counts = BinaryCounts(path)
+    assert len(counts) == len(COUNTS)
+    assert dict(counts.items()) == COUNTS
+    for word, c in COUNTS.items():
+        assert word in counts
+        assert counts[word] == c
+
+    assert "skeleton" not in counts
+    assert counts.get("skeleton") is None
+    assert counts.get("skeleton", 0) == 0
+    with pytest.raises(KeyError):
+        counts["skeleton"]
+
+    positions = counts.indices(["zombie", "skeleton", "creeper"])
+    assert positions[1] == -1
+    assert counts.words(positions[[0, 2]]).tolist() == ["zombie", "creeper"]
+
+
+def test_most_common_breaks_ties_by_word(tmp_path):
+    path = tmp_path / "word-counts.bin"
+    BinaryCounts.write(path, COUNTS.items())
+    counts = BinaryCounts(path)
+
+    assert counts.most_common(3) == [
+        ("creeper", 12),
+        ('ender "dragon"', 7),
+        ("zombie", 7),
+    ]
+    assert len(counts.most_common(100)) == len(COUNTS)
+
+
+def test_empty_file(tmp_path):
+    json_path = tmp_path / "word-counts.json"
+    json_path.write_text("{}", encoding="utf-8")
+    path = tmp_path / "word-counts.bin"
+
+    assert convert_json_counts(json_path, path) == 0
+    counts = BinaryCounts(path)
+    assert len(counts) == 0
+    assert "creeper" not in counts
+    assert counts.most_common(5) == []
+    assert counts.indices([]).dtype == np.intp
+
+
+def test_rejects_other_files(json_path):
+    with pytest.raises(ValueError, match="not a binary counts file"):
+        BinaryCounts(json_path)
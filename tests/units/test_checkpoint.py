@@ -0,0 +1,26 @@
+import json
+
+import pytest
+
+from mc_wiki_scraper.storage import CrawlCheckpoint
+
+
+def test_save_load_remove(tmp_path):
+    checkpoint = CrawlCheckpoint(tmp_path / "crawl.json")
+    assert checkpoint.load() is None
+
+    checkpoint.save({"frontier": [["Bee", 1]]})
+    checkpoint.save({"frontier": [["Bee", 1], ["Hive", 2]]})
+    assert checkpoint.load() == {"frontier": [["Bee", 1], ["Hive", 2]]}
+    assert list(tmp_path.iterdir()) == [checkpoint.path]
+
+    checkpoint.remove()
+    assert checkpoint.load() is None
+
+
+def test_rejects_other_versions(tmp_path):
+    path = tmp_path / "crawl.json"
+    path.write_text(json.dumps({"version": 0}), encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        CrawlCheckpoint(path).load()
@@ -0,0 +1,53 @@
+from pathlib import Path
+
+import pytest
+
+from mc_wiki_scraper.wiki_page import WikiPage
+from mc_wiki_scraper.wiki_page.utils import extract_content_html, make_soup
+
+TEST_FILES = Path(__file__).parent.parent / "test_files"
+
+
+def test_extracts_nested_content():
+    html = (
+        "<div id='nav'><div>menu</div></div>"
+        '<div id="mw-content-text" class="mw-body-content">'
+        "<div class='mw-parser-output'><div><p>Text</p></div></div>"
+        "</div><div id='footer'>footer</div>"
+    )
+    assert extract_content_html(html) == (
+        '<div id="mw-content-text" class="mw-body-content">'
+        "<div class='mw-parser-output'><div><p>Text</p></div></div>"
+        "</div>"
+    )
+
+
+def test_ignores_divs_in_comments():
+    html = (
+        '<div id="mw-content-text"><!-- <div> --><p>Text</p></div>'
+        "<p>Footer</p>"
+    )
+    assert extract_content_html(html) == (
+        '<div id="mw-content-text"><!-- <div> --><p>Text</p></div>'
+    )
+
+
+def test_missing_or_unclosed_content_returns_none():
+    assert extract_content_html("<div id='other'></div>") is None
+    assert extract_content_html('<div id="mw-content-text"><div>') is None
+
+
+def test_missing_article_detected():
+    html = (
+        '<div id="mw-content-text">'
+        '<div class="noarticletext mw-content-ltr"><p>None</p></div></div>'
+    )
+    assert WikiPage.from_html("Nope", html).get_content() is None
+
+
+@pytest.mark.parametrize("name", ["Bee.html", "Creeper.html"])
+def test_same_content_as_full_parse(name):
+    html = (TEST_FILES / name).read_text(encoding="utf-8")
+    full = make_soup(html).select_one(WikiPage.CONTENT_TAG)
+
+    assert str(WikiPage.from_html(name, html).get_content()) == str(full)
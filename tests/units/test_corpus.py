@@ -0,0 +1,234 @@
+import gzip
+
+import pytest
+
+from mc_wiki_scraper.corpus import (
+    ArchiveWriter,
+    HtmlDirCorpus,
+    WarcCorpus,
+    XmlDumpCorpus,
+    index_path,
+    iter_records,
+    open_corpus,
+    read_index,
+    wikitext_to_html,
+)
+from mc_wiki_scraper.wiki_page.utils import (
+    extract_id_and_title,
+    extract_revision_id,
+)
+
+BASE_URL = "https://minecraft.wiki/w/"
+
+
+def warc_record(uri: str, http: bytes, warc_type: str = "response") -> bytes:
+    head = (
+        f"WARC/1.0\r\nWARC-Type: {warc_type}\r\n"
+        f"WARC-Target-URI: {uri}\r\n"
+        f"Content-Type: application/http; msgtype={warc_type}\r\n"
+        f"Content-Length: {len(http)}\r\n\r\n"
+    )
+    return head.encode() + http + b"\r\n\r\n"
+
+
+def http_response(body: bytes, status: str = "200 OK", headers=()) -> bytes:
+    lines = [f"HTTP/1.1 {status}", *headers]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode() + body
+
+
+def write_warc(path, compressed: bool) -> None:
+    records = [
+        warc_record(BASE_URL + "Creeper", b"GET /w/Creeper", "request"),
+        warc_record(
+            BASE_URL + "Creeper",
+            http_response(
+                gzip.compress(b"<p>hiss</p>"),
+                headers=["Content-Encoding: gzip"],
+            ),
+        ),
+        warc_record(
+            BASE_URL + "Zombie",
+            http_response(
+                b"5\r\n<p>gr\r\n6\r\nr!</p>\r\n0\r\n\r\n",
+                headers=["Transfer-Encoding: chunked"],
+            ),
+        ),
+        warc_record(
+            BASE_URL + "Creepers",
+            http_response(b"", "301 Moved", [f"Location: {BASE_URL}Creeper"]),
+        ),
+    ]
+    with open(path, "wb") as f:
+        if compressed:
+            # The request and the response share the first member.
+            f.write(gzip.compress(records[0] + records[1]))
+            for record in records[2:]:
+                f.write(gzip.compress(record))
+        else:
+            f.write(b"".join(records))
+
+
+@pytest.mark.parametrize("name", ["pages.warc", "pages.warc.gz"])
+def test_warc_corpus(tmp_path, name):
+    path = tmp_path / name
+    write_warc(path, name.endswith(".gz"))
+
+    with open_corpus(path) as corpus:
+        assert isinstance(corpus, WarcCorpus)
+        assert corpus.titles() == ["Creeper", "Zombie"]
+        assert corpus.get("creeper") == "<p>hiss</p>"
+        assert corpus.get("Creepers") == "<p>hiss</p>"
+        assert corpus.fetch(BASE_URL + "Zombie") == "<p>grr!</p>"
+        assert corpus.get("Skeleton") is None
+
+    assert len(list(iter_records(path))) == 4
+
+
+@pytest.mark.parametrize("name", ["pages.warc", "pages.warc.gz"])
+def test_warc_corpus_reads_last_record(tmp_path, name):
+    records = [
+        warc_record(BASE_URL + "Creeper", http_response(b"<p>old</p>")),
+        warc_record(
+            BASE_URL + "Creepers",
+            http_response(b"", "301 Moved", [f"Location: {BASE_URL}Creeper"]),
+        ),
+        warc_record(BASE_URL + "Creeper", http_response(b"<p>new</p>")),
+        warc_record(BASE_URL + "Creepers", http_response(b"<p>own</p>")),
+    ]
+    path = tmp_path / name
+    with open(path, "wb") as f:
+        for record in records:
+            f.write(gzip.compress(record) if name.endswith(".gz") else record)
+
+    with open_corpus(path) as corpus:
+        assert corpus.titles() == ["Creeper", "Creepers"]
+        assert corpus.get("Creeper") == "<p>new</p>"
+        assert corpus.get("Creepers") == "<p>own</p>"
+
+
+def test_html_dir_corpus(tmp_path):
+    (tmp_path / "Iron_Golem.html").write_text("<p>golem</p>")
+    (tmp_path / "Ender%20Pearl.html").write_text("<p>pearl</p>")
+    (tmp_path / "notes.txt").write_text("ignored")
+
+    corpus = open_corpus(tmp_path)
+
+    assert isinstance(corpus, HtmlDirCorpus)
+    assert sorted(corpus.titles()) == ["Ender_Pearl", "Iron_Golem"]
+    assert corpus.get("iron Golem") == "<p>golem</p>"
+    assert dict(corpus)["Ender_Pearl"] == "<p>pearl</p>"
+
+
+XML_DUMP = """<mediawiki xmlns="http://www.mediawiki.org/xml/export-0.11/">
+  <page>
+    <title>Iron Golem</title>
+    <ns>0</ns>
+    <id>42</id>
+    <revision>
+      <id>7</id>
+      <text>{{{{Infobox|x=1}}}}An '''[[Iron Ingot|iron]]''' mob.
+&lt;!-- hidden --&gt;&lt;ref&gt;note&lt;/ref&gt;
+
+== Drops ==
+* [[Poppy]]
+[[Category:Mobs]]</text>
+    </revision>
+  </page>
+  <page>
+    <title>Golem</title>
+    <ns>0</ns>
+    <id>43</id>
+    <redirect title="Iron Golem" />
+    <revision><id>8</id><text>#REDIRECT [[Iron Golem]]</text></revision>
+  </page>
+</mediawiki>
+"""
+
+
+def test_xml_dump_corpus(tmp_path):
+    path = tmp_path / "dump.xml"
+    path.write_text(XML_DUMP, encoding="utf-8")
+
+    with open_corpus(path) as corpus:
+        assert isinstance(corpus, XmlDumpCorpus)
+        assert corpus.titles() == ["Iron_Golem"]
+        html = corpus.get("Golem")
+
+    assert extract_id_and_title(html) == (42, "Iron_Golem")
+    assert '<a href="/w/Iron_Ingot">iron</a>' in html
+    assert '<a href="/w/Poppy">Poppy</a>' in html
+    assert "<h2>Drops</h2>" in html
+    for dropped in ("Infobox", "hidden", "note", "Category"):
+        assert dropped not in html
+
+
+def test_xml_dump_reads_latest_revision(tmp_path):
+    path = tmp_path / "dump.xml"
+    path.write_text(
+        "<mediawiki><page><title>Bee</title><id>5</id>"
+        "<revision><id>1</id><text>Old [[Honey]] text</text></revision>"
+        "<revision><id>2</id><text>New [[Pollen]] text</text></revision>"
+        "</page></mediawiki>",
+        encoding="utf-8",
+    )
+
+    with open_corpus(path) as corpus:
+        html = corpus.get("Bee")
+
+    assert "Pollen" in html
+    assert "Honey" not in html
+
+
+def test_wikitext_table():
+    html = wikitext_to_html(
+        '{| class="wikitable"\n'
+        "|+ Drops\n"
+        "! Item !! Count\n"
+        "|-\n"
+        '| rowspan="2" | [[Iron Ingot]] || 3\n'
+        "|-\n"
+        "| 5\n"
+        "|}"
+    )
+
+    assert html == (
+        '<table class="wikitable"><caption>Drops</caption>'
+        "<tr><th>Item</th><th>Count</th></tr>"
+        '<tr><td rowspan="2"><a href="/w/Iron_Ingot">Iron Ingot</a></td>'
+        "<td>3</td></tr>"
+        "<tr><td>5</td></tr></table>"
+    )
+
+
+def test_unknown_corpus_type(tmp_path):
+    with pytest.raises(ValueError):
+        open_corpus(tmp_path / "pages.zip")
+
+
+def test_archive_writer(tmp_path):
+    path = tmp_path / "crawl.warc.gz"
+    with ArchiveWriter(path) as archive:
+        archive.write("Creeper", "<p>hiss</p>", 7, "Creeper", 70)
+        archive.write("zombie", "<p>grr</p>", 8, "Zombie")
+
+    # A record cut short by a crash is not indexed, and is cut off.
+    with open(path, "ab") as f:
+        f.write(b"\x1f\x8b partial")
+    with ArchiveWriter(path) as archive:
+        archive.write("Creepers", "<p>hiss</p>", 7, "Creeper", 71)
+
+    entries = read_index(index_path(path))
+    assert [e.title for e in entries] == ["Creeper", "Zombie", "Creeper"]
+    assert entries[0].rev_id == 70
+    assert entries[2].offset == entries[1].offset + entries[1].length
+    assert path.stat().st_size == entries[2].offset + entries[2].length
+
+    with open_corpus(path) as corpus:
+        assert corpus.titles() == ["Creeper", "Zombie"]
+        html = corpus.get("Creepers")
+
+    # The page was archived again, so the later copy is read.
+    assert html.endswith("<p>hiss</p>")
+    assert extract_id_and_title(html) == (7, "Creeper")
+    assert extract_revision_id(html) == 71
+    assert len(list(iter_records(path))) == 3
@@ -0,0 +1,109 @@
+import json
+from collections import Counter
+
+import pytest
+
+from mc_wiki_scraper.storage import JsonCountsStore, SqliteCountsStore, counts
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def make_store(request, tmp_path):
+    def make(flush_every=1):
+        if request.param == "json":
+            return JsonCountsStore(tmp_path / "counts.json", flush_every)
+        return SqliteCountsStore(tmp_path / "counts.sqlite", flush_every)
+
+    return make
+
+
+def test_merges_counts(make_store):
+    with make_store() as store:
+        store.merge(Counter({"foo": 1, "bar": 2}))
+        store.merge(Counter({"foo": 3}))
+
+    with make_store() as store:
+        assert store.load() == {"foo": 4, "bar": 2}
+
+
+def test_negative_counts_remove_words(make_store):
+    with make_store() as store:
+        store.merge({"foo": 2, "bar": 1})
+        store.merge({"foo": -1, "bar": -1})
+
+    with make_store() as store:
+        assert store.load() == {"foo": 1}
+
+
+def test_buffers_until_flush_every(make_store):
+    store = make_store(flush_every=3)
+    store.merge({"foo": 1})
+    store.merge({"foo": 1})
+    assert make_store()._read() == {}
+
+    store.merge({"foo": 1})
+    assert make_store()._read() == {"foo": 3}
+    store.close()
+
+
+def test_export_json(make_store, tmp_path):
+    with make_store() as store:
+        store.merge({"zażółć": 2, "foo": 1})
+        store.export_json(tmp_path / "export.json")
+
+    with open(tmp_path / "export.json", encoding="utf-8") as f:
+        assert json.load(f) == {"zażółć": 2, "foo": 1}
+
+
+def test_sqlite_imports_and_exports_json(tmp_path):
+    json_path = tmp_path / "word-counts.json"
+    json_path.write_text('{"foo": 1}', encoding="utf-8")
+
+    with SqliteCountsStore(
+        tmp_path / "counts.sqlite", export_path=json_path
+    ) as store:
+        store.merge({"foo": 1, "bar": 1})
+
+    with open(json_path, encoding="utf-8") as f:
+        assert json.load(f) == {"foo": 2, "bar": 1}
+
+
+def test_commit_seq_counts_batches(make_store):
+    with make_store(flush_every=None) as store:
+        assert store.commit_seq == 0
+        store.merge({"foo": 1})
+        store.merge({"foo": 1})
+        assert store.buffered == {"foo": 2}
+        store.flush()
+        store.flush()
+        assert store.commit_seq == 1
+
+    store = make_store()
+    assert store.commit_seq == 1
+    assert store.load() == {"foo": 2}
+
+
+@pytest.mark.parametrize("crash_at", [1, 2])
+def test_json_seq_matches_written_counts(tmp_path, monkeypatch, crash_at):
+    path = tmp_path / "counts.json"
+    with JsonCountsStore(path) as store:
+        store.merge({"foo": 1})
+
+    # The process dies while the next batch and its number are written.
+    replace = counts.os.replace
+    calls = []
+
+    def crash(src, dst):
+        calls.append(dst)
+        if len(calls) == crash_at:
+            raise KeyboardInterrupt
+        replace(src, dst)
+
+    monkeypatch.setattr(counts.os, "replace", crash)
+    store = JsonCountsStore(path)
+    with pytest.raises(KeyboardInterrupt):
+        store.merge({"foo": 1})
+    monkeypatch.undo()
+
+    store = JsonCountsStore(path)
+    assert store.commit_seq == 1
+    assert store.load() == {"foo": 1}
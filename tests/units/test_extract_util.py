@@ -0,0 +1,62 @@
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+from mc_wiki_scraper.wiki_page import WikiPage
+from mc_wiki_scraper.wiki_page.utils import (
+    extract_all,
+    extract_internal_link_phrases,
+    extract_paragraphs,
+    extract_word_counts,
+)
+
+TEST_FILES = Path(__file__).parent.parent / "test_files"
+
+
+def make_tag(html: str):
+    """Helper to create a bs4 Tag from HTML string."""
+    return BeautifulSoup(html, "html.parser")
+
+
+def test_extracts_everything_in_one_pass():
+    html = """
+    <div>
+        <p>Main <a href="/w/Foo">Foo</a> paragraph.</p>
+        <div class="navbox"><p>Navbox <a href="/w/Bar">bar</a>.</p></div>
+        <p> </p>
+        <a href="https://example.com">External</a>
+    </div>
+    """
+    data = extract_all(make_tag(html))
+
+    assert data.paragraphs == ["Main Foo paragraph."]
+    assert data.link_phrases == {"Foo", "Bar"}
+    assert data.word_counts["paragraph"] == 1
+    assert data.word_counts["navbox"] == 1
+    assert data.word_counts["external"] == 1
+
+
+def test_only_requested_data():
+    data = extract_all(make_tag("<p>Foo</p>"), paragraphs=False, links=False)
+
+    assert data.paragraphs is None
+    assert data.link_phrases is None
+    assert data.word_counts == {"foo": 1}
+
+
+def test_nested_paragraphs_in_document_order():
+    html = "<div><p>Outer <p>inner</p></p></div>"
+    tag = make_tag(html)
+
+    assert extract_all(tag).paragraphs == extract_paragraphs(tag)
+
+
+@pytest.mark.parametrize("name", ["Bee.html", "Creeper.html"])
+def test_same_as_separate_extractors(name):
+    content = WikiPage(html_file=TEST_FILES / name).get_content()
+    data = extract_all(content)
+
+    assert data.paragraphs == extract_paragraphs(content)
+    assert data.link_phrases == extract_internal_link_phrases(content)
+    assert data.word_counts == extract_word_counts(content)
@@ -0,0 +1,139 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from mc_wiki_scraper.wiki_page.utils import (
+    HttpCache,
+    configure_cache,
+    fetch_html,
+)
+
+ETAG = '"rev-1"'
+
+
+class Handler(BaseHTTPRequestHandler):
+    requests: list[dict] = []
+
+    def do_GET(self):
+        Handler.requests.append(dict(self.headers))
+
+        if self.path == "/missing":
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        body = f"<p>page {self.path}</p>".encode()
+        self.send_response(200)
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    Handler.requests = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(
+        target=httpd.serve_forever, args=(0.01,), daemon=True
+    )
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture(autouse=True)
+def no_cache():
+    yield
+    configure_cache(None)
+
+
+def test_revalidates_cached_page(server, tmp_path):
+    configure_cache(tmp_path)
+
+    first = fetch_html(f"{server}/Bee")
+    second = fetch_html(f"{server}/Bee")
+
+    assert first == second == "<p>page /Bee</p>"
+    assert "If-None-Match" not in Handler.requests[0]
+    assert Handler.requests[1]["If-None-Match"] == ETAG
+
+
+def test_offline_serves_only_from_cache(server, tmp_path):
+    configure_cache(tmp_path)
+    fetch_html(f"{server}/Bee")
+
+    configure_cache(tmp_path, offline=True)
+    assert fetch_html(f"{server}/Bee") == "<p>page /Bee</p>"
+    assert fetch_html(f"{server}/Creeper") is None
+    assert len(Handler.requests) == 1
+
+
+def test_missing_page_not_cached(server, tmp_path):
+    cache = configure_cache(tmp_path)
+
+    assert fetch_html(f"{server}/missing") is None
+    assert cache.get(f"{server}/missing") is None
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = HttpCache(tmp_path, max_bytes=25)
+
+    cache.put("a", "x" * 10)
+    cache.put("b", "y" * 10)
+    _set_mtime(cache, "a", 2000)
+    _set_mtime(cache, "b", 1000)
+
+    cache.put("c", "z" * 10)
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+def test_evicts_below_the_limit(tmp_path, monkeypatch):
+    cache = HttpCache(tmp_path, max_bytes=1000)
+    scans = []
+    bodies = cache._bodies
+    monkeypatch.setattr(cache, "_bodies", lambda: scans.append(1) or bodies())
+
+    for i in range(120):
+        cache.put(str(i), "x" * 10)
+        os.utime(cache._paths(str(i))[0], (i, i))
+
+    assert len(scans) == 2
+    assert cache._size <= 1000
+    assert cache.get("0") is None
+    assert cache.get("119") is not None
+
+
+def test_temp_files_are_per_process(tmp_path, monkeypatch):
+    replaced = []
+    replace = os.replace
+
+    def record(src, dst):
+        replaced.append(src.name)
+        replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", record)
+    HttpCache(tmp_path).put("a", "x")
+
+    assert replaced
+    assert all(f".{os.getpid()}." in name for name in replaced)
+    assert not list(tmp_path.glob("*/*.tmp"))
+
+
+def _set_mtime(cache, url, mtime):
+    body_path, _ = cache._paths(url)
+    os.utime(body_path, (mtime, mtime))
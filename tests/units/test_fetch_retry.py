@@ -0,0 +1,89 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from mc_wiki_scraper.wiki_page.utils import (
+    configure_rate_limit,
+    configure_session,
+    fetch_html,
+    get_fetch_stats,
+    get_rate_limiter,
+    throttle,
+)
+from mc_wiki_scraper.wiki_page.utils import fetch as fetch_module
+
+
+class Handler(BaseHTTPRequestHandler):
+    failures: list[tuple[int, dict]] = []
+    requests = 0
+
+    def do_GET(self):
+        Handler.requests += 1
+
+        if Handler.failures:
+            status, headers = Handler.failures.pop(0)
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = b"<p>ok</p>"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    Handler.failures = []
+    Handler.requests = 0
+    monkeypatch.setattr(fetch_module, "BACKOFF_SECONDS", 0.01)
+    monkeypatch.setattr(throttle, "MIN_BACKOFF_INTERVAL", 0.01)
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(
+        target=httpd.serve_forever, args=(0.01,), daemon=True
+    )
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+    configure_rate_limit(None)
+
+
+def test_retries_after_too_many_requests(server):
+    limiter = configure_rate_limit(0)
+    Handler.failures = [(429, {"Retry-After": "0"}), (503, {})]
+
+    assert fetch_html(f"{server}/page") == "<p>ok</p>"
+    assert Handler.requests == 3
+    assert get_rate_limiter() is limiter
+    assert limiter.interval > 0
+
+
+def test_gives_up_after_max_retries(server, monkeypatch):
+    monkeypatch.setattr(fetch_module, "MAX_RETRIES", 2)
+    Handler.failures = [(500, {})] * 5
+
+    with pytest.raises(fetch_module.HTTPError):
+        fetch_html(f"{server}/page")
+    assert Handler.requests == 3
+
+
+def test_session_reuses_connections(server):
+    configure_session(pool_size=2)
+
+    for _ in range(5):
+        assert fetch_html(f"{server}/page") == "<p>ok</p>"
+
+    stats = get_fetch_stats()
+    assert stats.requests == 5
+    assert stats.connections == 1
+    assert stats.reuse_rate == pytest.approx(0.8)
@@ -0,0 +1,65 @@
+import pytest
+
+from mc_wiki_scraper.storage import BloomFilter, Frontier
+from mc_wiki_scraper.storage import frontier as frontier_module
+
+
+def test_fifo_order():
+    frontier = Frontier([("Bee", 0), ("Żaba", 1)])
+    frontier.append(("Bee_nest", 2))
+
+    assert len(frontier) == 3
+    assert frontier[0] == ("Bee", 0)
+    assert list(frontier) == [("Bee", 0), ("Żaba", 1), ("Bee_nest", 2)]
+    assert frontier.popleft() == ("Bee", 0)
+    assert frontier.popleft() == ("Żaba", 1)
+    assert frontier.popleft() == ("Bee_nest", 2)
+
+    with pytest.raises(IndexError):
+        frontier.popleft()
+
+
+def test_compacts_popped_entries(monkeypatch):
+    monkeypatch.setattr(frontier_module, "COMPACT_MIN_ENTRIES", 4)
+    frontier = Frontier((f"Page_{i}", i % 3) for i in range(10))
+
+    popped = [frontier.popleft() for _ in range(6)]
+    frontier.append(("Last", 5))
+
+    assert popped[-1] == ("Page_5", 2)
+    assert frontier._head < 6
+    assert list(frontier) == [
+        ("Page_6", 0),
+        ("Page_7", 1),
+        ("Page_8", 2),
+        ("Page_9", 0),
+        ("Last", 5),
+    ]
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, 0.01)
+    words = [f"Page_{i}" for i in range(1000)]
+    for word in words:
+        bloom.add(word)
+
+    assert all(word in bloom for word in words)
+    false_positives = sum(f"Other_{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+    assert bloom.nbytes < 1300
+
+
+def test_bloom_filter_state_round_trip():
+    bloom = BloomFilter(100, 0.01)
+    bloom.add("Bee")
+
+    restored = BloomFilter.from_state(bloom.to_state())
+    assert "Bee" in restored
+    assert "Hive" not in restored
+    assert len(restored) == 1
+
+
+@pytest.mark.parametrize("capacity, error_rate", [(0, 0.1), (10, 0), (10, 1)])
+def test_bloom_filter_rejects_bad_parameters(capacity, error_rate):
+    with pytest.raises(ValueError):
+        BloomFilter(capacity, error_rate)
@@ -1,4 +1,11 @@
-from mc_wiki_scraper.wiki_page.utils import extract_id_and_title
+from pathlib import Path
+
+from mc_wiki_scraper.wiki_page.utils import (
+    extract_id_and_title,
+    extract_revision_id,
+)
+
+TEST_FILES = Path(__file__).parent.parent / "test_files"
 
 
 def test_extracts_id_and_title_correctly():
@@ -39,3 +46,10 @@ def test_canonical_title_used_if_page_name_missing():
     """
     result = extract_id_and_title(html)
     assert result == (67890, "Creeper")
+
+
+def test_extracts_revision_id():
+    html = (TEST_FILES / "Creeper.html").read_text(encoding="utf-8")
+
+    assert extract_revision_id(html) == 3395283
+    assert extract_revision_id("<p>no script</p>") is None
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from wordfreq import top_n_list, word_frequency
+
+from mc_wiki_scraper.storage import LangFrequencyIndex
+
+
+def test_matches_wordfreq():
+    index = LangFrequencyIndex.build("en", 100)
+
+    words = top_n_list("en", 100)
+    freqs = {w: word_frequency(w, "en") for w in words}
+    top = max(freqs.values())
+
+    assert index.as_dict() == {w: f / top for w, f in freqs.items()}
+
+
+def test_built_once_then_loaded(tmp_path, monkeypatch):
+    first = LangFrequencyIndex.get("en", 50, tmp_path)
+
+    def fail(*args):
+        raise AssertionError("index rebuilt")
+
+    monkeypatch.setattr(LangFrequencyIndex, "build", fail)
+    second = LangFrequencyIndex.get("en", 50, tmp_path)
+
+    assert second.as_dict() == first.as_dict()
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_rejects_other_versions(tmp_path):
+    path = tmp_path / "index.npz"
+    np.savez(path, version=0, words=np.array(["a"]), freqs=np.array([1.0]))
+
+    with pytest.raises(ValueError):
+        LangFrequencyIndex.load(path)
+
+
+@pytest.mark.parametrize("data", [b"", b"not an archive", b"PK\x03\x04"])
+def test_rebuilds_corrupt_index(tmp_path, data):
+    expected = LangFrequencyIndex.get("en", 20, tmp_path)
+    (path,) = tmp_path.iterdir()
+    path.write_bytes(data)
+
+    assert LangFrequencyIndex.get("en", 20, tmp_path).as_dict() == (
+        expected.as_dict()
+    )
+    assert LangFrequencyIndex.load(path).as_dict() == expected.as_dict()
+
+
+def test_unsaved_index_is_returned(tmp_path, monkeypatch):
+    def fail(self, path):
+        raise PermissionError(path)
+
+    monkeypatch.setattr(LangFrequencyIndex, "save", fail)
+    index = LangFrequencyIndex.get("en", 20, tmp_path)
+
+    assert len(index.words) == 20
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,22 @@
+from mc_wiki_scraper.storage import PageLedger
+
+
+def test_record_returns_change(tmp_path):
+    with PageLedger(tmp_path / "ledger.sqlite") as ledger:
+        delta = ledger.record(1, "Bee", 10, {"bee": 2, "honey": 1}, ["Hive"])
+        assert delta == {"bee": 2, "honey": 1}
+        ledger.commit(1, delta)
+
+        delta = ledger.record(1, "Bee", 11, {"bee": 3, "pollen": 1})
+        assert delta == {"bee": 1, "honey": -1, "pollen": 1}
+        assert ledger.revisions() == {1: 11}
+        ledger.discard()
+
+    with PageLedger(tmp_path / "ledger.sqlite") as ledger:
+        entry = ledger.get(1)
+        assert entry.rev_id == 10
+        assert entry.links == ["Hive"]
+        assert ledger.revisions() == {1: 10}
+        assert ledger.commit_seq == 1
+        assert ledger.pending == {"bee": 2, "honey": 1}
+        assert ledger.get(2) is None
@@ -0,0 +1,39 @@
+import pytest
+
+from mc_wiki_scraper.wiki_page.utils import (
+    canonicalize_phrase,
+    normalize_phrase_from_href,
+)
+
+
+@pytest.mark.parametrize(
+    "href, expected",
+    [
+        ("/w/Bee", "Bee"),
+        ("/w/Bee#Behavior", "Bee"),
+        ("/w/Bee?action=edit", None),
+        ("/w/File:Bee.png", None),
+        ("https://example.com/w/Bee", None),
+    ],
+)
+def test_normalize_phrase_from_href(href, expected):
+    assert normalize_phrase_from_href(href) == expected
+
+
+@pytest.mark.parametrize(
+    "phrase",
+    [
+        "Bee_nest",
+        "bee_nest",
+        "Bee nest",
+        "Bee__nest",
+        "Bee%20nest",
+        "_Bee_nest",
+    ],
+)
+def test_canonicalize_phrase(phrase):
+    assert canonicalize_phrase(phrase) == "Bee_nest"
+
+
+def test_canonicalize_keeps_non_ascii():
+    assert canonicalize_phrase("%C5%BCaba") == "Żaba"
@@ -0,0 +1,48 @@
+import random
+from collections import Counter
+
+import pytest
+
+from mc_wiki_scraper.storage import LossyCounter
+
+
+def test_small_stream_is_exact():
+    counter = LossyCounter(0.01)
+    counter.update({"iron golem": 2, "snow golem": 1})
+    counter.update({"iron golem": 1})
+
+    assert counter.total == 4
+    assert counter.spill() == Counter({"iron golem": 3, "snow golem": 1})
+    assert len(counter) == 0
+    assert counter.total == 0
+
+
+def test_error_and_memory_are_bounded():
+    rng = random.Random(0)
+    counter = LossyCounter(0.001)
+    true_counts: Counter = Counter()
+
+    for _ in range(200):
+        counts = Counter(f"w{int(rng.paretovariate(1.0))}" for _ in range(500))
+        true_counts.update(counts)
+        counter.update(counts)
+        assert len(counter) < 1000
+
+    spilled = counter.spill()
+    bound = 0.001 * true_counts.total()
+    assert len(spilled) < len(true_counts)
+    for item, c in true_counts.items():
+        assert c - bound <= spilled.get(item, 0) <= c
+
+
+def test_invalid_error():
+    with pytest.raises(ValueError):
+        LossyCounter(0)
+
+
+def test_rare_strings_are_dropped():
+    counter = LossyCounter(0.1)
+    for i in range(30):
+        counter.update({"iron golem": 1, f"rare {i}": 1})
+
+    assert counter.spill() == Counter({"iron golem": 30})
@@ -0,0 +1,84 @@
+import pytest
+
+from mc_wiki_scraper.wiki_page import WikiPage
+from mc_wiki_scraper.wiki_page.utils import (
+    extract_all,
+    extract_all_lxml,
+    find_lxml,
+    make_soup,
+    parse_lxml,
+)
+
+pytest.importorskip("lxml")
+
+SNIPPETS = [
+    "<p>Creepers <b>explode</b>   <i>near</i> players.</p>",
+    "<p>\n  Spaced\t<b>out</b>\n</p><p>  </p><p>Next</p>",
+    "<p>Before<!-- note -->after, <script>var x = 1;</script>done</p>",
+    "<p><ruby>漢<rp>(</rp><rt>kan</rt><rp>)</rp></ruby> text</p>",
+    "<pre>  keep\n\n  this  </pre><p>a<style>p {}</style>b</p>",
+    "<table><tr><td><p>In a table</p></td></tr></table><p>Main</p>",
+    '<div class="navbox x"><p>Skipped</p></div><p>Kept</p>',
+    '<p>See <a href="/w/Iron_Ingot#Uses">iron</a> and '
+    '<a href="/w/File:Bee.png">a file</a>, <a>none</a>.</p>',
+    "<p>Unclosed <b>tags<p>and more &amp; entities &eacute;</p>",
+    "<template><p>Hidden</p></template><p>Shown</p>",
+]
+
+
+def wrap(body):
+    return (
+        '<html><body><div id="mw-content-text">'
+        f'<div class="mw-parser-output">{body}</div></div></body></html>'
+    )
+
+
+@pytest.mark.parametrize("body", SNIPPETS)
+def test_same_as_bs4(body):
+    html = wrap(body)
+    soup = make_soup(html, "lxml")
+    content = soup.select_one(WikiPage.CONTENT_TAG)
+    root = parse_lxml(html)
+    element = find_lxml(root, WikiPage.CONTENT_XPATH)
+
+    expected = extract_all(content, ngrams=(2,))
+    assert extract_all_lxml(element, ngrams=(2,)) == expected
+
+
+def test_only_requested_data():
+    element = find_lxml(parse_lxml(wrap(SNIPPETS[0])), WikiPage.CONTENT_XPATH)
+    data = extract_all_lxml(element, paragraphs=False, links=False)
+
+    assert data.paragraphs is None
+    assert data.link_phrases is None
+    assert data.word_counts["creepers"] == 1
+    assert data.ngram_counts is None
+
+
+def test_page_uses_lxml_tree():
+    page = WikiPage.from_html("Creeper", wrap(SNIPPETS[0]))
+    page.parser = "lxml"
+
+    assert page.get_paragraphs() == ["Creepers explode near players."]
+    assert page._content is None
+
+    page.parser = "html.parser"
+    assert page.get_paragraphs() == ["Creepers explode near players."]
+
+
+def test_missing_article():
+    html = '<div id="mw-content-text"><div class="noarticletext"></div></div>'
+    page = WikiPage.from_html("Nothing", html)
+    page.parser = "lxml"
+
+    assert page.extract() is None
+    assert page.get_word_counts() is None
+
+
+def test_content_not_found():
+    page = WikiPage.from_html("Broken", "<p>No content here</p>")
+    page.parser = "lxml"
+
+    with pytest.raises(RuntimeError):
+        page.extract()
+    assert parse_lxml("") is None
@@ -0,0 +1,59 @@
+from collections import Counter
+
+import pytest
+from bs4 import BeautifulSoup
+
+from mc_wiki_scraper.wiki_page.utils import (
+    count_ngrams,
+    extract_all,
+    extract_ngram_counts,
+)
+
+
+def test_bigrams_and_trigrams():
+    counts = count_ngrams(["The Iron Golem drops iron"], (2, 3))
+
+    assert counts == Counter(
+        {
+            "the iron": 1,
+            "iron golem": 1,
+            "golem drops": 1,
+            "drops iron": 1,
+            "the iron golem": 1,
+            "iron golem drops": 1,
+            "golem drops iron": 1,
+        }
+    )
+
+
+def test_ngrams_span_pieces_but_not_punctuation():
+    texts = ["An iron ", "golem, a", "snow golem", " 3 times"]
+    counts = count_ngrams(texts, (2,))
+
+    assert counts == Counter(
+        {"an iron": 1, "iron golem": 1, "a snow": 1, "snow golem": 1}
+    )
+
+
+def test_words_with_digits_break_ngrams():
+    counts = count_ngrams(["mother-in-law foo123 it's here"], (2,))
+
+    assert counts == Counter({"it's here": 1})
+
+
+def test_extract_ngram_counts_matches_extract_all():
+    soup = BeautifulSoup(
+        "<div><p>The <a href='/w/Iron_Golem'>iron golem</a> spawns."
+        "</p><p>Iron golems spawn in villages.</p></div>",
+        "html.parser",
+    )
+
+    counts = extract_ngram_counts(soup.div, (2, 3))
+    assert counts["the iron golem"] == 1
+    assert counts["spawns iron"] == 0
+    assert extract_all(soup.div, ngrams=(2, 3)).ngram_counts == counts
+
+
+def test_invalid_size():
+    with pytest.raises(ValueError):
+        count_ngrams(["a b"], (0,))
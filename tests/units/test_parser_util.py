@@ -0,0 +1,39 @@
+from pathlib import Path
+
+import pytest
+
+from mc_wiki_scraper.wiki_page import WikiPage
+from mc_wiki_scraper.wiki_page.utils import (
+    available_parsers,
+    make_soup,
+    resolve_parser,
+)
+
+TEST_FILES = Path(__file__).parent.parent / "test_files"
+
+
+def test_html_parser_always_available():
+    assert "html.parser" in available_parsers()
+    assert resolve_parser() == available_parsers()[0]
+
+
+def test_unknown_parser_rejected():
+    with pytest.raises(ValueError):
+        resolve_parser("selectolax")
+
+
+def test_make_soup():
+    soup = make_soup("<p>Foo</p>", "html.parser")
+    assert soup.p.get_text() == "Foo"
+
+
+@pytest.mark.parametrize("name", ["Bee.html", "Creeper.html"])
+def test_lxml_extracts_same_as_html_parser(name):
+    pytest.importorskip("lxml")
+
+    slow = WikiPage(html_file=TEST_FILES / name, parser="html.parser")
+    fast = WikiPage(html_file=TEST_FILES / name, parser="lxml")
+
+    assert fast.get_paragraphs() == slow.get_paragraphs()
+    assert fast.get_link_phrases() == slow.get_link_phrases()
+    assert fast.get_word_counts() == slow.get_word_counts()
@@ -0,0 +1,77 @@
+import threading
+
+import pytest
+
+from mc_wiki_scraper.storage import CrawlResult, SharedFrontier
+
+
+@pytest.fixture
+def frontier(tmp_path):
+    with SharedFrontier(tmp_path / "frontier.sqlite") as frontier:
+        frontier.seed("Root", "Root", 2)
+        yield frontier
+
+
+def test_seed_once(frontier):
+    assert frontier.seeded
+    assert frontier.max_depth == 2
+
+    with pytest.raises(ValueError):
+        frontier.seed("Root", "Root", 2)
+
+
+def test_complete_counts_each_article_once(frontier):
+    assert frontier.claim("a", 10) == [("Root", 0)]
+    root = CrawlResult(1, {"root": 1}, [("Alpha", "alpha"), ("Root", "Root")])
+    assert frontier.complete("a", ["Root"], [(root, 0)]) == 1
+
+    assert frontier.claim("a", 1) == [("alpha", 1)]
+    assert frontier.claim("b", 1) == []
+
+    duplicate = CrawlResult(1, {"root": 1}, [("Beta", "Beta")])
+    assert frontier.complete("a", ["alpha"], [(duplicate, 1)]) == 0
+
+    assert frontier.counts() == {"root": 1}
+    assert frontier.progress() == {
+        "queued": 0,
+        "claimed": 0,
+        "done": 2,
+        "visited": 1,
+    }
+
+
+def test_expired_and_released_claims_are_queued_again(tmp_path):
+    with SharedFrontier(tmp_path / "frontier.sqlite", lease=0) as frontier:
+        frontier.seed("Root", "Root", 1)
+        assert frontier.claim("a", 1) == [("Root", 0)]
+        assert frontier.claim("b", 1) == [("Root", 0)]
+
+        frontier.release("b")
+        assert frontier.progress()["queued"] == 1
+
+
+def test_concurrent_claims_are_disjoint(tmp_path):
+    path = tmp_path / "frontier.sqlite"
+    with SharedFrontier(path) as frontier:
+        frontier.seed("P0", "P0", 1)
+        result = CrawlResult(
+            0, {}, [(f"P{i}", f"P{i}") for i in range(1, 200)]
+        )
+        frontier.complete("seed", [], [(result, 0)])
+
+    claimed = []
+
+    def work(name):
+        with SharedFrontier(path) as frontier:
+            while batch := frontier.claim(name, 7):
+                claimed.extend(phrase for phrase, _ in batch)
+
+    threads = [
+        threading.Thread(target=work, args=(f"w{i}",)) for i in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(claimed) == sorted(f"P{i}" for i in range(200))
@@ -0,0 +1,74 @@
+from pathlib import Path
+
+import pytest
+
+from mc_wiki_scraper.wiki_page.utils import (
+    TableIndex,
+    extract_tables,
+    locate_tables,
+)
+
+TEST_FILES = Path(__file__).parent.parent / "test_files"
+
+
+def test_locates_nested_tables_in_order():
+    inner = "<table><tr><td>b</td></tr></table>"
+    outer = f"<table><tr><td>a{inner}</td></tr></table>"
+    last = "<table><tr><td>c</td></tr></table>"
+    html = f"<p>x</p>{outer}{last}"
+    spans = locate_tables(html)
+
+    assert [html[start:end] for start, end in spans] == [outer, inner, last]
+
+
+def test_skips_empty_unclosed_and_commented_tables():
+    html = (
+        "<table></table><!-- <table><tr><td>x</td></tr></table> -->"
+        "<table><tr><td>a</td></tr>"
+    )
+    assert locate_tables(html) == []
+
+
+def test_converts_only_accessed_tables():
+    pytest.importorskip("lxml")
+    html = (
+        "<table><tr><th>A</th></tr><tr><td>1</td></tr></table>"
+        "<table><tr><th>B</th></tr><tr><td>2</td></tr></table>"
+    )
+    tables = TableIndex(html)
+
+    assert len(tables) == 2
+    assert list(tables[1].columns) == ["B"]
+    assert list(tables._frames) == [html.index("<table", 1)]
+
+
+@pytest.mark.parametrize("name", ["Bee.html", "Creeper.html"])
+def test_same_tables_as_read_html(name):
+    pytest.importorskip("lxml")
+    html = (TEST_FILES / name).read_text(encoding="utf-8")
+
+    expected = extract_tables(html)
+    tables = TableIndex(html)
+
+    assert len(tables) == len(expected)
+    assert all(a.equals(b) for a, b in zip(tables, expected, strict=True))
+
+
+@pytest.mark.parametrize(
+    "first",
+    [
+        "<table>\n<tr>\n<td>\nfoo\n</td>\n</tr>\n</table>",
+        "<table>\n<tr>\n<td>\n</td></tr></table>",
+        "<table> <tr> <td>\t</td></tr></table>",
+        "<table><tr><td>&nbsp;</td></tr></table>",
+    ],
+)
+def test_same_tables_as_read_html_with_whitespace(first):
+    pytest.importorskip("lxml")
+    html = f"{first}<table><tr><td>bar</td></tr></table>"
+
+    expected = extract_tables(html)
+    tables = TableIndex(html)
+
+    assert len(tables) == len(expected)
+    assert all(a.equals(b) for a, b in zip(tables, expected, strict=True))
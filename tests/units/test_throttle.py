@@ -0,0 +1,40 @@
+import time
+
+import pytest
+
+from mc_wiki_scraper.wiki_page.utils import TokenBucket
+
+
+def elapsed(bucket, calls):
+    start = time.monotonic()
+    for _ in range(calls):
+        bucket.acquire()
+    return time.monotonic() - start
+
+
+def test_burst_then_interval():
+    bucket = TokenBucket(0.05, burst=3)
+
+    assert elapsed(bucket, 3) < 0.04
+    assert elapsed(bucket, 2) == pytest.approx(0.1, abs=0.04)
+
+
+def test_zero_interval_does_not_wait():
+    assert elapsed(TokenBucket(0), 100) < 0.05
+
+
+def test_defer_holds_back_requests():
+    bucket = TokenBucket(0, burst=5)
+    bucket.defer(0.1)
+
+    assert elapsed(bucket, 1) == pytest.approx(0.1, abs=0.04)
+
+
+def test_slow_down_and_speed_up():
+    bucket = TokenBucket(0.1)
+    bucket.slow_down()
+    assert bucket.interval == 1.0
+
+    for _ in range(100):
+        bucket.speed_up()
+    assert bucket.interval == 0.1
@@ -1,8 +1,19 @@
+import random
 from collections import Counter
+from pathlib import Path
 
+import pytest
 from bs4 import BeautifulSoup, Tag
 
-from mc_wiki_scraper.wiki_page.utils import extract_word_counts
+from mc_wiki_scraper.wiki_page import WikiPage
+from mc_wiki_scraper.wiki_page.utils import (
+    count_words,
+    extract_word_counts,
+    word_counts,
+)
+from mc_wiki_scraper.wiki_page.utils.word_counts import WORD_RE
+
+TEST_FILES = Path(__file__).parent.parent / "test_files"
 
 
 def make_tag(html: str) -> Tag:
@@ -49,3 +60,52 @@ def test_ignores_numbers_and_symbols():
     counts = extract_word_counts(tag)
     expected = Counter({"bar": 1})
     assert counts == expected
+
+
+def reference_counts(texts: list[str]) -> Counter:
+    return Counter(WORD_RE.findall(" ".join(texts).lower()))
+
+
+TRICKY_PIECES = [
+    "Foo bar",
+    "naïve",
+    "café",
+    "Kelvin",
+    "İstanbul",
+    "ΣΟΦΟΣ",
+    "foo123",
+    "under_score",
+    "it's",
+    "-dash-",
+    "mother-",
+    "in-law",
+    "'quoted'",
+    "Straße",
+    "",
+    "   ",
+]
+
+
+def test_count_words_matches_joined_text():
+    rng = random.Random(0)
+    for _ in range(500):
+        texts = rng.choices(TRICKY_PIECES, k=rng.randint(0, 8))
+        assert count_words(texts) == reference_counts(texts)
+
+
+def test_count_words_across_chunks(monkeypatch):
+    monkeypatch.setattr(word_counts, "CHUNK_SIZE", 8)
+    texts = ["alpha beta", "γάμμα", "beta", "δέλτα alpha"] * 5
+    counts = Counter({"alpha": 1})
+
+    assert count_words(texts, counts) is counts
+    assert counts == reference_counts(texts) + Counter({"alpha": 1})
+
+
+@pytest.mark.parametrize("name", ["Bee.html", "Creeper.html"])
+def test_matches_get_text(name):
+    html = (TEST_FILES / name).read_text(encoding="utf-8")
+    content = WikiPage.from_html(name, html).get_content()
+
+    text = content.get_text(separator=" ", strip=True)
+    assert extract_word_counts(content) == reference_counts([text])